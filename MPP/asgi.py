@@ -5,18 +5,22 @@ import os
 from channels.auth import AuthMiddlewareStack
 from channels.routing import ProtocolTypeRouter, URLRouter
 from django.core.asgi import get_asgi_application
-import bookings.routing
 
 ##############################
 # ASGI CONFIGURATION SECTION #
 ##############################
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "MPP.settings")
 
+# Sets Django up before the consumers import any model
+http_application = get_asgi_application()
+import bookings.routing  # noqa: E402
+
+# Served by gunicorn's uvicorn workers (see Dockerfile): HTTP and websockets in the same processes
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
+    "http": http_application,
     "websocket": AuthMiddlewareStack(
         URLRouter(
             bookings.routing.websocket_urlpatterns
         )
     ),
-})
\ No newline at end of file
+})
@@ -45,6 +45,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "bookings.replica.ReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -71,12 +72,35 @@ EMAIL_HOST_PASSWORD = "22Lucianantonio*"
 #################
 #   WEBSOCKET   #
 #################
-WS_FLAG = False
+# Synthetic booking traffic: python manage.py generate_traffic --rate 10 (see bookings.traffic)
+# Channel layer carrying the booking changes to the live queries (see bookings.live): 'sqlite' (every
+# worker process of the host, through a shared SQLite file), 'redis' (several hosts, needs channels_redis
+# and REDIS_URL) or 'memory' (a single process)
+CHANNEL_LAYER_BACKEND = os.environ.get('CHANNEL_LAYER_BACKEND', 'sqlite')
+# Seconds between two checks of the shared file for messages of the other processes
+CHANNEL_LAYER_POLL_INTERVAL = 0.005
 CHANNEL_LAYERS = {
     'default': {
+        'BACKEND': 'bookings.channel_layer.SQLiteChannelLayer',
+        'CONFIG': {
+            'path': os.environ.get('CHANNEL_LAYER_DATABASE', str(BASE_DIR / 'db_channels.sqlite3')),
+            'poll_interval': CHANNEL_LAYER_POLL_INTERVAL,
+        },
+    } if CHANNEL_LAYER_BACKEND == 'sqlite' else {
+        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'CONFIG': {'hosts': [os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/0')]},
+    } if CHANNEL_LAYER_BACKEND == 'redis' else {
         'BACKEND': 'channels.layers.InMemoryChannelLayer',
     },
 }
+# Events pending per websocket connection before its oldest one is dropped
+BROADCAST_QUEUE_SIZE = 100
+# Most events coalesced into one frame, for the clients connecting with ?batch=1
+BROADCAST_BATCH_SIZE = 50
+# Seconds a batch waits for more events after its first one
+BROADCAST_BATCH_INTERVAL = 0.05
+# 'merge' replaces a pending event about the same booking with the newer one, 'drop' only drops
+BROADCAST_OVERFLOW_POLICY = 'merge'
 
 #############
 # TEMPLATES #
@@ -102,7 +126,7 @@ TEMPLATES = [
 ##################
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'bookings.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -114,19 +138,64 @@ REST_FRAMEWORK = {
 #####################
 # DATABASE SETTINGS #
 #####################
+# 'tuned' applies SQLITE_PRAGMAS on every new connection, retries lock errors and keeps the planner
+# statistics fresh (see bookings.sqlite); 'default' keeps SQLite's own defaults
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'tuned')
+SQLITE_PRAGMAS = {
+    # Readers and the writer no longer block each other
+    'journal_mode': 'wal',
+    # fsync at checkpoints only: still consistent after a crash, a power loss may drop the last commits
+    'synchronous': 'normal',
+    # Milliseconds a statement waits for the write lock before "database is locked"
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),
+    # Bytes of the database file read through a memory map instead of read() calls
+    'mmap_size': 256 * 1024 * 1024,
+    # Page cache per connection, negative values are KiB
+    'cache_size': -20_000,
+    'temp_store': 'memory',
+}
+# Number of retries of a statement still failing with "database is locked", and the first delay in seconds
+SQLITE_LOCK_RETRIES = 5
+SQLITE_LOCK_RETRY_DELAY = 0.05
+# Seconds between two PRAGMA optimize runs in a process
+SQLITE_OPTIMIZE_INTERVAL = 3600
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Take the write lock when the transaction starts, where waiting for it is safe to retry
+        "OPTIONS": {"transaction_mode": "IMMEDIATE"} if SQLITE_PROFILE == 'tuned' else {},
     }
 }
 
+# Read replica: a SQLite file refreshed from the primary by `manage.py refresh_replica` (see bookings.replica),
+# serving the list and statistics GETs once REPLICA_ENABLED
+DATABASES["replica"] = {**DATABASES["default"], "NAME": os.environ.get('REPLICA_DATABASE', BASE_DIR / "db_replica.sqlite3")}
+REPLICA_ENABLED = os.environ.get('REPLICA_ENABLED', 'False') == 'True'
+DATABASE_ROUTERS = ['bookings.replica.ReplicaRouter']
+# Seconds the replica may lag behind the primary before reads fall back to the primary
+REPLICA_MAX_LAG = int(os.environ.get('REPLICA_MAX_LAG', 30))
+# Seconds the replica's snapshot time is cached per process
+REPLICA_STATUS_INTERVAL = 1.0
+# Cache alias keeping the last write times, must be shared by the workers to read your own writes across them
+# (the replica is not read while it is a per process LocMemCache)
+REPLICA_STATE_CACHE = 'replica_state'
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 ##################
 # AUTHENTICATION #
 ##################
 AUTH_USER_MODEL = 'bookings.BookingUser'
+# Authenticated tokens kept in each process (see bookings.authentication): how many, and for how many seconds
+AUTH_TOKEN_CACHE_SIZE = 10_000
+AUTH_TOKEN_CACHE_TTL = int(os.environ.get('AUTH_TOKEN_CACHE_TTL', 60))
+# Cache alias keeping the last token and user writes, checked by every process for its cached tokens
+# (must be shared by the workers, a revoked token otherwise works in the others until the TTL), and
+# the seconds between two reads of it in a process, how long a revoked token still works in the others
+AUTH_TOKEN_REVOCATION_CACHE = 'auth_tokens'
+AUTH_TOKEN_REVOCATION_INTERVAL = 0.5
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -150,6 +219,15 @@ STATIC_URL = "/static/"
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
+# Resumable uploads (see bookings.uploads): largest chunk accepted, and seconds an upload may stay idle
+UPLOAD_CHUNK_MAX_SIZE = 64 * 1024 * 1024
+UPLOAD_SESSION_EXPIRY = 24 * 3600
+# Who sends downloaded files (see bookings.downloads): 'app', 'x-accel-redirect' (nginx, with an internal
+# location aliasing MEDIA_ROOT at DOWNLOAD_ACCEL_PREFIX) or 'x-sendfile' (Apache mod_xsendfile, lighttpd)
+DOWNLOAD_SERVE_MODE = os.environ.get('DOWNLOAD_SERVE_MODE', 'app')
+DOWNLOAD_ACCEL_PREFIX = '/protected-media/'
+# Processes generating the image variants (see bookings.derivatives)
+IMAGE_DERIVATIVE_WORKERS = int(os.environ.get('IMAGE_DERIVATIVE_WORKERS', 2))
 
 ##########################
 # CORS AND CSRF SETTINGS #
@@ -171,6 +249,8 @@ CORS_ALLOW_HEADERS = list(default_headers) + [
     'authorization',
     'content-type',
     'dnt',
+    'if-match',
+    'if-none-match',
     'origin',
     'user-agent',
     'x-csrftoken',
@@ -178,6 +258,7 @@ CORS_ALLOW_HEADERS = list(default_headers) + [
 ]
 CORS_EXPOSE_HEADERS = [
     'content-disposition',
+    'etag',
 ]
 CSRF_TRUSTED_ORIGINS = ['http://localhost:8000', 'https://backend-587575638625.europe-west1.run.app', 'https://frontend-587575638625.europe-west1.run.app']
 
@@ -190,3 +271,64 @@ MONITOR_SCAN_INTERVAL = 60
 MONITOR_WINDOW_SIZE = 60
 # If a user does more than this many ops in the window, flag them
 MONITOR_THRESHOLD = 20
+# 'incremental' flags users on the request crossing the threshold (sliding window per process),
+# 'scan' only runs the periodic aggregation over OperationLog, 'both' uses the scan to reconcile
+MONITOR_MODE = 'both'
+# Number of time buckets the sliding window is split into
+MONITOR_WINDOW_BUCKETS = 12
+# Number of seconds between writes of newly flagged users
+MONITOR_FLUSH_INTERVAL = 1
+
+########################
+# OPERATION LOG WRITER #
+########################
+# Maximum number of log records buffered in memory per process
+OPERATION_LOG_QUEUE_SIZE = 10_000
+# Number of records written per bulk insert
+OPERATION_LOG_BATCH_SIZE = 500
+# Seconds to wait for a full batch before writing a partial one
+OPERATION_LOG_FLUSH_INTERVAL = 1.0
+# What to do when the queue is full: 'drop', 'sample' or 'block'
+OPERATION_LOG_OVERFLOW_POLICY = 'drop'
+# With 'sample', fraction of records still admitted once the queue is half full
+OPERATION_LOG_SAMPLE_RATE = 0.1
+# With 'block', seconds a request waits for queue space before dropping its record
+OPERATION_LOG_BLOCK_TIMEOUT = 0.5
+
+##################
+# RESPONSE CACHE #
+##################
+# Backend caching hotel_list / room_list responses: 'locmem' (per process, LRU eviction)
+# or 'file' (shared by every gunicorn worker on the host)
+RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'locmem')
+# Seconds a cached response is kept, writes invalidate earlier through the version counters
+RESPONSE_CACHE_TIMEOUT = 300
+# Maximum number of cached responses (per process for locmem)
+RESPONSE_CACHE_MAX_ENTRIES = 5_000
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Last write times of the read replica routing (see bookings.replica), shared by every worker on the host
+    'replica_state': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('REPLICA_STATE_CACHE_DIR', str(BASE_DIR / 'cache' / 'replica_state')),
+    },
+    # Token and user write times of the token cache (see bookings.authentication), shared likewise
+    'auth_tokens': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('AUTH_TOKEN_CACHE_DIR', str(BASE_DIR / 'cache' / 'auth_tokens')),
+    },
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('RESPONSE_CACHE_DIR', str(BASE_DIR / 'cache' / 'responses')),
+        'TIMEOUT': RESPONSE_CACHE_TIMEOUT,
+        'OPTIONS': {'MAX_ENTRIES': RESPONSE_CACHE_MAX_ENTRIES},
+    } if RESPONSE_CACHE_BACKEND == 'file' else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+        'TIMEOUT': RESPONSE_CACHE_TIMEOUT,
+        # Least recently used entries are evicted first, a tenth of them at a time
+        'OPTIONS': {'MAX_ENTRIES': RESPONSE_CACHE_MAX_ENTRIES, 'CULL_FREQUENCY': 10},
+    },
+}
@@ -0,0 +1,143 @@
+###########################
+##    IMPORTS SECTION    ##
+###########################
+# Python Libraries
+import asyncio
+import os
+import subprocess
+import sys
+import time
+# Django Libraries
+import django
+
+
+###########################
+##     SETUP SECTION     ##
+###########################
+
+# Setup Django Environment (run from the repository root after seeding with loadtest.py)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'MPP.loadtest_settings')
+django.setup()
+
+from rest_framework.authtoken.models import Token
+from bookings.models import BookingUser
+
+# Benchmark Configuration, both servers shaped like the deployment (2 worker processes)
+HOST = '127.0.0.1'
+CLIENTS = [50, 200, 1000]
+DURATION = 10
+TIMEOUT = 10
+PATH = 'bookings/?limit=20&ordering=-startDate'
+SERVERS = {
+    # The previous deployment: 2 workers x 2 threads
+    'wsgi': (8101, PATH, [
+        'gunicorn', '--workers', '2', '--threads', '2', '--backlog', '2048', 'MPP.wsgi:application',
+    ]),
+    'asgi': (8102, f'async/{PATH}', [
+        'gunicorn', '--workers', '2', '--backlog', '2048',
+        '--worker-class', 'uvicorn.workers.UvicornWorker', 'MPP.asgi:application',
+    ]),
+}
+
+
+###########################
+##    CLIENT SECTION     ##
+###########################
+
+async def fetch(reader, writer, request):
+    """
+    Sends one keep-alive GET and reads the response.
+    :return: The status code.
+    """
+    writer.write(request)
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    length = next(
+        (int(line.split(':', 1)[1]) for line in lines if line.lower().startswith('content-length:')), 0
+    )
+    await reader.readexactly(length)
+    return int(lines[0].split()[1])
+
+
+async def client(port, request, deadline, counters):
+    """
+    One client: requests in a loop until the deadline, reconnecting after every error.
+    """
+    connection = None
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.wait_for(asyncio.open_connection(HOST, port), TIMEOUT)
+            code = await asyncio.wait_for(fetch(*connection, request), TIMEOUT)
+            if code != 200:
+                raise ValueError(code)
+            counters['latencies'].append((time.perf_counter() - started) * 1000)
+        except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            counters['errors'] += 1
+            if connection is not None:
+                connection[1].close()
+            connection = None
+    if connection is not None:
+        connection[1].close()
+
+
+async def load(port, path, token, clients):
+    """
+    :return: Latencies (ms) of the successful requests and the number of errors of `clients` concurrent clients.
+    """
+    request = (
+        f'GET /{path} HTTP/1.1\r\nHost: {HOST}:{port}\r\nAuthorization: Token {token}\r\n'
+        f'Connection: keep-alive\r\n\r\n'
+    ).encode()
+    counters = {'latencies': [], 'errors': 0}
+    deadline = time.monotonic() + DURATION
+    await asyncio.gather(*(client(port, request, deadline, counters) for _ in range(clients)))
+    return sorted(counters['latencies']), counters['errors']
+
+
+###########################
+##   BENCHMARK SECTION   ##
+###########################
+
+def start(port, command):
+    """
+    Starts a server on the loadtest database and waits until it accepts connections.
+    """
+    process = subprocess.Popen(
+        [*command, '--bind', f'{HOST}:{port}'], cwd=BASE_DIR, env=os.environ.copy(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            asyncio.run(asyncio.open_connection(HOST, port))[1].close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f"{command[-1]} did not start, is {command[0]} installed?")
+
+
+def percentile(latencies, fraction):
+    return latencies[int(len(latencies) * fraction) - 1] if latencies else 0
+
+
+if __name__ == '__main__':
+    user, _ = BookingUser.objects.get_or_create(username='bench_concurrency')
+    token, _ = Token.objects.get_or_create(user=user)
+    print(f"GET /{PATH} for {DURATION}s per run, 2 worker processes per server\n")
+
+    for name, (port, path, command) in SERVERS.items():
+        process = start(port, command)
+        try:
+            for clients in CLIENTS:
+                latencies, errors = asyncio.run(load(port, path, token.key, clients))
+                print(f"{name}  {clients:5} clients   {len(latencies) / DURATION:8.1f} req/s   "
+                      f"p50 {percentile(latencies, 0.5):8.2f} ms   p99 {percentile(latencies, 0.99):8.2f} ms   "
+                      f"errors {errors:6}")
+        finally:
+            process.terminate()
+            process.wait()
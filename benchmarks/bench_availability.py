@@ -0,0 +1,108 @@
+###########################
+##    IMPORTS SECTION    ##
+###########################
+# Python Libraries
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+# Django Libraries
+import django
+
+
+###########################
+##     SETUP SECTION     ##
+###########################
+
+# Setup Django Environment (run from the repository root after seeding with loadtest.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'MPP.loadtest_settings')
+django.setup()
+
+# Import our models
+from django.db import connection
+from bookings.availability import NON_BLOCKING_STATE, available_rooms
+from bookings.models import Booking, Room
+
+# Benchmark Configuration
+REPEATS = 50
+PAGE_SIZE = 10
+MIN_CAPACITY = 2
+random.seed(42)
+
+
+###########################
+##    HELPERS SECTION    ##
+###########################
+
+def random_stay():
+    start = date(2023, 1, 1) + timedelta(days=random.randint(0, 730))
+    return start, start + timedelta(days=random.randint(1, 14))
+
+
+def measure(run):
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def naive_hotel(hotel_id, start, end):
+    """
+    Without a room link in the index: every overlapping booking of the period
+    (through the (startDate, endDate) index) checked against every room.
+    """
+    rooms = list(Room.objects.filter(hotel_id=hotel_id, capacity__gte=MIN_CAPACITY).values_list('id', flat=True))
+    busy = list(
+        Booking.objects.filter(startDate__lt=end, endDate__gt=start).exclude(state=NON_BLOCKING_STATE)
+        .values_list('room_id', 'startDate', 'endDate')
+    )
+    return [room for room in rooms if not any(room_id == room and s < end and e > start for room_id, s, e in busy)]
+
+
+def indexed_hotel(hotel_id, start, end):
+    rooms = Room.objects.filter(hotel_id=hotel_id, capacity__gte=MIN_CAPACITY)
+    return list(available_rooms(start, end, rooms).values_list('id', flat=True))
+
+
+def indexed_page(start, end):
+    rooms = Room.objects.filter(capacity__gte=MIN_CAPACITY).order_by('hotel_id', 'price_per_night', 'id')
+    return list(available_rooms(start, end, rooms)[:PAGE_SIZE])
+
+
+###########################
+##   BENCHMARK SECTION   ##
+###########################
+
+rooms_total, linked = Room.objects.count(), Booking.objects.filter(room__isnull=False).count()
+if not linked:
+    sys.exit("No booking is linked to a room, reseed the load test database with loadtest.py first.")
+print(f"Rooms: {rooms_total}, bookings linked to rooms: {linked}, {REPEATS} runs per query\n")
+
+hotel_ids = list(Room.objects.values_list('hotel_id', flat=True).distinct()[:1000])
+stays = [(random.choice(hotel_ids), *random_stay()) for _ in range(REPEATS)]
+
+# Same answers from both strategies
+for hotel_id, start, end in stays[:10]:
+    assert sorted(naive_hotel(hotel_id, start, end)) == sorted(indexed_hotel(hotel_id, start, end))
+
+for label, run in [
+    ("naive, one hotel", lambda: naive_hotel(*random.choice(stays))),
+    ("indexed, one hotel", lambda: indexed_hotel(*random.choice(stays))),
+    (f"indexed, first {PAGE_SIZE} free rooms", lambda: indexed_page(*random.choice(stays)[1:])),
+]:
+    median, p95 = measure(run)
+    print(f"{label:<32} median {median:9.2f} ms   p95 {p95:9.2f} ms")
+
+hotel_id, start, end = stays[0]
+sql, params = available_rooms(start, end, Room.objects.filter(hotel_id=hotel_id)).query.sql_with_params()
+with connection.cursor() as cursor:
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+    print("\nQuery plan for one hotel:")
+    for row in cursor.fetchall():
+        print(f"  {row[-1]}")
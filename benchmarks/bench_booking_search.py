@@ -0,0 +1,97 @@
+###########################
+##    IMPORTS SECTION    ##
+###########################
+# Python Libraries
+import os
+import statistics
+import sys
+import time
+# Django Libraries
+import django
+
+
+###########################
+##     SETUP SECTION     ##
+###########################
+
+# Setup Django Environment (run from the repository root after seeding with loadtest.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'MPP.loadtest_settings')
+django.setup()
+
+# Import our models
+from django.db.models import Q
+from bookings import search
+from bookings.models import Booking
+
+# Benchmark Configuration
+REPEATS = 20
+LIMIT = 10
+FILTERS = [
+    ('customerName', 'john'),
+    ('customerName', 'smith'),
+    ('customerEmail', 'example.org'),
+    ('customerPhone', '555'),
+]
+FULL_TEXT_QUERIES = ['john smith', 'gmail.com', 'michael 001']
+
+
+###########################
+##    HELPERS SECTION    ##
+###########################
+
+def measure(build_queryset):
+    """
+    Runs one list page (count + first LIMIT rows) REPEATS times.
+    :return: (median ms, p95 ms, count)
+    """
+    timings, count = [], 0
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        queryset = build_queryset()
+        count = queryset.count()
+        list(queryset[:LIMIT])
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1], count
+
+
+def report(label, icontains, indexed):
+    (base_median, base_p95, base_count), (index_median, index_p95, index_count) = icontains, indexed
+    print(f"{label:<32} icontains {base_median:9.2f} ms (p95 {base_p95:9.2f})   "
+          f"index {index_median:9.2f} ms (p95 {index_p95:9.2f})   "
+          f"x{base_median / max(index_median, 1e-6):6.1f}   rows {base_count}/{index_count}")
+
+
+###########################
+##   BENCHMARK SECTION   ##
+###########################
+
+if not search.is_available():
+    sys.exit("The booking search index is missing, run migrations on the load test database first.")
+
+print(f"Bookings: {Booking.objects.count()}, {REPEATS} runs per query, page size {LIMIT}\n")
+
+print("Field filters (?name= / ?email= / ?phone=)")
+for field, value in FILTERS:
+    report(
+        f"{field} ~ {value!r}",
+        measure(lambda: Booking.objects.filter(**{f'{field}__icontains': value})),
+        measure(lambda: search.filter_contains(Booking.objects.all(), field, value)),
+    )
+
+print("\nFull-text search (?q=), ranked by bm25 through the index")
+for text in FULL_TEXT_QUERIES:
+    def icontains_all_terms():
+        queryset = Booking.objects.all()
+        for term in text.split():
+            queryset = queryset.filter(
+                Q(customerName__icontains=term) | Q(customerEmail__icontains=term) | Q(customerPhone__icontains=term)
+            )
+        return queryset
+
+    report(
+        f"q={text!r}",
+        measure(icontains_all_terms),
+        measure(lambda: search.search(Booking.objects.all(), text)),
+    )
@@ -0,0 +1,173 @@
+###########################
+##    IMPORTS SECTION    ##
+###########################
+# Python Libraries
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+# Django Libraries
+import django
+
+
+###########################
+##     SETUP SECTION     ##
+###########################
+
+# Setup Django Environment (run from the repository root)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'MPP.loadtest_settings')
+django.setup()
+
+from channels.layers import InMemoryChannelLayer
+from bookings.channel_layer import SQLiteChannelLayer
+
+# Benchmark Configuration
+SUBSCRIBERS = [1_000, 10_000]
+# InMemoryChannelLayer walks every channel on each receive, quadratic past this
+MEMORY_MAX_SUBSCRIBERS = 1_000
+MESSAGES = 50
+# Throughput is measured with back to back broadcasts, latency with one broadcast every PACE seconds
+PACE = 0.25
+LATENCY_MESSAGES = 20
+TIMEOUT = 120
+GROUP = 'booking_updates'
+# Roughly a serialized booking, as broadcast by the booking generator
+PAYLOAD = {
+    'new_booking': {
+        'id': '6f1c0c8e-3f7a-4a51-9d8e-0a2f8a1b7c11', 'customerName': 'Auto Generated1',
+        'customerEmail': 'auto@example.com', 'customerPhone': '1234567890', 'startDate': '2025-04-02',
+        'endDate': '2025-04-03', 'state': 'PENDING', 'room': None,
+    },
+}
+
+
+###########################
+##   SUBSCRIBER SECTION  ##
+###########################
+
+async def subscribe(layer, subscribers):
+    """
+    Joins `subscribers` new channels to the group.
+    :return: The channel names.
+    """
+    channels = [await layer.new_channel() for _ in range(subscribers)]
+    for channel in channels:
+        await layer.group_add(GROUP, channel)
+    return channels
+
+
+async def receive_all(layer, channels, messages):
+    """
+    Receives `messages` broadcasts on every channel.
+    :return: {message index: time the last subscriber got it}.
+    """
+    delivered = {}
+
+    async def reader(channel):
+        for _ in range(messages):
+            message = await layer.receive(channel)
+            delivered[message['index']] = time.time()
+
+    await asyncio.wait_for(asyncio.gather(*(reader(channel) for channel in channels)), TIMEOUT)
+    return delivered
+
+
+async def publish(layer, messages, pace):
+    """
+    :return: {message index: send time}.
+    """
+    sent = {}
+    for index in range(messages):
+        sent[index] = time.time()
+        await layer.group_send(GROUP, {'type': 'booking.update', 'index': index, 'data': PAYLOAD})
+        await asyncio.sleep(pace)
+    return sent
+
+
+def remote_subscriber(path, subscribers, messages, ready, results):
+    """
+    Subscribers in another process, on their own layer over the same file.
+    """
+    async def run():
+        layer = SQLiteChannelLayer(path, capacity=MESSAGES)
+        channels = await subscribe(layer, subscribers)
+        receiving = asyncio.ensure_future(receive_all(layer, channels, messages))
+        # Let every reader wait on its queue and the poller start
+        await asyncio.sleep(0.5)
+        ready.set()
+        delivered = await receiving
+        await layer.close()
+        return delivered
+
+    results.put(asyncio.run(run()))
+
+
+###########################
+##   BENCHMARK SECTION   ##
+###########################
+
+async def same_process(layer, subscribers, messages, pace):
+    channels = await subscribe(layer, subscribers)
+    receiving = asyncio.ensure_future(receive_all(layer, channels, messages))
+    await asyncio.sleep(0.5)
+    sent = await publish(layer, messages, pace)
+    delivered = await receiving
+    if hasattr(layer, 'close'):
+        await layer.close()
+    return sent, delivered
+
+
+def other_process(path, subscribers, messages, pace):
+    context = multiprocessing.get_context('spawn')
+    ready, results = context.Event(), context.Queue()
+    process = context.Process(target=remote_subscriber, args=(path, subscribers, messages, ready, results))
+    process.start()
+    ready.wait()
+
+    async def run():
+        layer = SQLiteChannelLayer(path)
+        sent = await publish(layer, messages, pace)
+        await layer.close()
+        return sent
+
+    sent = asyncio.run(run())
+    delivered = results.get()
+    process.join()
+    return sent, delivered
+
+
+def report(name, subscribers, measure):
+    """
+    Runs measure(messages, pace) for a burst then a paced run.
+    """
+    sent, delivered = measure(MESSAGES, 0)
+    elapsed = max(delivered.values()) - min(sent.values())
+
+    # Time until the last subscriber got each broadcast
+    sent, delivered = measure(LATENCY_MESSAGES, PACE)
+    latencies = sorted((delivered[index] - sent[index]) * 1000 for index in sent)
+    print(f"{name:<22} {subscribers:6} subscribers   {subscribers * MESSAGES / elapsed:10.0f} deliveries/s   "
+          f"p50 {latencies[len(latencies) // 2]:8.2f} ms   max {latencies[-1]:8.2f} ms")
+
+
+if __name__ == '__main__':
+    print(f"Throughput of {MESSAGES} back to back group_send calls of a booking update, "
+          f"latency of {LATENCY_MESSAGES} sent every {PACE}s\n")
+
+    for subscribers in SUBSCRIBERS:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'channels.sqlite3')
+
+            if subscribers <= MEMORY_MAX_SUBSCRIBERS:
+                report('memory', subscribers, lambda messages, pace: asyncio.run(
+                    same_process(InMemoryChannelLayer(capacity=MESSAGES), subscribers, messages, pace)
+                ))
+            report('sqlite, same process', subscribers, lambda messages, pace: asyncio.run(
+                same_process(SQLiteChannelLayer(path, capacity=MESSAGES), subscribers, messages, pace)
+            ))
+            report('sqlite, other process', subscribers, lambda messages, pace: other_process(
+                path, subscribers, messages, pace
+            ))
@@ -0,0 +1,109 @@
+###########################
+##    IMPORTS SECTION    ##
+###########################
+# Python Libraries
+import os
+import sys
+import tempfile
+import time
+# Django Libraries
+import django
+
+
+###########################
+##     SETUP SECTION     ##
+###########################
+
+# Setup Django Environment (run from the repository root)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'MPP.loadtest_settings')
+django.setup()
+
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APIClient
+from bookings.catalog import file_catalog
+from bookings.models import BookingUser, StoredFile
+
+# Benchmark Configuration
+DIRECTORY_SIZES = [1_000, 10_000, 100_000]
+PAGE_SIZE = 100
+REPEATS = 20
+
+
+###########################
+##    LISTING SECTION    ##
+###########################
+
+def client():
+    api = APIClient()
+    # The file views only check that the user is authenticated
+    api.force_authenticate(BookingUser(username='bench'))
+    return api
+
+
+def fill(uploads_dir, start, count):
+    for index in range(start, start + count):
+        with open(os.path.join(uploads_dir, f'file{index:06}.jpg'), 'wb') as file:
+            file.write(b'x' * (index % 1000))
+
+
+def directory_listing(uploads_dir):
+    # What list_files did before the catalog: every name, sorted, on every request
+    names = sorted(os.listdir(uploads_dir))
+    return names[:PAGE_SIZE]
+
+
+def catalog_page(api, params):
+    response = api.get('/files/', params)
+    assert response.status_code == 200, response.content
+    return response.json()
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        function(*args)
+    return (time.perf_counter() - started) / REPEATS * 1000
+
+
+###########################
+##   BENCHMARK SECTION   ##
+###########################
+
+if __name__ == '__main__':
+    call_command('migrate', verbosity=0)
+    StoredFile.objects.all().delete()
+    api = client()
+    print(f"Listing {PAGE_SIZE} files, ms per request (mean of {REPEATS})\n")
+    print(f"{'files':>8} {'listdir':>10} {'first page':>11} {'cursor page':>12} {'filtered':>9} {'scan':>9}")
+
+    with tempfile.TemporaryDirectory() as directory, override_settings(MEDIA_ROOT=directory):
+        uploads_dir = os.path.join(directory, 'uploads')
+        os.makedirs(uploads_dir)
+        filled = 0
+        for size in DIRECTORY_SIZES:
+            fill(uploads_dir, filled, size - filled)
+            filled = size
+
+            # The new files are hashed once by the scan, later listings never touch the directory
+            started = time.perf_counter()
+            file_catalog.scan()
+            scan = time.perf_counter() - started
+
+            first = catalog_page(api, {'limit': PAGE_SIZE, 'count': 'false', 'ordering': '-modified'})
+            # A page from the middle of the catalog, seeking past the previous one
+            middle = catalog_page(api, {'limit': PAGE_SIZE, 'cursor': '', 'ordering': 'name'})
+            for _ in range(size // PAGE_SIZE // 2):
+                middle = catalog_page(api, {'limit': PAGE_SIZE, 'cursor': middle['next_cursor'], 'ordering': 'name'})
+            assert len(first['results']) == len(middle['results']) == PAGE_SIZE
+
+            print(
+                f"{size:>8} {timed(directory_listing, uploads_dir):>10.2f}"
+                f" {timed(catalog_page, api, {'limit': PAGE_SIZE, 'count': 'false', 'ordering': '-modified'}):>11.2f}"
+                f" {timed(catalog_page, api, {'limit': PAGE_SIZE, 'cursor': middle['next_cursor'], 'ordering': 'name'}):>12.2f}"
+                f" {timed(catalog_page, api, {'limit': PAGE_SIZE, 'count': 'false', 'min_size': 900, 'ordering': 'size'}):>9.2f}"
+                f" {scan:>8.2f}s"
+            )
+
+    StoredFile.objects.all().delete()
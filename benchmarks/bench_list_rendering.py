@@ -0,0 +1,75 @@
+###########################
+##    IMPORTS SECTION    ##
+###########################
+# Python Libraries
+import os
+import statistics
+import sys
+import time
+# Django Libraries
+import django
+
+
+###########################
+##     SETUP SECTION     ##
+###########################
+
+# Setup Django Environment (run from the repository root after seeding with loadtest.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'MPP.loadtest_settings')
+django.setup()
+
+# Import our models
+from rest_framework.renderers import JSONRenderer
+from bookings.models import Booking, Hotel, Room
+from bookings.projection import Projection
+from bookings.serializers import BookingSerializer, HotelSerializer, RoomSerializer
+
+# Benchmark Configuration
+REPEATS = 30
+LIMITS = [10, 100, 1000]
+MODELS = [(Booking, BookingSerializer), (Hotel, HotelSerializer), (Room, RoomSerializer)]
+
+
+###########################
+##    HELPERS SECTION    ##
+###########################
+
+def measure(run):
+    """
+    :return: (median ms, p95 ms) of REPEATS runs.
+    """
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+###########################
+##   BENCHMARK SECTION   ##
+###########################
+
+renderer = JSONRenderer()
+print(f"{REPEATS} runs per page, query + rendering to JSON bytes\n")
+
+for model, serializer_class in MODELS:
+    projection = Projection(serializer_class)
+    print(f"{model.__name__} ({model.objects.count()} rows)")
+
+    for limit in LIMITS:
+        def with_serializer():
+            return renderer.render(serializer_class(model.objects.order_by('pk')[:limit], many=True).data)
+
+        def with_projection():
+            return renderer.render(projection.render(projection.queryset(model.objects.order_by('pk'))[:limit]))
+
+        if with_serializer() != with_projection():
+            sys.exit(f"{model.__name__} output differs at limit={limit}")
+
+        (base_median, base_p95), (fast_median, fast_p95) = measure(with_serializer), measure(with_projection)
+        print(f"  limit={limit:<5} serializer {base_median:8.2f} ms (p95 {base_p95:8.2f})   "
+              f"projection {fast_median:8.2f} ms (p95 {fast_p95:8.2f})   x{base_median / fast_median:5.1f}")
+    print()
@@ -0,0 +1,105 @@
+###########################
+##    IMPORTS SECTION    ##
+###########################
+# Python Libraries
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+# Django Libraries
+import django
+
+
+###########################
+##     SETUP SECTION     ##
+###########################
+
+# Setup Django Environment (run from the repository root)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'MPP.loadtest_settings')
+django.setup()
+
+from bookings.live import LiveQueries, Subscription, _decode_row
+
+# Benchmark Configuration
+SUBSCRIBERS = [1_000, 10_000, 100_000]
+CHANGES = 2_000
+ROOMS = [str(uuid.uuid4()) for _ in range(500)]
+STATES = ['PENDING', 'COMPLETED', 'CANCELLED', 'CONFIRMED']
+FIRST_DAY = date(2025, 1, 1)
+
+
+###########################
+##    WORKLOAD SECTION   ##
+###########################
+
+class Outbox:
+    """
+    Counts the frames a connection would be sent.
+    """
+    frames = 0
+
+    def put(self, event):
+        Outbox.frames += 1
+
+
+def subscription_params():
+    # Mostly room pages, then state tabs and date ranges, a few unfiltered lists
+    kind = random.random()
+    if kind < 0.6:
+        return {'room': random.choice(ROOMS)}
+    if kind < 0.8:
+        return {'state': random.choice(STATES), 'name': random.choice(['', 'pop'])}
+    if kind < 0.99:
+        return {'start_date': (FIRST_DAY + timedelta(days=random.randrange(365))).isoformat()}
+    return {}
+
+
+def change():
+    start = FIRST_DAY + timedelta(days=random.randrange(365))
+    row = {
+        'id': str(uuid.uuid4()), 'customerName': 'Ana Pop', 'customerEmail': 'ana@example.com',
+        'customerPhone': '0711', 'startDate': start.isoformat(), 'endDate': (start + timedelta(days=3)).isoformat(),
+        'state': random.choice(STATES), 'createdAt': None, 'completedAt': None, 'room_id': random.choice(ROOMS),
+    }
+    return {'type': 'booking_change', 'before': None, 'after': row, 'data': {'id': row['id']}, 'sent': time.time()}
+
+
+###########################
+##   BENCHMARK SECTION   ##
+###########################
+
+def linear_scan(subscriptions, message):
+    # Every subscription checked, what the index replaces
+    row = _decode_row(message['after'])
+    return sum(subscription.matches(row) for subscription in subscriptions)
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    print(f"Matching {CHANGES} booking inserts against the subscriptions of one process\n")
+
+    for subscribers in SUBSCRIBERS:
+        live = LiveQueries()
+        subscriptions = [Subscription(subscription_params(), Outbox()) for _ in range(subscribers)]
+        for subscription in subscriptions:
+            live.index.add(subscription)
+        messages = [change() for _ in range(CHANGES)]
+
+        Outbox.frames = 0
+        started = time.perf_counter()
+        for message in messages:
+            live.dispatch(message)
+        indexed = (time.perf_counter() - started) / CHANGES * 1e6
+        stats = live.stats()
+
+        started = time.perf_counter()
+        for message in messages[:200]:
+            linear_scan(subscriptions, message)
+        scanned = (time.perf_counter() - started) / 200 * 1e6
+
+        print(f"{subscribers:7} subscribers   indexed {indexed:9.1f} us/change "
+              f"({stats['candidates'] / CHANGES:8.1f} candidates, {Outbox.frames / CHANGES:7.1f} frames)   "
+              f"linear scan {scanned:10.1f} us/change")
@@ -0,0 +1,126 @@
+###########################
+##    IMPORTS SECTION    ##
+###########################
+# Python Libraries
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+
+###########################
+##     SETUP SECTION     ##
+###########################
+
+# Run from the repository root after seeding with loadtest.py
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'MPP.loadtest_settings')
+
+# Benchmark Configuration, shaped like the gunicorn deployment (2 workers x 2 threads)
+PROCESSES = 2
+THREADS = 2
+DURATION = 10
+WRITE_RATIO = 0.2
+PAGE_SIZE = 20
+
+
+###########################
+##    WORKER SECTION     ##
+###########################
+
+def worker(profile, path, barrier, results):
+    """
+    One "gunicorn worker": THREADS threads issuing list reads and read-modify-write updates for DURATION seconds.
+    """
+    os.environ['SQLITE_PROFILE'] = profile
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = path
+
+    import django
+    django.setup()
+    from django.db import OperationalError, connection, transaction
+    from bookings.models import Booking
+
+    ids = list(Booking.objects.values_list('pk', flat=True)[:5_000])
+    starts = list(Booking.objects.values_list('startDate', flat=True)[:5_000])
+    connection.close()
+
+    # Every worker starts measuring at the same time, once set up
+    barrier.wait()
+    deadline = time.time() + DURATION
+
+    def run():
+        counters = {'reads': 0, 'writes': 0, 'errors': 0, 'latencies': []}
+        while time.time() < deadline:
+            started = time.perf_counter()
+            try:
+                if random.random() < WRITE_RATIO:
+                    # Same shape as the PATCH and bulk endpoints: read the row, then write it in one transaction
+                    with transaction.atomic():
+                        booking = Booking.objects.get(pk=random.choice(ids))
+                        booking.state = random.choice(Booking.BookingState.values)
+                        booking.save(update_fields=['state'])
+                    counters['writes'] += 1
+                else:
+                    rows = Booking.objects.filter(startDate__gte=random.choice(starts))
+                    list(rows.order_by('startDate', 'endDate', 'id').values()[:PAGE_SIZE])
+                    counters['reads'] += 1
+            except OperationalError:
+                counters['errors'] += 1
+            counters['latencies'].append((time.perf_counter() - started) * 1000)
+        connection.close()
+        results.put(counters)
+
+    threads = [threading.Thread(target=run) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+###########################
+##   BENCHMARK SECTION   ##
+###########################
+
+def measure(profile, source):
+    """
+    :return: Throughput and errors of every worker on a fresh copy of the source database.
+    """
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'db.sqlite3')
+    shutil.copyfile(source, path)
+    # The journal mode is stored in the file: start both runs from SQLite's default
+    with sqlite3.connect(path) as database:
+        database.execute('PRAGMA journal_mode = delete')
+
+    context = multiprocessing.get_context('spawn')
+    results, barrier = context.Queue(), context.Barrier(PROCESSES)
+    processes = [context.Process(target=worker, args=(profile, path, barrier, results)) for _ in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    counters = [results.get() for _ in range(PROCESSES * THREADS)]
+    for process in processes:
+        process.join()
+    shutil.rmtree(directory)
+
+    latencies = sorted(latency for counter in counters for latency in counter['latencies'])
+    total = {key: sum(counter[key] for counter in counters) for key in ('reads', 'writes', 'errors')}
+    return total, latencies
+
+
+if __name__ == '__main__':
+    from django.conf import settings
+    source = str(settings.DATABASES['default']['NAME'])
+    print(f"{PROCESSES} processes x {THREADS} threads, {DURATION}s, {WRITE_RATIO:.0%} writes on a copy of {source}\n")
+
+    for profile in ('default', 'tuned'):
+        total, latencies = measure(profile, source)
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+        print(f"{profile:<8} reads {total['reads'] / DURATION:8.1f}/s   writes {total['writes'] / DURATION:7.1f}/s   "
+              f"locked errors {total['errors']:5}   p95 {p95:7.2f} ms")
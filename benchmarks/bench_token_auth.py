@@ -0,0 +1,101 @@
+###########################
+##    IMPORTS SECTION    ##
+###########################
+# Python Libraries
+import os
+import random
+import sys
+import time
+# Django Libraries
+import django
+
+
+###########################
+##     SETUP SECTION     ##
+###########################
+
+# Setup Django Environment (run from the repository root)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'MPP.loadtest_settings')
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from bookings.authentication import CachedTokenAuthentication, token_cache
+from bookings.models import BookingUser
+
+# Benchmark Configuration
+USERS = 200
+REQUESTS = 5_000
+PATH = '/files/?limit=1&count=false'
+
+
+###########################
+##     TOKENS SECTION    ##
+###########################
+
+def create_tokens():
+    BookingUser.objects.filter(username__startswith='bench_auth_').delete()
+    users = BookingUser.objects.bulk_create(
+        BookingUser(username=f'bench_auth_{index}', role='admin' if index % 10 == 0 else 'user')
+        for index in range(USERS)
+    )
+    return [Token.objects.create(user=user).key for user in users]
+
+
+def authenticate(authentication, keys):
+    """
+    :return: Microseconds and queries per authentication, for REQUESTS requests spread over the tokens.
+    """
+    factory = RequestFactory()
+    requests = [factory.get('/', headers={'Authorization': f'Token {random.choice(keys)}'}) for _ in range(REQUESTS)]
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        for request in requests:
+            authentication.authenticate(request)
+        elapsed = time.perf_counter() - started
+    return elapsed / REQUESTS * 1e6, len(queries) / REQUESTS
+
+
+def through_view(keys, cold):
+    """
+    :return: Milliseconds and queries per GET of PATH, every request with a cold or warm token cache.
+    """
+    api = APIClient()
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        for _ in range(REQUESTS // 5):
+            if cold:
+                token_cache.clear()
+            api.get(PATH, headers={'Authorization': f'Token {random.choice(keys)}'})
+        elapsed = time.perf_counter() - started
+    return elapsed / (REQUESTS // 5) * 1000, len(queries) / (REQUESTS // 5)
+
+
+###########################
+##   BENCHMARK SECTION   ##
+###########################
+
+if __name__ == '__main__':
+    call_command('migrate', verbosity=0)
+    keys = create_tokens()
+    connection.force_debug_cursor = True
+    print(f"{REQUESTS} authentications over {USERS} tokens\n")
+
+    for name, authentication in [('TokenAuthentication', TokenAuthentication()),
+                                 ('CachedTokenAuthentication', CachedTokenAuthentication())]:
+        token_cache.clear()
+        micros, queries = authenticate(authentication, keys)
+        print(f"{name:26} {micros:8.1f} us/request   {queries:.3f} queries/request")
+    print(f"hit rate {token_cache.stats()['hit_rate']}\n")
+
+    for label, cold in [('cold cache', True), ('warm cache', False)]:
+        millis, queries = through_view(keys, cold)
+        print(f"GET {PATH} {label}: {millis:6.2f} ms/request   {queries:.2f} queries/request")
+
+    BookingUser.objects.filter(username__startswith='bench_auth_').delete()
@@ -0,0 +1,122 @@
+###########################
+##    IMPORTS SECTION    ##
+###########################
+# Python Libraries
+import hashlib
+import os
+import sys
+import tempfile
+import time
+# Django Libraries
+import django
+
+
+###########################
+##     SETUP SECTION     ##
+###########################
+
+# Setup Django Environment (run from the repository root)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'MPP.loadtest_settings')
+django.setup()
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from rest_framework.test import APIClient
+from bookings.models import BookingUser
+
+# Benchmark Configuration
+MB = 1024 * 1024
+SIZES = [1 * MB, 16 * MB, 256 * MB, 1024 * MB]
+CHUNK_SIZE = 8 * MB
+# The multipart upload is read into memory by the test client, only compared up to this size
+MULTIPART_MAX_SIZE = 256 * MB
+
+
+###########################
+##    UPLOADS SECTION    ##
+###########################
+
+def client():
+    api = APIClient()
+    # The file views only check that the user is authenticated, no database needed
+    api.force_authenticate(BookingUser(username='bench'))
+    return api
+
+
+def chunked_upload(api, filename, source, size, digest=None):
+    """
+    Uploads the source file through the resumable protocol, CHUNK_SIZE bytes per request.
+    :return: The commit response body.
+    """
+    body = {'filename': filename, 'size': size}
+    if digest:
+        body['sha256'] = digest
+    upload = api.post('/uploads/', body, format='json').json()
+    if 'sha256' in upload:
+        return upload
+
+    with open(source, 'rb') as file:
+        offset = 0
+        while offset < size:
+            chunk = file.read(CHUNK_SIZE)
+            response = api.put(
+                f"/uploads/{upload['id']}/?offset={offset}", data=chunk, content_type='application/octet-stream'
+            )
+            offset = response.json()['offset']
+    return api.post(f"/uploads/{upload['id']}/commit/").json()
+
+
+def multipart_upload(api, filename, source):
+    with open(source, 'rb') as file:
+        upload = SimpleUploadedFile(filename, file.read())
+    return api.post(f'/upload/{filename}/', {'file': upload}, format='multipart').json()
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+###########################
+##   BENCHMARK SECTION   ##
+###########################
+
+if __name__ == '__main__':
+    print(f"Uploads through the views, resumable in {CHUNK_SIZE // MB} MB chunks vs one multipart request\n")
+    api = client()
+
+    with tempfile.TemporaryDirectory() as directory, override_settings(MEDIA_ROOT=os.path.join(directory, 'media')):
+        # Warm up the URL resolver and the views
+        warm_up = os.path.join(directory, 'warm_up.bin')
+        with open(warm_up, 'wb') as file:
+            file.write(b'warm up')
+        chunked_upload(api, 'warm_up.bin', warm_up, 7)
+        multipart_upload(api, 'warm_up.bin', warm_up)
+
+        for size in SIZES:
+            source = os.path.join(directory, 'source.bin')
+            with open(source, 'wb') as file:
+                for _ in range(0, size, MB):
+                    file.write(os.urandom(min(MB, size)))
+            # Flushed first, the upload does not compete with writing the source back
+            os.sync()
+
+            stored, elapsed = timed(chunked_upload, api, f'file{size}.bin', source, size)
+            digest = stored['sha256']
+            line = f"{size // MB:5} MB   resumable {size / MB / elapsed:8.1f} MB/s"
+
+            # Same content under another name, announced by its hash
+            again, elapsed = timed(chunked_upload, api, f'copy{size}.bin', source, size, digest)
+            assert again['deduplicated']
+            line += f"   deduplicated in {elapsed * 1000:7.2f} ms"
+
+            if size <= MULTIPART_MAX_SIZE:
+                _, elapsed = timed(multipart_upload, api, f'multipart{size}.bin', source)
+                line += f"   multipart {size / MB / elapsed:8.1f} MB/s"
+
+            blobs = sum(len(files) for _, _, files in os.walk(os.path.join(directory, 'media', 'blobs')))
+            print(line + f"   blobs {blobs - 1}")
+            assert digest == hashlib.sha256(open(source, 'rb').read()).hexdigest()
+            os.remove(source)
@@ -0,0 +1,245 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+from decimal import Decimal
+# Django Libraries
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Subquery, Sum
+# Project Libraries
+from bookings.models import Hotel, HotelPriceAggregate, Room, RoomPriceTotals
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+# Keeps "IN (...)" lists well under SQLite's bound parameter limit
+CHUNK_SIZE = 500
+TWO_PLACES = Decimal('0.01')
+# Room.price_per_night only allows 8 digits, sums need more room
+PRICE_SUM = Sum('price_per_night', output_field=DecimalField(max_digits=20, decimal_places=2))
+
+
+###################
+# HELPERS SECTION #
+###################
+def _chunks(values, size=CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _average(price_sum, room_count):
+    if not room_count:
+        return None
+    return (Decimal(price_sum) / room_count).quantize(TWO_PLACES)
+
+
+def _price_sum(value):
+    # SQLite sums the prices as floats, round back to cents
+    return to_decimal(value or 0).quantize(TWO_PLACES)
+
+
+def to_decimal(value):
+    """
+    Normalizes prices assigned as floats or strings before they were saved.
+    """
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+#######################
+# MAINTENANCE SECTION #
+#######################
+def adjust_totals(price_delta, count_delta):
+    """
+    Applies a delta to the global running totals.
+    """
+    if not price_delta and not count_delta:
+        return
+    # The row is created by migration 0005, rebuild() restores it if it was removed
+    RoomPriceTotals.objects.filter(pk=1).update(
+        price_sum=F('price_sum') + to_decimal(price_delta),
+        room_count=F('room_count') + count_delta
+    )
+
+
+def refresh_hotels(hotel_ids):
+    """
+    Recomputes the aggregate rows of the given hotels from their rooms.
+
+    Each hotel is a short range scan on the (hotel, price_per_night) index, so
+    this stays cheap for single writes while bulk writes batch many hotels per query.
+    """
+    hotel_ids = {hotel_id for hotel_id in hotel_ids if hotel_id is not None}
+    for chunk in _chunks(hotel_ids):
+        fresh = {
+            row['hotel_id']: row for row in
+            Room.objects.filter(hotel_id__in=chunk)
+            .values('hotel_id')
+            .annotate(price_sum=PRICE_SUM, room_count=Count('id'), total_capacity=Sum('capacity'))
+            .order_by()
+        }
+        ratings = dict(Hotel.objects.filter(id__in=chunk).values_list('id', 'rating'))
+
+        rows = [
+            HotelPriceAggregate(
+                hotel_id=hotel_id,
+                price_sum=_price_sum(row['price_sum']),
+                room_count=row['room_count'],
+                total_capacity=row['total_capacity'],
+                avg_price=_average(_price_sum(row['price_sum']), row['room_count']),
+                rating=ratings[hotel_id],
+            )
+            for hotel_id, row in fresh.items() if hotel_id in ratings
+        ]
+        HotelPriceAggregate.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['hotel'],
+            update_fields=['price_sum', 'room_count', 'total_capacity', 'avg_price', 'rating'],
+        )
+
+        # Hotels that lost their last room
+        HotelPriceAggregate.objects.filter(hotel_id__in=set(chunk) - set(fresh)).delete()
+
+
+def _hotel_totals(hotel_ids):
+    """
+    :return: The (price_sum, room_count) of the given hotels' aggregate rows.
+    """
+    price_sum, room_count = Decimal(0), 0
+    for chunk in _chunks(hotel_ids):
+        totals = HotelPriceAggregate.objects.filter(hotel_id__in=chunk).aggregate(
+            price_sum=Sum('price_sum'), room_count=Sum('room_count')
+        )
+        price_sum += _price_sum(totals['price_sum'])
+        room_count += totals['room_count'] or 0
+    return price_sum, room_count
+
+
+def sync_ratings(hotel_ids):
+    """
+    Copies Hotel.rating onto the aggregate rows of the given hotels.
+    """
+    for chunk in _chunks(hotel_ids):
+        HotelPriceAggregate.objects.filter(hotel_id__in=chunk).update(
+            rating=Subquery(Hotel.objects.filter(pk=OuterRef('hotel_id')).values('rating')[:1])
+        )
+
+
+def room_changes(before, after):
+    """
+    Applies the effect of a set of room writes.
+
+    :param before: (hotel_id, price) of every touched room as it was, empty for inserts.
+    :param after: (hotel_id, price) of every touched room as it is now, empty for deletes.
+    """
+    price_delta = sum((to_decimal(price) for _, price in after), Decimal(0)) \
+        - sum((to_decimal(price) for _, price in before), Decimal(0))
+    adjust_totals(price_delta, len(after) - len(before))
+    refresh_hotels({hotel_id for hotel_id, _ in before} | {hotel_id for hotel_id, _ in after})
+
+
+def remove_hotel_rooms(hotel_ids):
+    """
+    Takes the rooms of hotels about to be deleted out of the global totals.
+    Their aggregate rows go away with the hotels through the cascade.
+    """
+    removed = Room.objects.filter(hotel__in=hotel_ids).aggregate(price_sum=PRICE_SUM, room_count=Count('id'))
+    adjust_totals(-_price_sum(removed['price_sum']), -removed['room_count'])
+
+
+def fetch_room_state(room_ids):
+    """
+    :return: (hotel_id, price) of the given rooms, read from the database.
+    """
+    state = []
+    for chunk in _chunks(room_ids):
+        state.extend(Room.objects.filter(pk__in=chunk).values_list('hotel_id', 'price_per_night'))
+    return state
+
+
+#########################
+# REBUILD/CHECK SECTION #
+#########################
+def compute_aggregates():
+    """
+    :return: Fresh {hotel_id: (price_sum, room_count, total_capacity)} plus the global (price_sum, room_count).
+    """
+    per_hotel = {}
+    price_sum, room_count = Decimal(0), 0
+    rows = (
+        Room.objects.values('hotel_id')
+        .annotate(price_sum=PRICE_SUM, room_count=Count('id'), total_capacity=Sum('capacity'))
+        .order_by()
+    )
+    for row in rows.iterator(chunk_size=5_000):
+        hotel_sum = _price_sum(row['price_sum'])
+        per_hotel[row['hotel_id']] = (hotel_sum, row['room_count'], row['total_capacity'])
+        price_sum += hotel_sum
+        room_count += row['room_count']
+    return per_hotel, (price_sum, room_count)
+
+
+@transaction.atomic
+def rebuild(batch_size=5_000, hotel_ids=None):
+    """
+    Drops and recomputes every aggregate row and the global totals.
+    With hotel_ids, only recomputes those hotels' rows and moves the totals by their change.
+    :return: The number of hotel rows written.
+    """
+    if hotel_ids is not None:
+        hotel_ids = {hotel_id for hotel_id in hotel_ids if hotel_id is not None}
+        price_before, count_before = _hotel_totals(hotel_ids)
+        refresh_hotels(hotel_ids)
+        price_after, count_after = _hotel_totals(hotel_ids)
+        adjust_totals(price_after - price_before, count_after - count_before)
+        return len(hotel_ids)
+
+    per_hotel, (price_sum, room_count) = compute_aggregates()
+    ratings = dict(Hotel.objects.filter(id__in=Subquery(Room.objects.values('hotel_id'))).values_list('id', 'rating'))
+
+    HotelPriceAggregate.objects.all().delete()
+    HotelPriceAggregate.objects.bulk_create(
+        (
+            HotelPriceAggregate(
+                hotel_id=hotel_id, price_sum=hotel_sum, room_count=count, total_capacity=capacity,
+                avg_price=_average(hotel_sum, count), rating=ratings[hotel_id],
+            )
+            for hotel_id, (hotel_sum, count, capacity) in per_hotel.items()
+        ),
+        batch_size=batch_size,
+    )
+    RoomPriceTotals.objects.update_or_create(pk=1, defaults={'price_sum': price_sum, 'room_count': room_count})
+    return len(per_hotel)
+
+
+def find_drift():
+    """
+    Compares the stored aggregates with freshly computed ones.
+    :return: A dict with the ids of missing, stale and extra hotel rows, and whether the totals differ.
+    """
+    per_hotel, (price_sum, room_count) = compute_aggregates()
+    ratings = dict(Hotel.objects.values_list('id', 'rating'))
+
+    stored = {}
+    for row in HotelPriceAggregate.objects.values_list(
+            'hotel_id', 'price_sum', 'room_count', 'total_capacity', 'avg_price', 'rating').iterator(chunk_size=5_000):
+        stored[row[0]] = row[1:]
+
+    missing, stale = [], []
+    for hotel_id, (hotel_sum, count, capacity) in per_hotel.items():
+        expected = (hotel_sum, count, capacity, _average(hotel_sum, count), ratings.get(hotel_id))
+        actual = stored.get(hotel_id)
+        if actual is None:
+            missing.append(hotel_id)
+        elif actual != expected:
+            stale.append(hotel_id)
+
+    totals = RoomPriceTotals.load()
+    return {
+        'missing': missing,
+        'stale': stale,
+        'extra': [hotel_id for hotel_id in stored if hotel_id not in per_hotel],
+        'totals': (to_decimal(totals.price_sum), totals.room_count) != (price_sum, room_count),
+    }
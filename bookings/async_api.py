@@ -0,0 +1,88 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+from functools import wraps
+# Django Libraries
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+# Django Rest Framework Libraries
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+# Project Libraries
+from bookings.authentication import token_cache
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+renderer = JSONRenderer()
+
+
+###################
+# HELPERS SECTION #
+###################
+def json_response(data, status=status.HTTP_200_OK, headers=None):
+    """
+    :return: The data rendered as the DRF views render it, also kept on response.data as DRF does.
+    """
+    response = HttpResponse(renderer.render(data), status=status, content_type='application/json')
+    response.data = data
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
+
+
+async def authenticate(request):
+    """
+    Async counterpart of the REST_FRAMEWORK authentication classes: token first (through the token cache,
+    see bookings.authentication), then session.
+    :return: The authenticated user, or None.
+    """
+    header = request.headers.get('Authorization', '').split()
+    if len(header) == 2 and header[0] == 'Token':
+        cached = await token_cache.aget(header[1])
+        if cached is not None:
+            return cached[0]
+
+        snapshot = token_cache.snapshot()
+        try:
+            token = await Token.objects.select_related('user').aget(key=header[1])
+        except Token.DoesNotExist:
+            return None
+        if not token.user.is_active:
+            return None
+        token_cache.put(token, snapshot)
+        return token.user
+
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+def async_api_view(methods, allow_anonymous=()):
+    """
+    Decorator for async views, doing what @api_view and IsAuthenticated do for the sync ones:
+    405 for other methods, 401 without valid credentials (except for the allow_anonymous methods).
+    The user is set on request.user.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapped(request, *args, **kwargs):
+            if request.method not in methods:
+                return json_response(
+                    {'detail': f'Method "{request.method}" not allowed.'}, status=status.HTTP_405_METHOD_NOT_ALLOWED,
+                    headers={'Allow': ', '.join(methods)},
+                )
+
+            user = await authenticate(request)
+            if user is None and request.method not in allow_anonymous:
+                return json_response(
+                    {'detail': 'Authentication credentials were not provided.'}, status=status.HTTP_401_UNAUTHORIZED,
+                    headers={'WWW-Authenticate': 'Token'},
+                )
+            # Never the lazy session user, which would query the database synchronously
+            request.user = user or AnonymousUser()
+            return await func(request, *args, **kwargs)
+        return wrapped
+    return decorator
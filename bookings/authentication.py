@@ -0,0 +1,266 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import collections
+import copy
+import threading
+import time
+# Django Libraries
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+# Django Rest Framework Libraries
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+# Project Libraries
+from bookings import metrics
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+# Shared cache key of the last token or user write of any process
+WRITTEN_MARKER = 'auth_token:written'
+
+
+#################
+# CACHE SECTION #
+#################
+class TokenCache:
+    """
+    Token key -> authenticated (user, token), in process memory: least recently used entries are
+    evicted past max_size, and each entry expires ttl seconds after it was read from the database.
+
+    Deleting or saving a token, or saving or deleting its user (deactivated, role changed...) drops
+    the entries at once in this process, and leaves the time of the write in the shared_cache alias,
+    for the token, the user and the last write of all. Every process reads the latter at most every
+    refresh_interval seconds; after it moves, each entry read before it checks the markers of its token
+    and user once, and is read again if either was written since. A revoked token thus works up to
+    refresh_interval seconds in the other processes (ttl if QuerySet.update() skipped the signals).
+    Only valid tokens of active users are cached.
+    """
+
+    def __init__(self, max_size=10_000, ttl=60, clock=time.monotonic, shared_cache='auth_tokens',
+                 refresh_interval=0.5):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.shared_cache = shared_cache
+        self.refresh_interval = refresh_interval
+
+        self._entries = collections.OrderedDict()
+        self._keys_by_user = {}
+        # Bumped by every invalidation: a lookup that started before one does not store its result
+        self.generation = 0
+        # The last write time of any process, as of _refresh_at - refresh_interval
+        self._written_at = 0
+        self._refresh_at = clock()
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ('hits', 'misses', 'expired', 'revoked', 'evictions', 'invalidations', 'refreshes'), 0
+        )
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            max_size=getattr(settings, 'AUTH_TOKEN_CACHE_SIZE', 10_000),
+            ttl=getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60),
+            shared_cache=getattr(settings, 'AUTH_TOKEN_REVOCATION_CACHE', 'auth_tokens'),
+            refresh_interval=getattr(settings, 'AUTH_TOKEN_REVOCATION_INTERVAL', 0.5),
+        )
+
+    def install(self):
+        """
+        Invalidates the entries on token and user writes.
+        """
+        post_save.connect(self._token_changed, sender=Token, dispatch_uid='token_cache_token_saved')
+        post_delete.connect(self._token_changed, sender=Token, dispatch_uid='token_cache_token_deleted')
+        user_model = get_user_model()
+        post_save.connect(self._user_changed, sender=user_model, dispatch_uid='token_cache_user_saved')
+        post_delete.connect(self._user_changed, sender=user_model, dispatch_uid='token_cache_user_deleted')
+
+    def _token_changed(self, sender, instance, **kwargs):
+        # A token's key is its primary key, a regenerated one is a new row
+        self.invalidate(key=instance.key, user_id=instance.user_id)
+
+    def _user_changed(self, sender, instance, **kwargs):
+        self.invalidate(user_id=instance.pk)
+
+    def get(self, key):
+        """
+        :return: A copy of the cached (user, token), the request may modify it, or None.
+        """
+        entry = self._entry(key)
+        if entry is None or (self._must_check(entry) and self._revoked(key, entry)):
+            return None
+        return self._hit(key, entry)
+
+    async def aget(self, key):
+        """
+        get() for the async views: the shared cache, when it must be read, is read off the event loop.
+        """
+        entry = self._entry(key)
+        if entry is None or (self._must_check(entry) and await sync_to_async(self._revoked)(key, entry)):
+            return None
+        return self._hit(key, entry)
+
+    def _entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            if self.clock() >= entry[2]:
+                self._remove(key)
+                self._counters['expired'] += 1
+                self._counters['misses'] += 1
+                return None
+            return entry
+
+    def _must_check(self, entry):
+        # Either the last write time is due for a refresh, or the entry was not checked against it
+        return self.clock() >= self._refresh_at or entry[4] < self._written_at
+
+    def _revoked(self, key, entry):
+        """
+        :return: Whether the token or its user was written by another process since the entry was read.
+        """
+        shared = caches[self.shared_cache]
+        if self.clock() >= self._refresh_at:
+            written_at = shared.get(WRITTEN_MARKER, 0)
+            with self._lock:
+                self._written_at = max(self._written_at, written_at)
+                self._refresh_at = self.clock() + self.refresh_interval
+                self._counters['refreshes'] += 1
+        written_at = self._written_at
+        user, token, expires, read_at, checked = entry
+        if checked >= written_at:
+            return False
+
+        written = shared.get_many([_key_marker(key), _user_marker(token.user_id)])
+        with self._lock:
+            if any(marker >= read_at for marker in written.values()):
+                if self._entries.get(key) is entry:
+                    self._remove(key)
+                self._counters['revoked'] += 1
+                self._counters['misses'] += 1
+                return True
+            # Not checked again until another write
+            if self._entries.get(key) is entry:
+                self._entries[key] = (user, token, expires, read_at, written_at)
+        return False
+
+    def _hit(self, key, entry):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+        user = copy.copy(entry[0])
+        token = copy.copy(entry[1])
+        token.user = user
+        return user, token
+
+    def snapshot(self):
+        """
+        :return: What put() needs to know of the time before a token is read from the database.
+        """
+        return self.generation, time.time()
+
+    def put(self, token, snapshot):
+        """
+        Caches an authenticated token, read from the database with its user.
+        :param snapshot: snapshot() before the token was read, an invalidation since means it may be stale.
+        """
+        generation, read_at = snapshot
+        with self._lock:
+            if generation != self.generation:
+                return
+            # Copies: the request that read them may still modify them
+            user, token = copy.copy(token.user), copy.copy(token)
+            token.user = user
+            self._remove(token.key)
+            # Checked against the writes up to when it was read
+            self._entries[token.key] = (user, token, self.clock() + self.ttl, read_at, read_at)
+            self._keys_by_user.setdefault(token.user_id, set()).add(token.key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self._counters['evictions'] += 1
+
+    def invalidate(self, key=None, user_id=None):
+        """
+        Drops a token's entry, and every entry of a user, in every process.
+        """
+        with self._lock:
+            self.generation += 1
+            self._counters['invalidations'] += 1
+            if key is not None:
+                self._remove(key)
+            for user_key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(user_key)
+
+        # Kept past the expiry of every entry read before, and set before the last write time which
+        # sends the other processes to them
+        written_at = time.time()
+        markers = {_key_marker(key): written_at} if key is not None else {}
+        if user_id is not None:
+            markers[_user_marker(user_id)] = written_at
+        caches[self.shared_cache].set_many(markers, timeout=2 * self.ttl)
+        caches[self.shared_cache].set(WRITTEN_MARKER, written_at, timeout=None)
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_keys = self._keys_by_user.get(entry[1].user_id)
+        user_keys.discard(key)
+        if not user_keys:
+            del self._keys_by_user[entry[1].user_id]
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            counters['size'] = len(self._entries)
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_rate'] = round(counters['hits'] / lookups, 4) if lookups else None
+        return counters
+
+
+def _key_marker(key):
+    return f'auth_token:key:{key}'
+
+
+def _user_marker(user_id):
+    return f'auth_token:user:{user_id}'
+
+
+token_cache = TokenCache.from_settings()
+metrics.register('auth_tokens', token_cache.stats)
+
+
+##########################
+# AUTHENTICATION SECTION #
+##########################
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication answering from the token cache: no query for a token seen in the last
+    AUTH_TOKEN_CACHE_TTL seconds. Same header, errors and (user, token) result.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached
+
+        snapshot = token_cache.snapshot()
+        user, token = super().authenticate_credentials(key)
+        token_cache.put(token, snapshot)
+        return user, token
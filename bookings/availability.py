@@ -0,0 +1,121 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import bisect
+from datetime import date
+# Django Libraries
+from django.db.models import Exists, OuterRef
+# Project Libraries
+from bookings.models import Booking, Room
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+# Cancelled bookings do not hold their room
+NON_BLOCKING_STATE = Booking.BookingState.CANCELLED
+# Rooms per IN (...) lookup of conflicting_holds
+CHUNK_SIZE = 500
+
+
+###################
+# HELPERS SECTION #
+###################
+def parse_range(params):
+    """
+    Reads the requested stay from the "start_date" (check-in) and "end_date" (check-out) parameters.
+    :return: (start, end) dates.
+    :raises ValueError: If a date is missing or malformed, or the stay is empty.
+    """
+    try:
+        start = date.fromisoformat(params.get('start_date', ''))
+        end = date.fromisoformat(params.get('end_date', ''))
+    except ValueError:
+        raise ValueError('start_date and end_date are required, as YYYY-MM-DD')
+    if start >= end:
+        raise ValueError('end_date must be after start_date')
+    return start, end
+
+
+########################
+# AVAILABILITY SECTION #
+########################
+def blocking_bookings(start, end):
+    """
+    Bookings holding their room for part of [start, end): they start before the
+    check-out and end after the check-in.
+
+    Per room this is a seek on the (room, endDate, startDate, state) index to
+    the bookings ending after `start`, which are only the current and future
+    ones, and the other conditions are checked on the index entries themselves.
+    """
+    return Booking.objects.filter(endDate__gt=start, startDate__lt=end).exclude(state=NON_BLOCKING_STATE)
+
+
+def conflicting_bookings(room, start, end):
+    """
+    :return: The bookings of a room overlapping [start, end).
+    """
+    return blocking_bookings(start, end).filter(room=room)
+
+
+def conflicting_holds(holds):
+    """
+    Checks a batch of bookings about to be written for overlaps, with each other and with the stored
+    ones, in one query per CHUNK_SIZE rooms (see bookings.bulk).
+    :param holds: {key: (pk, room_id, start, end)} of the batch's blocking bookings.
+    :return: The keys of the holds overlapping another hold or a stored booking.
+    """
+    by_room = {}
+    for key, (_, room_id, start, end) in holds.items():
+        by_room.setdefault(room_id, []).append((start, end, key))
+
+    conflicts = set()
+    for room_holds in by_room.values():
+        # Sweep by check-in: a hold starting before the latest check-out so far overlaps that booking
+        room_holds.sort()
+        latest_end, latest_key = None, None
+        for start, end, key in room_holds:
+            if latest_end is not None and start < latest_end:
+                conflicts.update((key, latest_key))
+            if latest_end is None or end > latest_end:
+                latest_end, latest_key = end, key
+
+    # The stored versions of the batch's own bookings are being replaced
+    batch_pks = [pk for pk, _, _, _ in holds.values() if pk is not None]
+    first_start = min((start for _, _, start, _ in holds.values()), default=None)
+    last_end = max((end for _, _, _, end in holds.values()), default=None)
+    room_ids = list(by_room)
+    for offset in range(0, len(room_ids), CHUNK_SIZE):
+        stored = {}
+        rows = (
+            blocking_bookings(first_start, last_end)
+            .filter(room_id__in=room_ids[offset:offset + CHUNK_SIZE])
+            .exclude(pk__in=batch_pks)
+            .values_list('room_id', 'startDate', 'endDate')
+        )
+        for room_id, start, end in rows:
+            stored.setdefault(room_id, []).append((start, end))
+
+        for room_id, intervals in stored.items():
+            # Latest check-out among the stored bookings starting before each one's check-in
+            intervals.sort()
+            starts = [start for start, _ in intervals]
+            latest_ends = []
+            for _, end in intervals:
+                latest_ends.append(max(end, latest_ends[-1]) if latest_ends else end)
+            for start, end, key in by_room[room_id]:
+                before = bisect.bisect_left(starts, end)
+                if before and latest_ends[before - 1] > start:
+                    conflicts.add(key)
+    return conflicts
+
+
+def available_rooms(start, end, rooms=None):
+    """
+    Filters rooms (all of them by default) down to those free for the whole of [start, end).
+    One index probe per candidate room instead of scanning every booking for every room.
+    """
+    rooms = Room.objects.all() if rooms is None else rooms
+    return rooms.filter(~Exists(blocking_bookings(start, end).filter(room=OuterRef('pk'))))
@@ -0,0 +1,181 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import asyncio
+import collections
+import itertools
+import json
+import threading
+import time
+# Django Libraries
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+# Project Libraries
+from bookings import metrics
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+OVERFLOW_POLICIES = ('drop', 'merge')
+# Fan-out latencies kept for the percentiles
+LATENCY_SAMPLES = 1_000
+
+
+#######################
+# BROADCASTER SECTION #
+#######################
+class Broadcaster:
+    """
+    Booking events for the websocket clients. Each event is encoded to JSON once (by
+    bookings.live for the subscriptions it matches); every connection then forwards that same text.
+
+    Each connection writes through its own Outbox task, so a slow client holds up
+    neither the consumer nor the channel layer. Clients connecting with ?batch=1 get
+    the events coalesced into {"batch": [...]} frames of at most batch_size events,
+    written at most batch_interval seconds after the first one; the others get one
+    frame per event.
+
+    Overflow policies, applied to a connection that falls behind:
+    - drop:  once queue_size events are pending, the oldest one is discarded.
+    - merge: a pending event about the same booking is replaced by the newer one,
+             which the client would overwrite anyway; past queue_size, drop as above.
+    """
+
+    def __init__(self, queue_size=100, batch_size=50, batch_interval=0.05, overflow_policy='merge'):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow_policy!r}, expected one of {OVERFLOW_POLICIES}")
+
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.overflow_policy = overflow_policy
+
+        self._lock = threading.Lock()
+        self._latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self._counters = dict.fromkeys(
+            ('received', 'merged', 'dropped_frames', 'frames', 'events_sent', 'connections'), 0
+        )
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            queue_size=getattr(settings, 'BROADCAST_QUEUE_SIZE', 100),
+            batch_size=getattr(settings, 'BROADCAST_BATCH_SIZE', 50),
+            batch_interval=getattr(settings, 'BROADCAST_BATCH_INTERVAL', 0.05),
+            overflow_policy=getattr(settings, 'BROADCAST_OVERFLOW_POLICY', 'merge'),
+        )
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def message(self, data, key=None):
+        """
+        :return: The event for Outbox.put(), its data encoded once for every receiver. Events with the
+                 same key (e.g. a booking id) may be merged for the clients falling behind.
+        """
+        return {
+            'text': json.dumps(data, cls=DjangoJSONEncoder),
+            'key': None if key is None else str(key),
+            'sent': time.time(),
+        }
+
+    def outbox(self, send, batch=False):
+        """
+        :param send: Coroutine function writing a text frame to the connection.
+        :return: The Outbox of a new connection, writing from a task of the running loop.
+        """
+        return Outbox(self, send, batch)
+
+    def _sent(self, events):
+        now = time.time()
+        with self._lock:
+            self._counters['frames'] += 1
+            self._counters['events_sent'] += len(events)
+            self._latencies.extend((now - sent) * 1000 for _, sent in events if sent is not None)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            latencies = sorted(self._latencies)
+        counters['overflow_policy'] = self.overflow_policy
+        counters['latency_ms'] = {
+            'p50': latencies[len(latencies) // 2],
+            'p99': latencies[int(len(latencies) * 0.99)],
+            'max': latencies[-1],
+        } if latencies else None
+        return counters
+
+
+class Outbox:
+    """
+    Outbound queue of one websocket connection, see Broadcaster.
+    """
+
+    def __init__(self, broadcaster, send, batch):
+        self.broadcaster = broadcaster
+        self.send = send
+        self.batch = batch
+
+        # Pending (text, sent time) by event key, unkeyed events get a unique one
+        self._pending = collections.OrderedDict()
+        self._sequence = itertools.count()
+        self._ready = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        broadcaster._count('connections')
+
+    def put(self, event):
+        """
+        Queues an event without waiting for the connection.
+        """
+        broadcaster = self.broadcaster
+        broadcaster._count('received')
+
+        key = event.get('key') if broadcaster.overflow_policy == 'merge' else None
+        if key is not None and key in self._pending:
+            self._pending[key] = (event['text'], event.get('sent'))
+            broadcaster._count('merged')
+            return
+
+        if len(self._pending) >= broadcaster.queue_size:
+            self._pending.popitem(last=False)
+            broadcaster._count('dropped_frames')
+        self._pending[key if key is not None else next(self._sequence)] = (event['text'], event.get('sent'))
+
+        self._ready.set()
+        if len(self._pending) >= broadcaster.batch_size:
+            self._full.set()
+
+    async def _run(self):
+        broadcaster = self.broadcaster
+        while True:
+            await self._ready.wait()
+            if self.batch and len(self._pending) < broadcaster.batch_size:
+                # Coalesce what arrives until the batch is full or the interval is over
+                try:
+                    await asyncio.wait_for(self._full.wait(), broadcaster.batch_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+            size = min(broadcaster.batch_size if self.batch else 1, len(self._pending))
+            events = [self._pending.popitem(last=False)[1] for _ in range(size)]
+            if not self._pending:
+                self._ready.clear()
+            if len(self._pending) < broadcaster.batch_size:
+                self._full.clear()
+
+            # The events are JSON already, a batch is only joined
+            text = '{"batch": [%s]}' % ', '.join(text for text, _ in events) if self.batch else events[0][0]
+            await self.send(text)
+            broadcaster._sent(events)
+
+    def close(self):
+        self._task.cancel()
+        self.broadcaster._count('connections', -1)
+
+
+broadcaster = Broadcaster.from_settings()
+metrics.register('broadcast', broadcaster.stats)
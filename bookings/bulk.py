@@ -0,0 +1,305 @@
+###################
+# IMPORTS SECTION #
+###################
+# Django Libraries
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+# Django Rest Framework Libraries
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
+# Project Libraries
+from bookings.availability import NON_BLOCKING_STATE, conflicting_holds
+from bookings.models import Booking
+from bookings.serializers.BookingsSerializer import ROOM_TAKEN_MESSAGE, BookingSerializer
+from bookings.utils import log_bulk
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+# Items accepted by one bulk request
+MAX_ITEMS = 5000
+# Rows per INSERT / UPDATE statement, and values per IN (...) lookup
+BATCH_SIZE = 500
+
+_ACTIONS = {'POST': 'CREATE', 'PATCH': 'UPDATE', 'DELETE': 'DELETE'}
+
+
+######################
+# SERIALIZER SECTION #
+######################
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field resolved from objects fetched once for the whole batch
+    (context['related'][field name], keyed by primary key) instead of one query per item.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = self.get_queryset().model._meta.pk.to_python(data)
+        except (DjangoValidationError, TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return self.context['related'][self.field_name][pk]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+
+def bulk_serializer(serializer_class, context, partial):
+    """
+    Builds one serializer validating every item of a batch, where per-row
+    database checks (related objects, unique fields) are replaced by batched ones.
+    """
+
+    class BulkSerializer(serializer_class):
+        def build_standard_field(self, field_name, model_field):
+            field_class, field_kwargs = super().build_standard_field(field_name, model_field)
+            field_kwargs['validators'] = [
+                validator for validator in field_kwargs.get('validators', [])
+                if not isinstance(validator, UniqueValidator)
+            ]
+            return field_class, field_kwargs
+
+        def get_fields(self):
+            fields = super().get_fields()
+            for name, field in fields.items():
+                if isinstance(field, serializers.PrimaryKeyRelatedField) and not field.read_only:
+                    fields[name] = PrefetchedPrimaryKeyRelatedField(
+                        queryset=field.queryset, allow_null=field.allow_null, required=field.required
+                    )
+            return fields
+
+        def get_validators(self):
+            return [
+                validator for validator in super().get_validators()
+                if not isinstance(validator, UniqueTogetherValidator)
+            ]
+
+        def validate(self, attrs):
+            # The room availability probe runs once for the whole batch (see _check_overlaps)
+            if isinstance(self, BookingSerializer):
+                return attrs
+            return super().validate(attrs)
+
+    return BulkSerializer(context=context, partial=partial)
+
+
+###################
+# HELPERS SECTION #
+###################
+def _chunks(values):
+    values = list(values)
+    for start in range(0, len(values), BATCH_SIZE):
+        yield values[start:start + BATCH_SIZE]
+
+
+def _to_pk(model, value):
+    try:
+        return model._meta.pk.to_python(value)
+    except (DjangoValidationError, TypeError, ValueError):
+        return None
+
+
+def _fetch(model, pks):
+    """
+    :return: {pk: instance} for the given primary keys, one query per BATCH_SIZE keys.
+    """
+    found = {}
+    for chunk in _chunks(set(pks)):
+        found.update(model.objects.in_bulk(chunk))
+    return found
+
+
+def _prefetch_related(serializer, items):
+    """
+    Loads the targets of every writable primary key field referenced by the batch.
+    """
+    related = {}
+    for name, field in serializer.fields.items():
+        if isinstance(field, PrefetchedPrimaryKeyRelatedField):
+            model = field.get_queryset().model
+            pks = [_to_pk(model, item[name]) for item in items if isinstance(item, dict) and item.get(name) is not None]
+            related[name] = _fetch(model, [pk for pk in pks if pk is not None])
+    return related
+
+
+def _add_error(errors, index, key, message):
+    errors[index].setdefault(key, []).append(message)
+
+
+def _check_unique(model, objs, errors):
+    """
+    Checks unique fields and unique_together sets for the whole batch: duplicates
+    inside the request, then conflicts with stored rows, one IN query per set and chunk.
+    """
+    meta = model._meta
+    unique_sets = [(field,) for field in meta.fields if field.unique and not field.primary_key]
+    unique_sets += [tuple(meta.get_field(name) for name in names) for names in meta.unique_together]
+
+    batch_pks = [obj.pk for obj in objs.values() if obj.pk is not None]
+    for fields in unique_sets:
+        attnames = [field.attname for field in fields]
+        if len(fields) == 1:
+            key, message = fields[0].name, f'{meta.model_name} with this {fields[0].verbose_name} already exists.'
+        else:
+            key = api_settings.NON_FIELD_ERRORS_KEY
+            message = f"The fields {', '.join(field.name for field in fields)} must make a unique set."
+
+        keys, seen = {}, set()
+        for index, obj in objs.items():
+            values = tuple(getattr(obj, attname) for attname in attnames)
+            if None in values:
+                continue
+            if values in seen:
+                _add_error(errors, index, key, message)
+                continue
+            seen.add(values)
+            keys[index] = values
+
+        stored = set()
+        for chunk in _chunks({values[0] for values in keys.values()}):
+            stored.update(
+                model.objects
+                .filter(**{f'{attnames[0]}__in': chunk})
+                .exclude(pk__in=batch_pks)
+                .values_list(*attnames)
+            )
+        for index, values in keys.items():
+            if values in stored:
+                _add_error(errors, index, key, message)
+
+
+def _check_overlaps(objs, errors):
+    """
+    Checks that the batch's bookings do not hold a room for overlapping dates, with each other
+    or with stored bookings, instead of one query per booking.
+    """
+    holds = {
+        index: (obj.pk, obj.room_id, obj.startDate, obj.endDate)
+        for index, obj in objs.items()
+        if obj.room_id is not None and obj.startDate and obj.endDate and obj.state != NON_BLOCKING_STATE
+    }
+    for index in conflicting_holds(holds):
+        _add_error(errors, index, 'room', ROOM_TAKEN_MESSAGE)
+
+
+def _invalid(errors):
+    return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+
+##################
+# WRITES SECTION #
+##################
+def _save(request, model, serializer_class, items):
+    creating = request.method == 'POST'
+    errors = [{} for _ in items]
+    instances = {}
+
+    if not creating:
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or _to_pk(model, item.get('id')) is None:
+                _add_error(errors, index, 'id', 'A valid id is required.')
+        stored = _fetch(model, [_to_pk(model, item['id']) for index, item in enumerate(items) if not errors[index]])
+        for index, item in enumerate(items):
+            if not errors[index]:
+                instances[index] = stored.get(_to_pk(model, item['id']))
+                if instances[index] is None:
+                    _add_error(errors, index, 'id', 'Not found.')
+
+    context = {'request': request}
+    serializer = bulk_serializer(serializer_class, context, partial=not creating)
+    context['related'] = _prefetch_related(serializer, items)
+
+    # Field validation, no queries left per item
+    objs, updated_fields = {}, set()
+    for index, item in enumerate(items):
+        if errors[index]:
+            continue
+        serializer.instance = instances.get(index)
+        try:
+            attrs = serializer.run_validation(item)
+        except serializers.ValidationError as error:
+            errors[index] = serializers.as_serializer_error(error)
+            continue
+
+        if creating:
+            objs[index] = model(**attrs)
+        else:
+            objs[index] = instances[index]
+            for attr, value in attrs.items():
+                setattr(objs[index], attr, value)
+            updated_fields.update(attrs)
+    serializer.instance = None
+
+    _check_unique(model, objs, errors)
+    if model is Booking:
+        _check_overlaps(objs, errors)
+    if any(errors):
+        return _invalid(errors)
+
+    rows = list(objs.values())
+    try:
+        with transaction.atomic():
+            if creating:
+                model.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+            elif updated_fields:
+                model.objects.bulk_update(rows, sorted(updated_fields), batch_size=BATCH_SIZE)
+    except IntegrityError as error:
+        return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+    log_bulk(request, model.__name__, _ACTIONS[request.method], [row.pk for row in rows])
+    return Response(
+        [serializer.to_representation(row) for row in rows],
+        status=status.HTTP_201_CREATED if creating else status.HTTP_200_OK
+    )
+
+
+def _delete(request, model, items):
+    errors = [{} for _ in items]
+    pks = {}
+    for index, item in enumerate(items):
+        pk = _to_pk(model, item.get('id') if isinstance(item, dict) else item)
+        if pk is None:
+            _add_error(errors, index, 'id', 'A valid id is required.')
+        else:
+            pks[index] = pk
+
+    stored = set()
+    for chunk in _chunks(set(pks.values())):
+        stored.update(model.objects.filter(pk__in=chunk).values_list('pk', flat=True))
+    for index, pk in pks.items():
+        if pk not in stored:
+            _add_error(errors, index, 'id', 'Not found.')
+    if any(errors):
+        return _invalid(errors)
+
+    with transaction.atomic():
+        for chunk in _chunks(stored):
+            model.objects.filter(pk__in=chunk).delete()
+
+    log_bulk(request, model.__name__, 'DELETE', stored)
+    return Response({'deleted': len(stored)})
+
+
+def bulk_write(request, model, serializer_class):
+    """
+    Creates (POST), updates (PATCH, each item carrying its "id") or deletes
+    (DELETE, a list of ids) up to MAX_ITEMS objects in one transaction.
+
+    Related objects and unique constraints are checked for the whole batch
+    at once. Nothing is written unless every item is valid; otherwise the
+    response carries an "errors" list aligned with the request items.
+    """
+    items = request.data
+    if not isinstance(items, list) or not items:
+        return Response({'error': 'expected a non-empty list of items'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > MAX_ITEMS:
+        return Response({'error': f'at most {MAX_ITEMS} items per request'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if request.method == 'DELETE':
+        return _delete(request, model, items)
+    return _save(request, model, serializer_class, items)
@@ -0,0 +1,137 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import hashlib
+import mimetypes
+import os
+import threading
+from datetime import datetime, timezone
+# Django Libraries
+from django.db import transaction
+# Project Libraries
+from bookings import metrics
+from bookings.uploads import BUFFER_SIZE, upload_store
+
+
+###################
+# HELPERS SECTION #
+###################
+def hash_file(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for data in iter(lambda: file.read(BUFFER_SIZE), b''):
+            hasher.update(data)
+    return hasher.hexdigest()
+
+
+def _modified(stat):
+    return datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+
+
+###################
+# CATALOG SECTION #
+###################
+class FileCatalog:
+    """
+    The StoredFile rows describing MEDIA_ROOT/uploads, for listing without walking the directory.
+
+    The upload views record() every file they store. scan() reconciles the catalog with the directory
+    for anything written around them (files copied in, deleted, or stored before the catalog): one
+    directory pass and one catalog query, hashing only the files that are new or changed. The sha256
+    of a content-addressed file is its blob name, the others are read once.
+    """
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(('recorded', 'scans', 'added', 'updated', 'removed', 'hashed'), 0)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def describe(self, name, digest=None):
+        """
+        :return: The StoredFile fields of an uploaded file, its modification time being the name's
+        (a deduplicated upload's link) rather than its content's.
+        """
+        path = os.path.join(upload_store.uploads_dir, name)
+        digest = digest or upload_store.digest_of(name)
+        if digest is None:
+            digest = hash_file(path)
+            self._count('hashed')
+        return {
+            'size': os.stat(path).st_size,
+            'modified': _modified(os.lstat(path)),
+            'sha256': digest,
+            'content_type': mimetypes.guess_type(name)[0] or 'application/octet-stream',
+        }
+
+    def record(self, stored):
+        """
+        Writes the catalog entry of a file the upload store just stored.
+        :param stored: The result of an UploadStore save, commit or link_existing.
+        :return: The StoredFile.
+        """
+        from bookings.models import StoredFile
+
+        entry, _ = StoredFile.objects.update_or_create(
+            name=stored['filename'], defaults=self.describe(stored['filename'], stored['sha256'])
+        )
+        self._count('recorded')
+        return entry
+
+    def scan(self):
+        """
+        Brings the catalog in line with the uploads directory.
+        :return: The number of entries added, updated and removed.
+        """
+        from bookings.models import StoredFile
+
+        on_disk = {}
+        if os.path.isdir(upload_store.uploads_dir):
+            for entry in os.scandir(upload_store.uploads_dir):
+                # Dot files are the store's temporary links
+                if not entry.name.startswith('.') and entry.is_file():
+                    on_disk[entry.name] = entry
+
+        catalog = {
+            name: (pk, size, modified)
+            for pk, name, size, modified in StoredFile.objects.values_list('pk', 'name', 'size', 'modified')
+        }
+
+        added, updated = [], []
+        for name, entry in on_disk.items():
+            known = catalog.get(name)
+            if known is not None and known[1:] == (entry.stat().st_size, _modified(entry.stat(follow_symlinks=False))):
+                continue
+            if known is None:
+                added.append(StoredFile(name=name, **self.describe(name)))
+            else:
+                updated.append(StoredFile(pk=known[0], name=name, **self.describe(name)))
+        removed = [pk for name, (pk, _, _) in catalog.items() if name not in on_disk]
+
+        with transaction.atomic():
+            StoredFile.objects.bulk_create(added, batch_size=self.batch_size)
+            StoredFile.objects.bulk_update(
+                updated, ['size', 'modified', 'sha256', 'content_type'], batch_size=self.batch_size
+            )
+            for start in range(0, len(removed), self.batch_size):
+                StoredFile.objects.filter(pk__in=removed[start:start + self.batch_size]).delete()
+
+        with self._lock:
+            self._counters['scans'] += 1
+            self._counters['added'] += len(added)
+            self._counters['updated'] += len(updated)
+            self._counters['removed'] += len(removed)
+        return {'added': len(added), 'updated': len(updated), 'removed': len(removed)}
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+
+file_catalog = FileCatalog()
+metrics.register('file_catalog', file_catalog.stats)
@@ -0,0 +1,286 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import asyncio
+import json
+import random
+import sqlite3
+import string
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+# Django Libraries
+from django.core.serializers.json import DjangoJSONEncoder
+# Third Party Libraries
+from channels.layers import InMemoryChannelLayer
+# Project Libraries
+from bookings import metrics
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+TABLE = 'channel_messages'
+# Kinds of rows: a message for one channel, a message for a group,
+# and group memberships of a channel owned by another process
+MESSAGE, GROUP, GROUP_ADD, GROUP_DISCARD = 'message', 'group', 'add', 'discard'
+
+
+#########################
+# CHANNEL LAYER SECTION #
+#########################
+class SQLiteChannelLayer(InMemoryChannelLayer):
+    """
+    Channel layer shared by every process of the host through one SQLite file, without a broker.
+
+    Each process keeps the in-memory queues and groups of its own channels, and the
+    processes exchange rows of the channel_messages table:
+    - group_send delivers to the local members right away and appends a single row,
+      which every other process fans out to its own members (one write per broadcast,
+      whatever the number of subscribers);
+    - sends to a specific channel of another process ("specific.<process>!...")
+      append a row only that process delivers;
+    - sends to a general channel append a row claimed by exactly one receiving process;
+    - group_add / group_discard of another process's channel are forwarded to it.
+
+    A poller task reads the new rows every poll_interval seconds, once "PRAGMA data_version"
+    shows another connection wrote; rows are deleted once older than expiry. Database
+    calls run on one thread per layer, never on the event loop. Sends from another event
+    loop than the poller's (e.g. async_to_sync in a background thread) reach the local
+    channels through the table too, their queues belong to the poller's loop.
+
+    Messages cross processes as JSON (DjangoJSONEncoder), so dates, UUIDs and decimals
+    arrive as strings. Each local receiver of a group message gets its own shallow copy.
+    """
+
+    extensions = ['groups', 'flush']
+
+    def __init__(self, path, poll_interval=0.005, expiry=60, group_expiry=86400, capacity=100,
+                 channel_capacity=None, **kwargs):
+        super().__init__(expiry=expiry, group_expiry=group_expiry, capacity=capacity, **kwargs)
+        self.channel_capacity = self.compile_capacities(channel_capacity or {})
+        self.path = str(path)
+        self.poll_interval = poll_interval
+        # Name of this process in its specific channel names
+        self.process = f'sqlite{uuid.uuid4().hex[:12]}'
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='channel-layer')
+        self._database = None
+        self._data_version = None
+        self._last_id = 0
+        self._next_prune = 0.0
+        self._next_clean = 0.0
+        self._poller = None
+        # General channels this process receives on, it claims their rows
+        self._receiving = set()
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ('published', 'remote_deliveries', 'claimed', 'full_drops', 'scans', 'errors'), 0
+        )
+        metrics.register('channel_layer', self.stats)
+        # Messages are delivered from the layer's creation on
+        self._executor.submit(self._connect).result()
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _is_local(self, channel):
+        return '!' in channel and channel.partition('!')[0].endswith(self.process)
+
+    # Database, only ever used from the layer's thread
+
+    def _connect(self):
+        if self._database is not None:
+            return self._database
+
+        database = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        database.execute('PRAGMA journal_mode = wal')
+        database.execute('PRAGMA synchronous = normal')
+        database.execute('PRAGMA busy_timeout = 5000')
+        database.execute(
+            f'CREATE TABLE IF NOT EXISTS {TABLE} ('
+            # AUTOINCREMENT: ids of pruned rows are never handed out again under a poller's cursor
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, origin TEXT NOT NULL, kind TEXT NOT NULL, '
+            'channel TEXT, grp TEXT, body TEXT, expires REAL NOT NULL)'
+        )
+        database.execute(f'CREATE INDEX IF NOT EXISTS {TABLE}_expires ON {TABLE} (expires)')
+        self._last_id = database.execute(f'SELECT COALESCE(MAX(id), 0) FROM {TABLE}').fetchone()[0]
+        self._database = database
+        return database
+
+    def _insert(self, row):
+        self._connect().execute(
+            f'INSERT INTO {TABLE} (origin, kind, channel, grp, body, expires) VALUES (?, ?, ?, ?, ?, ?)', row
+        )
+        # Our own writes do not change data_version, rescan for general channels we receive on
+        self._data_version = None
+
+    def _poll(self):
+        """
+        :return: The (kind, channel, group, body) rows written since the last poll that this process delivers.
+        """
+        database = self._connect()
+        now = time.time()
+        if now >= self._next_prune:
+            database.execute(f'DELETE FROM {TABLE} WHERE expires < ?', [now])
+            self._next_prune = now + self.expiry
+
+        version = database.execute('PRAGMA data_version').fetchone()[0]
+        if version == self._data_version:
+            return []
+        self._data_version = version
+        self._count('scans')
+
+        rows = database.execute(
+            f'SELECT id, origin, kind, channel, grp, body FROM {TABLE} WHERE id > ? ORDER BY id', [self._last_id]
+        ).fetchall()
+        deliveries = []
+        for row_id, origin, kind, channel, group, body in rows:
+            self._last_id = row_id
+            if kind == GROUP:
+                # Local members already got their copy in group_send
+                if origin != self.process and group in self.groups:
+                    deliveries.append((kind, channel, group, body))
+            elif self._is_local(channel or ''):
+                deliveries.append((kind, channel, group, body))
+            elif kind == MESSAGE and channel in self._receiving:
+                # General channel: the first receiving process deleting the row gets it
+                claimed = database.execute(f'DELETE FROM {TABLE} WHERE id = ? RETURNING id', [row_id]).fetchone()
+                if claimed:
+                    self._count('claimed')
+                    deliveries.append((kind, channel, group, body))
+        return deliveries
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def _publish(self, kind, channel=None, group=None, message=None, origin=None):
+        body = None if message is None else json.dumps(message, cls=DjangoJSONEncoder)
+        origin = self.process if origin is None else origin
+        await self._run(self._insert, (origin, kind, channel, group, body, time.time() + self.expiry))
+        self._count('published')
+
+    def _clean_expired(self):
+        # The in-memory layer walks every channel and group on each receive and group_send,
+        # quadratic in the number of subscribers: at most once a second here
+        now = time.monotonic()
+        if now >= self._next_clean:
+            self._next_clean = now + 1.0
+            super()._clean_expired()
+
+    # Poller
+
+    def _on_poller_loop(self):
+        return self._poller is None or self._poller.get_loop() is asyncio.get_running_loop()
+
+    def _ensure_poller(self):
+        loop = asyncio.get_running_loop()
+        if self._poller is None or self._poller.done() or self._poller.get_loop() is not loop:
+            self._poller = loop.create_task(self._poll_loop())
+
+    async def _poll_loop(self):
+        while True:
+            try:
+                deliveries = await self._run(self._poll)
+            except sqlite3.Error:
+                self._count('errors')
+                deliveries = []
+
+            for kind, channel, group, body in deliveries:
+                if kind == GROUP_ADD:
+                    await super().group_add(group, channel)
+                elif kind == GROUP_DISCARD:
+                    await super().group_discard(group, channel)
+                elif kind == GROUP:
+                    await self._fan_out(group, json.loads(body))
+                else:
+                    self._put(channel, json.loads(body))
+                self._count('remote_deliveries')
+            await asyncio.sleep(self.poll_interval)
+
+    def _put(self, channel, message):
+        queue = self.channels.setdefault(channel, asyncio.Queue(maxsize=self.get_capacity(channel)))
+        try:
+            queue.put_nowait((time.time() + self.expiry, message))
+        except asyncio.QueueFull:
+            # Like a full channel in group_send: this receiver misses the message
+            self._count('full_drops')
+            return False
+        return True
+
+    async def _fan_out(self, group, message):
+        for channel in list(self.groups.get(group, ())):
+            if self._is_local(channel):
+                self._put(channel, dict(message))
+            else:
+                # General channel names are delivered through the table
+                await self.send(channel, message)
+
+    # Channel layer API
+
+    async def send(self, channel, message):
+        assert isinstance(message, dict), "message is not a dict"
+        self.require_valid_channel_name(channel)
+        assert "__asgi_channel__" not in message
+
+        if self._is_local(channel) and self._on_poller_loop():
+            return await super().send(channel, message)
+        await self._publish(MESSAGE, channel=channel, message=message)
+
+    async def receive(self, channel):
+        self.require_valid_channel_name(channel)
+        if '!' not in channel:
+            self._receiving.add(channel)
+        self._ensure_poller()
+        return await super().receive(channel)
+
+    async def new_channel(self, prefix='specific.'):
+        return '%s%s!%s' % (prefix, self.process, ''.join(random.choice(string.ascii_letters) for _ in range(12)))
+
+    async def group_add(self, group, channel):
+        self.require_valid_group_name(group)
+        self.require_valid_channel_name(channel)
+        if '!' in channel and not self._is_local(channel):
+            return await self._publish(GROUP_ADD, channel=channel, group=group)
+        self._ensure_poller()
+        await super().group_add(group, channel)
+
+    async def group_discard(self, group, channel):
+        self.require_valid_group_name(group)
+        self.require_valid_channel_name(channel)
+        if '!' in channel and not self._is_local(channel):
+            return await self._publish(GROUP_DISCARD, channel=channel, group=group)
+        await super().group_discard(group, channel)
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), "Message is not a dict"
+        self.require_valid_group_name(group)
+        if not self._on_poller_loop():
+            # No origin: the local members are served by the poller as well
+            return await self._publish(GROUP, group=group, message=message, origin='')
+        self._clean_expired()
+
+        await self._fan_out(group, message)
+        await self._publish(GROUP, group=group, message=message)
+
+    async def flush(self):
+        await super().flush()
+        await self._run(lambda: self._connect().execute(f'DELETE FROM {TABLE}'))
+
+    async def close(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        if self._database is not None:
+            await self._run(self._database.close)
+            self._database = None
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        counters['local_channels'] = len(self.channels)
+        counters['local_groups'] = len(self.groups)
+        return counters
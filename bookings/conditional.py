@@ -0,0 +1,65 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import hashlib
+# Django Libraries
+from django.db import connections
+from django.utils.http import parse_etags
+# Django Rest Framework Libraries
+from rest_framework import status
+from rest_framework.response import Response
+
+
+###################
+# HELPERS SECTION #
+###################
+def etag_for(instance):
+    """
+    Strong ETag of a row: a hash of every column as the database stores it,
+    computed from the instance already loaded, so answering a conditional
+    request needs no serialization and no extra query. Values are prepared
+    for the database first, so an instance just saved from request data
+    (e.g. a datetime in another timezone) hashes like the row read back.
+    Only loaded columns count: a sparse fieldset has its own ETag.
+    """
+    connection = connections[instance._state.db or 'default']
+    deferred = instance.get_deferred_fields()
+    values = tuple(
+        (field.attname, field.get_db_prep_save(getattr(instance, field.attname), connection))
+        for field in instance._meta.concrete_fields if field.attname not in deferred
+    )
+    digest = hashlib.sha1(repr((instance._meta.label, values)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def _matches(header, etag, weak):
+    etags = parse_etags(header)
+    if weak:
+        # If-None-Match uses the weak comparison: W/"x" matches "x"
+        etags = [tag.removeprefix('W/') for tag in etags]
+    return '*' in etags or etag in etags
+
+
+def not_modified(request, etag):
+    """
+    :return: A 304 response if the GET's If-None-Match already names this version, else None.
+    """
+    header = request.headers.get('If-None-Match')
+    if header and _matches(header, etag, weak=True):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return None
+
+
+def precondition_failed(request, etag):
+    """
+    :return: A 412 response if a write's If-Match does not name this version, else None.
+    """
+    header = request.headers.get('If-Match')
+    if header and not _matches(header, etag, weak=False):
+        return Response(
+            {'error': 'the resource was modified, fetch it again'},
+            status=status.HTTP_412_PRECONDITION_FAILED,
+            headers={'ETag': etag}
+        )
+    return None
@@ -3,25 +3,44 @@
 ###################
 # Python Libraries
 import json
+from urllib.parse import parse_qs
 # Django Libraries
 from channels.generic.websocket import AsyncWebsocketConsumer
+# Project Libraries
+from bookings.broadcast import broadcaster
+from bookings.live import live_queries
 
 
 ####################
 # CONSUMER SECTION #
 ####################
 class BookingConsumer(AsyncWebsocketConsumer):
+    outbox = None
+    subscription = None
+
     async def connect(self):
 
-        # Add this connection to a group so we can broadcast to all subscribers.
-        await self.channel_layer.group_add("booking_updates", self.channel_name)
+        # Connecting with ?batch=1 gets the events coalesced into {"batch": [...]} frames
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        self.outbox = broadcaster.outbox(self.send_text, batch=query.get('batch') == ['1'])
+
+        # The other parameters are booking_list filters: the bookings entering, changing in
+        # or leaving those results are pushed as new_booking, updated_booking and deleted_booking
+        params = {name: values[-1] for name, values in query.items() if name != 'batch'}
+        try:
+            self.subscription = await live_queries.subscribe(params, self.outbox)
+        except ValueError as error:
+            await self.accept()
+            await self.send(text_data=json.dumps({"error": str(error)}))
+            await self.close(code=4000)
+            return
         await self.accept()
 
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard("booking_updates", self.channel_name)
-
-    async def booking_update(self, event):
+        if self.subscription is not None:
+            live_queries.unsubscribe(self.subscription)
+        if self.outbox is not None:
+            self.outbox.close()
 
-        # Called when new booking data is broadcasted.
-        data = event["data"]
-        await self.send(text_data=json.dumps(data))
+    async def send_text(self, text):
+        await self.send(text_data=text)
@@ -0,0 +1,196 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+# Django Libraries
+import django
+from django.conf import settings
+# Project Libraries
+from bookings import metrics
+from bookings.uploads import upload_store
+
+# Optional: without Pillow no derivative is generated and variants fall back to the original
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+# name: (bounding box, Pillow format, file extension, encoder options), largest first
+VARIANTS = {
+    'webp': ((2048, 2048), 'WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'medium': ((1024, 1024), 'JPEG', 'jpg', {'quality': 85, 'optimize': True, 'progressive': True}),
+    'thumbnail': ((256, 256), 'JPEG', 'jpg', {'quality': 80, 'optimize': True}),
+}
+# Content types Pillow decodes
+IMAGE_TYPES = ('image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/bmp', 'image/tiff')
+
+
+###################
+# HELPERS SECTION #
+###################
+def render(source, directory):
+    """
+    Writes every variant of the source image to directory, run in a pool process.
+
+    The image is decoded once, at the smallest scale the largest variant allows (JPEG decoders
+    skip the rest of the pixels), then each variant is shrunk from the previous, larger one.
+    :return: The number of bytes written.
+    """
+    largest = next(iter(VARIANTS.values()))[0]
+    written = 0
+    with Image.open(source) as image:
+        # Not before: a file Pillow cannot open leaves nothing behind
+        os.makedirs(directory, exist_ok=True)
+        image.draft('RGB', largest)
+        image = ImageOps.exif_transpose(image)
+        for name, (box, image_format, extension, options) in VARIANTS.items():
+            image.thumbnail(box, Image.LANCZOS, reducing_gap=3.0)
+            # JPEG has no alpha channel nor palette
+            if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+
+            # Written under a temporary name, a concurrent reader never sees a partial file
+            target = os.path.join(directory, f'{name}.{extension}')
+            temporary = os.path.join(directory, f'.{uuid.uuid4().hex}')
+            image.save(temporary, image_format, **options)
+            os.replace(temporary, target)
+            written += os.path.getsize(target)
+    return written
+
+
+####################
+# PIPELINE SECTION #
+####################
+class DerivativePipeline:
+    """
+    Smaller renditions of the uploaded images, for lists and pages that do not need the original.
+
+    Every variant of VARIANTS is generated in a process pool (decoding and resizing are CPU bound
+    and hold the GIL) when an image is uploaded, or by the backfill_derivatives command for the ones
+    stored before. They are cached at MEDIA_ROOT/derivatives/<2hex>/<sha256>/<variant>.<ext>, keyed
+    by the content hash: identical uploads share them and a new version of a file gets its own.
+
+    The pool uses spawned processes, forking the threaded server is unsafe, and each one sets up
+    Django once as the project package needs it on import.
+    """
+
+    def __init__(self, workers=2):
+        self.workers = workers
+
+        self._executor = None
+        self._pending = {}
+        # Contents Pillow could not render, not tried again until forced
+        self._failed = set()
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(('queued', 'rendered', 'failed', 'bytes', 'served', 'fallbacks'), 0)
+
+    @classmethod
+    def from_settings(cls):
+        return cls(workers=getattr(settings, 'IMAGE_DERIVATIVE_WORKERS', 2))
+
+    @property
+    def available(self):
+        return Image is not None
+
+    @property
+    def root(self):
+        return os.path.join(settings.MEDIA_ROOT, 'derivatives')
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def directory(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    def path(self, digest, variant):
+        """
+        :return: The path of a variant of the content, whether it was generated or not.
+        :raises ValueError: If there is no such variant.
+        """
+        if variant not in VARIANTS:
+            raise ValueError(f"variant must be one of: {', '.join(VARIANTS)}")
+        return os.path.join(self.directory(digest), f'{variant}.{VARIANTS[variant][2]}')
+
+    def generated(self, digest):
+        return all(os.path.exists(self.path(digest, variant)) for variant in VARIANTS)
+
+    def submit(self, filename, digest, content_type, force=False):
+        """
+        Queues the generation of an uploaded file's variants, unless it is not an image, they exist
+        or are being generated.
+        :return: The Future of the generation (resolving to the bytes written), or None.
+        """
+        if not self.available or content_type not in IMAGE_TYPES or (not force and self.generated(digest)):
+            return None
+
+        with self._lock:
+            future = self._pending.get(digest)
+            if future is not None or (not force and digest in self._failed):
+                return future
+            self._failed.discard(digest)
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context('spawn'), initializer=django.setup
+                )
+            # The blob a content-addressed name links to, which a new upload under the name leaves as is
+            source = os.path.realpath(os.path.join(upload_store.uploads_dir, filename))
+            future = self._executor.submit(render, source, self.directory(digest))
+            self._pending[digest] = future
+            self._counters['queued'] += 1
+        future.add_done_callback(lambda done: self._finished(digest, done))
+        return future
+
+    def _finished(self, digest, future):
+        error = None if future.cancelled() else future.exception()
+        with self._lock:
+            del self._pending[digest]
+            if future.cancelled() or isinstance(error, BrokenProcessPool):
+                # Not the image's fault, the next submit tries it again (in a new pool if a worker died)
+                if error is not None:
+                    self._executor = None
+                self._counters['failed'] += 1
+            elif error is not None:
+                # render() raised: Pillow cannot read it
+                self._failed.add(digest)
+                self._counters['failed'] += 1
+            else:
+                self._counters['rendered'] += 1
+                self._counters['bytes'] += future.result()
+
+    def variant_of(self, filename, digest, content_type, variant):
+        """
+        :return: The path to serve for a variant of an uploaded file: the derivative, or the original
+        while it is not generated (queued then), or None if the file is not an image.
+        :raises ValueError: If there is no such variant.
+        """
+        path = self.path(digest, variant)
+        if content_type not in IMAGE_TYPES:
+            return None
+        if os.path.exists(path):
+            self._count('served')
+            return path
+        self.submit(filename, digest, content_type)
+        self._count('fallbacks')
+        return os.path.join(upload_store.uploads_dir, filename)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            counters['pending'] = len(self._pending)
+        counters['available'] = self.available
+        return counters
+
+
+image_derivatives = DerivativePipeline.from_settings()
+metrics.register('image_derivatives', image_derivatives.stats)
@@ -0,0 +1,302 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import mimetypes
+import os
+import threading
+import uuid
+from urllib.parse import quote
+# Django Libraries
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import content_disposition_header, http_date, parse_etags, parse_http_date_safe
+# Project Libraries
+from bookings import metrics
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+SERVE_MODES = ('app', 'x-accel-redirect', 'x-sendfile')
+# Bytes read at a time when the file goes through Python
+BLOCK_SIZE = 256 * 1024
+# Past this many ranges in one request, the whole file is sent instead
+MAX_RANGES = 16
+
+
+###################
+# HELPERS SECTION #
+###################
+def parse_ranges(header, size):
+    """
+    :return: The (start, end) byte ranges of a Range header, inclusive, sorted and with the overlapping
+    or adjacent ones merged. None when the header is to be ignored (absent, malformed, another unit or
+    more than MAX_RANGES), [] when no range overlaps the file.
+    """
+    if not header:
+        return None
+    unit, _, specs = header.partition('=')
+    if unit.strip().lower() != 'bytes':
+        return None
+
+    ranges = []
+    for spec in specs.split(','):
+        first, dash, last = spec.strip().partition('-')
+        if not dash or not (first or last) or (first and not first.isdigit()) or (last and not last.isdigit()):
+            return None
+        if not first:
+            # Suffix range: the last bytes of the file
+            if int(last) and size:
+                ranges.append((max(size - int(last), 0), size - 1))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start < size:
+            ranges.append((start, min(int(last), size - 1) if last else size - 1))
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class FileRange:
+    """
+    length bytes of an open file from start. The file descriptor stays exposed, positioned at start,
+    so a WSGI server's file_wrapper (gunicorn's) sends the range with os.sendfile, bounded by the
+    Content-Length; otherwise it is read block by block.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+
+    def read(self, size=-1):
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def _read_segments(path, segments):
+    """
+    Yields the body made of segments, bytes or (start, length) slices of the file.
+    """
+    with open(path, 'rb') as file:
+        for segment in segments:
+            if isinstance(segment, bytes):
+                yield segment
+                continue
+            part = FileRange(file, *segment)
+            for block in iter(lambda: part.read(BLOCK_SIZE), b''):
+                yield block
+
+
+async def _aread_segments(path, segments):
+    # Blocks are read in a worker thread, Django would otherwise buffer a synchronous iterator whole
+    file = await sync_to_async(open, thread_sensitive=False)(path, 'rb')
+    read = sync_to_async(file.read, thread_sensitive=False)
+    try:
+        for segment in segments:
+            if isinstance(segment, bytes):
+                yield segment
+                continue
+            start, remaining = segment
+            await sync_to_async(file.seek, thread_sensitive=False)(start)
+            while remaining:
+                block = await read(min(BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                remaining -= len(block)
+                yield block
+    finally:
+        file.close()
+
+
+######################
+# DOWNLOADER SECTION #
+######################
+class Downloader:
+    """
+    Serves stored files with the HTTP caching and range semantics.
+
+    Responses carry Accept-Ranges, an ETag (the sha256 of a content-addressed file, see bookings.uploads,
+    else its mtime and size) and Last-Modified. If-None-Match and If-Modified-Since get a 304, a Range
+    gets a 206 (multipart/byteranges for several ranges, merged when they overlap), honoring If-Range,
+    and a Range outside the file a 416.
+
+    Serve modes:
+    - app:              the application sends the file. Under WSGI a single range is handed to the
+                        server's file_wrapper, which gunicorn sends with os.sendfile; under ASGI it is
+                        streamed from a worker thread (no zero-copy path exists there).
+    - x-accel-redirect: nginx sends it, from an internal location aliasing MEDIA_ROOT at accel_prefix.
+    - x-sendfile:       Apache (mod_xsendfile) or lighttpd send it, from its absolute path.
+    The conditional requests are answered by the application in every mode.
+    """
+
+    def __init__(self, mode='app', accel_prefix='/protected-media/'):
+        if mode not in SERVE_MODES:
+            raise ValueError(f"Unknown serve mode {mode!r}, expected one of {SERVE_MODES}")
+
+        self.mode = mode
+        self.accel_prefix = accel_prefix.rstrip('/') + '/'
+
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ('full', 'partial', 'multipart', 'not_modified', 'unsatisfiable', 'offloaded', 'file_wrapper', 'bytes'), 0
+        )
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            mode=getattr(settings, 'DOWNLOAD_SERVE_MODE', 'app'),
+            accel_prefix=getattr(settings, 'DOWNLOAD_ACCEL_PREFIX', '/protected-media/'),
+        )
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def serve(self, request, path, filename, digest=None, as_attachment=True):
+        """
+        :param digest: The sha256 of the content, when known.
+        :raises FileNotFoundError: If there is no such file.
+        """
+        stat = os.stat(path)
+        size = stat.st_size
+        etag = f'"{digest}"' if digest else f'"{stat.st_mtime_ns:x}-{size:x}"'
+        validators = {'ETag': etag, 'Last-Modified': http_date(stat.st_mtime), 'Accept-Ranges': 'bytes'}
+
+        if self._not_modified(request, etag, int(stat.st_mtime)):
+            self._count('not_modified')
+            return self._with_headers(HttpResponseNotModified(), validators)
+
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        disposition = content_disposition_header(as_attachment, filename)
+        if self.mode != 'app':
+            return self._with_headers(self._offload(path, content_type, disposition), validators)
+
+        ranges = None
+        if self._range_applies(request, etag, validators['Last-Modified']):
+            ranges = parse_ranges(request.headers.get('Range'), size)
+        if ranges == []:
+            self._count('unsatisfiable')
+            return self._with_headers(HttpResponse(status=416), {'Content-Range': f'bytes */{size}', **validators})
+
+        asgi = hasattr(request, 'scope')
+        if ranges is None or len(ranges) == 1:
+            start, end = ranges[0] if ranges else (0, size - 1)
+            response = self._single(request, path, start, end - start + 1, content_type, disposition, asgi)
+            if ranges:
+                response.status_code = 206
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            self._count('partial' if ranges else 'full')
+            self._count('bytes', end - start + 1)
+        else:
+            response = self._multipart(path, ranges, size, content_type, disposition, asgi)
+            self._count('multipart')
+            self._count('bytes', sum(end - start + 1 for start, end in ranges))
+        return self._with_headers(response, validators)
+
+    # Conditional requests
+
+    @staticmethod
+    def _not_modified(request, etag, modified):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            tags = [tag.removeprefix('W/') for tag in parse_etags(if_none_match)]
+            return '*' in tags or etag in tags
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since') or '')
+        return if_modified_since is not None and modified <= if_modified_since
+
+    @staticmethod
+    def _range_applies(request, etag, last_modified):
+        # If-Range: the ranges only apply to the version the client has, strongly compared
+        if_range = request.headers.get('If-Range')
+        if not if_range:
+            return True
+        if if_range.startswith('"'):
+            return if_range == etag
+        return if_range == last_modified
+
+    # Responses
+
+    def _single(self, request, path, start, length, content_type, disposition, asgi):
+        if asgi:
+            response = StreamingHttpResponse(_aread_segments(path, [(start, length)]), content_type=content_type)
+            response['Content-Disposition'] = disposition
+        else:
+            response = FileResponse(FileRange(open(path, 'rb'), start, length), content_type=content_type)
+            response.block_size = BLOCK_SIZE
+            response['Content-Disposition'] = disposition
+            if 'wsgi.file_wrapper' in request.META:
+                self._count('file_wrapper')
+        response['Content-Length'] = length
+        return response
+
+    def _multipart(self, path, ranges, size, content_type, disposition, asgi):
+        boundary = uuid.uuid4().hex
+        segments = []
+        for start, end in ranges:
+            segments.append(
+                f'--{boundary}\r\nContent-Type: {content_type}\r\nContent-Range: bytes {start}-{end}/{size}\r\n\r\n'.encode()
+            )
+            segments.append((start, end - start + 1))
+            segments.append(b'\r\n')
+        segments.append(f'--{boundary}--\r\n'.encode())
+
+        read = _aread_segments if asgi else _read_segments
+        response = StreamingHttpResponse(
+            read(path, segments), status=206, content_type=f'multipart/byteranges; boundary={boundary}'
+        )
+        response['Content-Length'] = sum(
+            len(segment) if isinstance(segment, bytes) else segment[1] for segment in segments
+        )
+        response['Content-Disposition'] = disposition
+        return response
+
+    def _offload(self, path, content_type, disposition):
+        response = HttpResponse(content_type=content_type)
+        response['Content-Disposition'] = disposition
+        if self.mode == 'x-sendfile':
+            response['X-Sendfile'] = os.path.realpath(path)
+        else:
+            # The blob itself for a content-addressed file, relative to MEDIA_ROOT
+            relative = os.path.relpath(os.path.realpath(path), os.path.realpath(settings.MEDIA_ROOT))
+            if relative.startswith('..'):
+                raise FileNotFoundError(path)
+            response['X-Accel-Redirect'] = self.accel_prefix + quote(relative.replace(os.sep, '/'))
+        self._count('offloaded')
+        return response
+
+    @staticmethod
+    def _with_headers(response, headers):
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        counters['mode'] = self.mode
+        return counters
+
+
+downloader = Downloader.from_settings()
+metrics.register('downloads', downloader.stats)
@@ -0,0 +1,86 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import csv
+import io
+from itertools import islice
+# Django Libraries
+from django.http import StreamingHttpResponse
+# Django Rest Framework Libraries
+from rest_framework.utils.encoders import JSONEncoder
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+# Rows fetched per round trip by the server-side iterator, and written per chunk of the response
+CHUNK_SIZE = 2000
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+###################
+# HELPERS SECTION #
+###################
+def _rows(queryset, projection):
+    # .values() + iterator: no model instances and no result cache, memory stays flat
+    rows = projection.queryset(queryset).iterator(chunk_size=CHUNK_SIZE)
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield from projection.render(chunk)
+
+
+def _ndjson(queryset, projection):
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    lines = []
+    for row in _rows(queryset, projection):
+        lines.append(encoder.encode(row))
+        if len(lines) >= CHUNK_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def _csv(queryset, projection):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(projection.names)
+    count = 0
+    for row in _rows(queryset, projection):
+        writer.writerow(row.values())
+        count += 1
+        if count % CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+##################
+# EXPORT SECTION #
+##################
+def export_response(queryset, projection, output, filename, ordering):
+    """
+    Streams every row of a queryset as NDJSON (one object per line, as the
+    list endpoints render them through the projection) or CSV (header row first).
+
+    Rows are read through a chunked server-side iterator and written in
+    chunks, so memory stays flat regardless of the export size.
+    :param ordering: Applied unless the queryset is already explicitly ordered (e.g. by search rank).
+    :raises ValueError: If the output format is not supported.
+    """
+    if output not in CONTENT_TYPES:
+        raise ValueError(f"output must be one of: {', '.join(CONTENT_TYPES)}")
+    if not queryset.query.order_by:
+        queryset = queryset.order_by(*ordering)
+
+    chunks = _ndjson(queryset, projection) if output == 'ndjson' else _csv(queryset, projection)
+    response = StreamingHttpResponse(chunks, content_type=CONTENT_TYPES[output])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{output}"'
+    return response
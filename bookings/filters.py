@@ -0,0 +1,165 @@
+###################
+# IMPORTS SECTION #
+###################
+# Django Libraries
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+# Project Libraries
+from bookings import search
+
+
+###################
+# HELPERS SECTION #
+###################
+def _datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(value)
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def _parse(params, name, convert, message):
+    value = params.get(name)
+    if value is None:
+        return None
+    try:
+        return convert(value)
+    except ValueError:
+        raise ValueError(message)
+
+
+###################
+# FILTERS SECTION #
+###################
+def filter_bookings(queryset, params):
+    """
+    Applies the booking list query parameters (id, name, email, phone, q,
+    start_date, end_date, state, created_at, completed_at, room) to a queryset.
+    Name, email and phone filters and the ranked "q" full-text search go
+    through the booking search index when available (see bookings.search).
+    """
+    id_query = params.get("id", "")
+    if id_query:
+        queryset = queryset.filter(id=id_query)
+
+    name_query = params.get("name", "")
+    if name_query:
+        queryset = search.filter_contains(queryset, "customerName", name_query)
+
+    email_query = params.get("email", "")
+    if email_query:
+        queryset = search.filter_contains(queryset, "customerEmail", email_query)
+
+    phone_query = params.get("phone", "")
+    if phone_query:
+        queryset = search.filter_contains(queryset, "customerPhone", phone_query)
+
+    # Full-text search, best matches first unless another ordering is requested
+    text_query = params.get("q", "")
+    if text_query:
+        queryset = search.search(queryset, text_query)
+
+    start_date_query = params.get("start_date", "")
+    if start_date_query:
+        queryset = queryset.filter(startDate__gte=start_date_query)
+
+    end_date_query = params.get("end_date", "")
+    if end_date_query:
+        queryset = queryset.filter(endDate__lte=end_date_query)
+
+    state_query = params.get("state", "")
+    if state_query:
+        queryset = queryset.filter(state=state_query)
+
+    created_at_query = params.get("created_at", "")
+    if created_at_query:
+        queryset = queryset.filter(createdAt=created_at_query)
+
+    completed_at_query = params.get("completed_at", "")
+    if completed_at_query:
+        queryset = queryset.filter(completedAt=completed_at_query)
+
+    room_query = params.get("room", "")
+    if room_query:
+        queryset = queryset.filter(room_id=room_query)
+
+    return queryset
+
+
+def filter_hotels(queryset, params):
+    """
+    Applies the hotel list query parameters (name, min_rating) to a queryset.
+    """
+    name = params.get('name')
+    if name:
+        queryset = queryset.filter(name__icontains=name)
+
+    min_rating = params.get('min_rating')
+    if min_rating:
+        queryset = queryset.filter(rating__gte=min_rating)
+
+    return queryset
+
+
+def filter_rooms(queryset, params):
+    """
+    Applies the room list query parameters (number, hotel, min_capacity,
+    max_price) to a queryset.
+    :raises ValueError: If a numeric parameter cannot be parsed.
+    """
+    number = _parse(params, 'number', int, 'number must be an integer')
+    if number is not None:
+        queryset = queryset.filter(number=number)
+
+    hotel_id = params.get('hotel')
+    if hotel_id:
+        queryset = queryset.filter(hotel__id=hotel_id)
+
+    min_cap = _parse(params, 'min_capacity', int, 'min_capacity must be an integer')
+    if min_cap is not None:
+        queryset = queryset.filter(capacity__gte=min_cap)
+
+    max_price = _parse(params, 'max_price', float, 'max_price must be a number')
+    if max_price is not None:
+        queryset = queryset.filter(price_per_night__lte=max_price)
+
+    return queryset
+
+
+def filter_files(queryset, params):
+    """
+    Applies the file list query parameters (name, type, sha256, min_size,
+    max_size, modified_after, modified_before) to a catalog queryset.
+    "type" is a MIME type, or a prefix of one when it ends with a slash ("image/").
+    :raises ValueError: If a size or date parameter cannot be parsed.
+    """
+    name = params.get('name')
+    if name:
+        queryset = queryset.filter(name__icontains=name)
+
+    content_type = params.get('type')
+    if content_type:
+        lookup = 'content_type__startswith' if content_type.endswith('/') else 'content_type'
+        queryset = queryset.filter(**{lookup: content_type})
+
+    digest = params.get('sha256')
+    if digest:
+        queryset = queryset.filter(sha256=digest.lower())
+
+    min_size = _parse(params, 'min_size', int, 'min_size must be an integer')
+    if min_size is not None:
+        queryset = queryset.filter(size__gte=min_size)
+
+    max_size = _parse(params, 'max_size', int, 'max_size must be an integer')
+    if max_size is not None:
+        queryset = queryset.filter(size__lte=max_size)
+
+    modified_after = _parse(params, 'modified_after', _datetime, 'modified_after must be a date and time')
+    if modified_after is not None:
+        queryset = queryset.filter(modified__gte=modified_after)
+
+    modified_before = _parse(params, 'modified_before', _datetime, 'modified_before must be a date and time')
+    if modified_before is not None:
+        queryset = queryset.filter(modified__lt=modified_before)
+
+    return queryset
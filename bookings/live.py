@@ -0,0 +1,386 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import asyncio
+import bisect
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime
+# Django Libraries
+from asgiref.sync import async_to_sync
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+# Third Party Libraries
+from channels.layers import get_channel_layer
+# Project Libraries
+from bookings import metrics
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+CHANGES_GROUP = 'booking_changes'
+# Booking columns the subscription filters read, carried by every change
+FIELDS = ('id', 'customerName', 'customerEmail', 'customerPhone', 'startDate', 'endDate', 'state',
+          'createdAt', 'completedAt', 'room_id')
+DATE_FIELDS = ('startDate', 'endDate')
+DATETIME_FIELDS = ('createdAt', 'completedAt')
+# Equality filters (parameter, column), the first one a subscription has indexes it
+EQUALITY_FILTERS = (('id', 'id'), ('room', 'room_id'), ('state', 'state'),
+                    ('created_at', 'createdAt'), ('completed_at', 'completedAt'))
+CONTAINS_FILTERS = (('name', 'customerName'), ('email', 'customerEmail'), ('phone', 'customerPhone'))
+# Frame key of each change a subscriber can see
+CREATED, UPDATED, DELETED = 'new_booking', 'updated_booking', 'deleted_booking'
+
+
+###################
+# HELPERS SECTION #
+###################
+def _datetime(value, message):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(message)
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def _date(value, message):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(message)
+
+
+def _uuid(value, message):
+    try:
+        return str(uuid.UUID(value))
+    except ValueError:
+        raise ValueError(message)
+
+
+def row_of(booking):
+    """
+    :return: The filtered columns of a booking, as carried between processes.
+    """
+    row = {field: getattr(booking, field) for field in FIELDS}
+    # Saved instances may still hold the strings they were given
+    for field in DATE_FIELDS + DATETIME_FIELDS:
+        row[field] = booking._meta.get_field(field).to_python(row[field])
+    return _encode_row(row)
+
+
+def _encode_row(row):
+    row = dict(row)
+    for field in ('id', 'room_id'):
+        row[field] = None if row[field] is None else str(row[field])
+    for field in DATE_FIELDS + DATETIME_FIELDS:
+        row[field] = None if row[field] is None else row[field].isoformat()
+    return row
+
+
+def _decode_row(row):
+    if row is None:
+        return None
+    row = dict(row)
+    for field in DATE_FIELDS:
+        row[field] = None if row[field] is None else date.fromisoformat(row[field])
+    for field in DATETIME_FIELDS:
+        row[field] = None if row[field] is None else datetime.fromisoformat(row[field])
+    return row
+
+
+########################
+# SUBSCRIPTION SECTION #
+########################
+class Subscription:
+    """
+    The booking_list filters of one connection (see bookings.filters.filter_bookings),
+    evaluated on a single row: "name", "email" and "phone" are case-insensitive substrings,
+    "q" needs every term in one of them; the other parameters are compared like the queryset does.
+    """
+
+    def __init__(self, params, outbox):
+        self.outbox = outbox
+        self.equals = {}
+        for name, field in EQUALITY_FILTERS:
+            value = params.get(name, '')
+            if not value:
+                continue
+            if name in ('id', 'room'):
+                value = _uuid(value, f'{name} must be a UUID')
+            elif field in DATETIME_FIELDS:
+                value = _datetime(value, f'{name} must be a date and time')
+            self.equals[field] = value
+
+        self.contains = {field: params[name].lower() for name, field in CONTAINS_FILTERS if params.get(name)}
+        self.terms = params.get('q', '').lower().split()
+        self.start_date = _date(params['start_date'], 'start_date must be a date') if params.get('start_date') else None
+        self.end_date = _date(params['end_date'], 'end_date must be a date') if params.get('end_date') else None
+
+    def matches(self, row):
+        if any(row[field] != value for field, value in self.equals.items()):
+            return False
+        if self.start_date is not None and row['startDate'] < self.start_date:
+            return False
+        if self.end_date is not None and row['endDate'] > self.end_date:
+            return False
+        if any(value not in row[field].lower() for field, value in self.contains.items()):
+            return False
+        if self.terms:
+            contact = [row[field].lower() for _, field in CONTAINS_FILTERS]
+            return all(any(term in value for value in contact) for term in self.terms)
+        return True
+
+
+class SubscriptionIndex:
+    """
+    Subscriptions of this process, indexed so a change only checks the ones it may match:
+    - by the value of their first equality filter (id, room, state, created_at, completed_at);
+    - otherwise in sorted start_date thresholds, of which only those up to the row's startDate
+      are candidates; likewise from the row's endDate for end_date;
+    - the unfiltered ones (or only filtered on text) are always candidates.
+    """
+
+    def __init__(self):
+        self._equal = {field: defaultdict(set) for _, field in EQUALITY_FILTERS}
+        self._starts, self._start_subscriptions = [], []
+        self._ends, self._end_subscriptions = [], []
+        self._other = set()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, subscription):
+        self._size += 1
+        for _, field in EQUALITY_FILTERS:
+            if field in subscription.equals:
+                self._equal[field][subscription.equals[field]].add(subscription)
+                return
+        if subscription.start_date is not None:
+            position = bisect.bisect_right(self._starts, subscription.start_date)
+            self._starts.insert(position, subscription.start_date)
+            self._start_subscriptions.insert(position, subscription)
+        elif subscription.end_date is not None:
+            position = bisect.bisect_right(self._ends, subscription.end_date)
+            self._ends.insert(position, subscription.end_date)
+            self._end_subscriptions.insert(position, subscription)
+        else:
+            self._other.add(subscription)
+
+    def remove(self, subscription):
+        self._size -= 1
+        for _, field in EQUALITY_FILTERS:
+            if field in subscription.equals:
+                bucket = self._equal[field][subscription.equals[field]]
+                bucket.discard(subscription)
+                if not bucket:
+                    del self._equal[field][subscription.equals[field]]
+                return
+        if subscription.start_date is not None:
+            self._remove_sorted(self._starts, self._start_subscriptions, subscription.start_date, subscription)
+        elif subscription.end_date is not None:
+            self._remove_sorted(self._ends, self._end_subscriptions, subscription.end_date, subscription)
+        else:
+            self._other.discard(subscription)
+
+    @staticmethod
+    def _remove_sorted(keys, subscriptions, key, subscription):
+        position = bisect.bisect_left(keys, key)
+        while subscriptions[position] is not subscription:
+            position += 1
+        del keys[position], subscriptions[position]
+
+    def candidates(self, row):
+        """
+        :return: The subscriptions that may match the row, a superset of the matching ones.
+        """
+        found = set(self._other)
+        for field, buckets in self._equal.items():
+            if buckets and row[field] in buckets:
+                found.update(buckets[row[field]])
+        found.update(self._start_subscriptions[:bisect.bisect_right(self._starts, row['startDate'])])
+        found.update(self._end_subscriptions[bisect.bisect_left(self._ends, row['endDate']):])
+        return found
+
+
+########################
+# LIVE QUERIES SECTION #
+########################
+class LiveQueries:
+    """
+    Pushes booking inserts, updates and deletes to the websocket connections whose filters match.
+
+    Writes are captured by the model signals (and by BookingQuerySet for bulk writes, including
+    the room a Room delete sets to NULL on its bookings), then
+    sent once committed to the booking_changes group, of which each serving process has one
+    member. That member matches the change against the process's SubscriptionIndex, encodes
+    each kind of frame once and queues it on the matching connections' outboxes:
+    {"new_booking": ...} when a booking enters a subscription's results, {"updated_booking": ...}
+    when it stays in them, {"deleted_booking": {"id": ...}} when it leaves them.
+    """
+
+    def __init__(self, group=CHANGES_GROUP):
+        self.group = group
+        self.index = SubscriptionIndex()
+        self.enabled = False
+
+        self._channel_task = None
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(('published', 'received', 'candidates', 'deliveries'), 0)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    # Publishing side
+
+    def install(self):
+        """
+        Captures Booking writes in this process. Called by BookingsConfig.ready for the serving processes.
+        """
+        from bookings.models import Booking
+
+        pre_save.connect(_remember_stored_row, sender=Booking, dispatch_uid='bookings.live.pre_save')
+        post_save.connect(_saved, sender=Booking, dispatch_uid='bookings.live.post_save')
+        pre_delete.connect(_remember_deleted_row, sender=Booking, dispatch_uid='bookings.live.pre_delete')
+        post_delete.connect(_deleted, sender=Booking, dispatch_uid='bookings.live.post_delete')
+        self.enabled = True
+
+    def uninstall(self):
+        from bookings.models import Booking
+
+        pre_save.disconnect(sender=Booking, dispatch_uid='bookings.live.pre_save')
+        post_save.disconnect(sender=Booking, dispatch_uid='bookings.live.post_save')
+        pre_delete.disconnect(sender=Booking, dispatch_uid='bookings.live.pre_delete')
+        post_delete.disconnect(sender=Booking, dispatch_uid='bookings.live.post_delete')
+        self.enabled = False
+
+    def changed(self, before, after, data):
+        """
+        Sends a change once the current transaction commits.
+        :param before: row_of() the stored booking, None for an insert.
+        :param after: row_of() the written booking, None for a delete.
+        :param data: The booking as rendered by the list, only its id for a delete.
+        """
+        message = {'type': 'booking_change', 'before': before, 'after': after, 'data': data, 'sent': time.time()}
+
+        def send():
+            async_to_sync(get_channel_layer().group_send)(self.group, message)
+            self._count('published')
+
+        transaction.on_commit(send)
+
+    # Receiving side
+
+    async def subscribe(self, params, outbox):
+        """
+        :return: The Subscription of a connection, for unsubscribe().
+        :raises ValueError: If a filter parameter cannot be parsed.
+        """
+        subscription = Subscription(params, outbox)
+        self.index.add(subscription)
+        await self._listen()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.index.remove(subscription)
+
+    async def _listen(self):
+        loop = asyncio.get_running_loop()
+        task = self._channel_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+
+        layer = get_channel_layer()
+        channel = await layer.new_channel()
+        await layer.group_add(self.group, channel)
+
+        async def receive():
+            while True:
+                self.dispatch(await layer.receive(channel))
+
+        self._channel_task = loop.create_task(receive())
+
+    def dispatch(self, message):
+        """
+        Queues the frames of a change on the outboxes of the matching subscriptions.
+        """
+        from bookings.broadcast import broadcaster
+
+        self._count('received')
+        before, after = _decode_row(message['before']), _decode_row(message['after'])
+        matched = {}
+        for name, row in (('before', before), ('after', after)):
+            candidates = self.index.candidates(row) if row is not None else set()
+            self._count('candidates', len(candidates))
+            matched[name] = {subscription for subscription in candidates if subscription.matches(row)}
+
+        booking_id = (after or before)['id']
+        for kind, subscriptions in (
+            (CREATED, matched['after'] - matched['before']),
+            (UPDATED, matched['after'] & matched['before']),
+            (DELETED, matched['before'] - matched['after']),
+        ):
+            if not subscriptions:
+                continue
+            data = {'id': booking_id} if kind == DELETED else message['data']
+            # Encoded once for every subscription; pending updates of a booking are merged
+            frame = broadcaster.message({kind: data}, key=f'{kind}:{booking_id}')
+            frame['sent'] = message['sent']
+            for subscription in subscriptions:
+                subscription.outbox.put(frame)
+            self._count('deliveries', len(subscriptions))
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        counters['subscriptions'] = len(self.index)
+        counters['enabled'] = self.enabled
+        return counters
+
+
+live_queries = LiveQueries()
+metrics.register('live_queries', live_queries.stats)
+
+
+###################
+# SIGNALS SECTION #
+###################
+def render(booking):
+    from bookings.views.bookings import BOOKING_PROJECTION
+    return BOOKING_PROJECTION.render_instance(booking)
+
+
+def stored_rows(pks):
+    """
+    :return: {pk: row_of()} of the stored bookings, in one query.
+    """
+    from bookings.models import Booking
+    return {row['id']: _encode_row(row) for row in Booking.objects.filter(pk__in=list(pks)).values(*FIELDS)}
+
+
+def _remember_stored_row(sender, instance, raw=False, **kwargs):
+    if not raw and not instance._state.adding:
+        instance._live_before = stored_rows([instance.pk]).get(instance.pk)
+
+
+def _saved(sender, instance, created=False, raw=False, **kwargs):
+    if not raw:
+        before = None if created else instance.__dict__.pop('_live_before', None)
+        live_queries.changed(before, row_of(instance), render(instance))
+
+
+def _remember_deleted_row(sender, instance, origin=None, **kwargs):
+    # A queryset delete loaded its instances, a deleted instance may be older than the stored row
+    if origin is instance:
+        instance._live_before = stored_rows([instance.pk]).get(instance.pk)
+
+
+def _deleted(sender, instance, **kwargs):
+    before = instance.__dict__.pop('_live_before', None) or row_of(instance)
+    live_queries.changed(before, None, {'id': str(instance.pk)})
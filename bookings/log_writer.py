@@ -0,0 +1,226 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import atexit
+import logging
+import os
+import queue
+import random
+import threading
+import time
+# Django Libraries
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+# Project Libraries
+from bookings import metrics
+
+logger = logging.getLogger(__name__)
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+OVERFLOW_POLICIES = ('drop', 'sample', 'block')
+
+
+##################
+# WRITER SECTION #
+##################
+class OperationLogWriter:
+    """
+    Buffers OperationLog rows in a bounded in-process queue and writes them
+    with bulk_create from a background thread, by batch size or by time.
+
+    Until start() is called in the current process (BookingsConfig.ready does
+    it for the serving processes) records are written synchronously, so
+    management commands and tests keep seeing their logs immediately.
+
+    Overflow policies, applied when the queue cannot take a record:
+    - drop:   the record is discarded.
+    - sample: once the queue is half full only OPERATION_LOG_SAMPLE_RATE of
+              the records are admitted; the rest are discarded.
+    - block:  the request waits up to OPERATION_LOG_BLOCK_TIMEOUT seconds
+              for space, then discards the record.
+    """
+
+    def __init__(self, max_queue_size=10_000, batch_size=500, flush_interval=1.0,
+                 overflow_policy='drop', sample_rate=0.1, block_timeout=0.5):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow_policy!r}, expected one of {OVERFLOW_POLICIES}")
+
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.sample_rate = sample_rate
+        self.block_timeout = block_timeout
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._exit_hook_registered = False
+        self._flush_lock = threading.Lock()
+        self._counters_lock = threading.Lock()
+        # failed counts the batches that could not be written, lost their records
+        self._counters = dict.fromkeys(
+            ('enqueued', 'written', 'dropped', 'sampled_out', 'failed', 'lost', 'batches'), 0
+        )
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            max_queue_size=getattr(settings, 'OPERATION_LOG_QUEUE_SIZE', 10_000),
+            batch_size=getattr(settings, 'OPERATION_LOG_BATCH_SIZE', 500),
+            flush_interval=getattr(settings, 'OPERATION_LOG_FLUSH_INTERVAL', 1.0),
+            overflow_policy=getattr(settings, 'OPERATION_LOG_OVERFLOW_POLICY', 'drop'),
+            sample_rate=getattr(settings, 'OPERATION_LOG_SAMPLE_RATE', 0.1),
+            block_timeout=getattr(settings, 'OPERATION_LOG_BLOCK_TIMEOUT', 0.5),
+        )
+
+    @property
+    def running(self):
+        return self._thread is not None and self._pid == os.getpid()
+
+    def start(self):
+        """
+        Starts the flusher thread for the current process and flushes on interpreter exit.
+        """
+        if self.running:
+            return
+        self._stop.clear()
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='operation-log-writer', daemon=True)
+        self._thread.start()
+        if not self._exit_hook_registered:
+            atexit.register(self.close)
+            self._exit_hook_registered = True
+
+    def close(self):
+        """
+        Stops the flusher thread and writes whatever is still buffered.
+        """
+        if self.running:
+            self._stop.set()
+            self._thread.join(timeout=self.flush_interval * 2 + 5)
+            self._thread = None
+        while self.flush():
+            pass
+
+    def submit(self, user_id, model, object_id, action):
+        """
+        Records one operation. Returns False when the record was discarded by the overflow policy.
+        """
+        record = (user_id, model, object_id, action, timezone.now())
+        if not self.running:
+            self._write([record])
+            return True
+        return self._enqueue(record)
+
+    def submit_many(self, user_id, model, object_ids, action):
+        """
+        Records the same operation on several objects, e.g. from a bulk endpoint.
+        Written with a single bulk_create when the writer is not running.
+        :return: The number of records accepted.
+        """
+        now = timezone.now()
+        records = [(user_id, model, object_id, action, now) for object_id in object_ids]
+        if not self.running:
+            for start in range(0, len(records), self.batch_size):
+                self._write(records[start:start + self.batch_size])
+            return len(records)
+        return sum(self._enqueue(record) for record in records)
+
+    def flush(self):
+        """
+        Writes up to one batch of buffered records right away.
+        :return: The number of records taken off the queue.
+        """
+        batch = self._drain(timeout=0)
+        if batch:
+            self._write(batch)
+        return len(batch)
+
+    def stats(self):
+        with self._counters_lock:
+            counters = dict(self._counters)
+        counters.update({
+            'queue_depth': self._queue.qsize(),
+            'max_queue_size': self.max_queue_size,
+            'overflow_policy': self.overflow_policy,
+            'running': self.running,
+        })
+        return counters
+
+    def _count(self, name, amount=1):
+        with self._counters_lock:
+            self._counters[name] += amount
+
+    def _enqueue(self, record):
+        if self.overflow_policy == 'sample' and self._queue.qsize() >= self.max_queue_size // 2:
+            if random.random() >= self.sample_rate:
+                self._count('sampled_out')
+                return False
+
+        try:
+            if self.overflow_policy == 'block':
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self._count('dropped')
+            return False
+
+        self._count('enqueued')
+        return True
+
+    def _drain(self, timeout):
+        """
+        Collects up to batch_size records, waiting at most `timeout` seconds for them.
+        """
+        batch = []
+        deadline = time.monotonic() + timeout
+        while len(batch) < self.batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        from bookings.models import OperationLog
+
+        rows = [
+            OperationLog(user_id=user_id, model=model, object_id=object_id, action=action, timestamp=timestamp)
+            for user_id, model, object_id, action, timestamp in batch
+        ]
+        with self._flush_lock:
+            try:
+                OperationLog.objects.bulk_create(rows)
+            except Exception:
+                self._count('failed')
+                self._count('lost', len(rows))
+                logger.exception("Operation log flush failed, %d records lost", len(rows))
+                return
+        self._count('written', len(rows))
+        self._count('batches')
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._drain(timeout=self.flush_interval)
+            if batch:
+                self._write(batch)
+                close_old_connections()
+
+
+#####################
+# SINGLETON SECTION #
+#####################
+operation_log_writer = OperationLogWriter.from_settings()
+metrics.register('operation_log_writer', operation_log_writer.stats)
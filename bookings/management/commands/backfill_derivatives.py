@@ -0,0 +1,68 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import time
+from concurrent.futures import as_completed
+# Django Libraries
+from django.core.management.base import BaseCommand
+from django.db.models import Min
+# Project Libraries
+from bookings.catalog import file_catalog
+from bookings.derivatives import IMAGE_TYPES, DerivativePipeline, image_derivatives
+from bookings.models import StoredFile
+
+
+###################
+# COMMAND SECTION #
+###################
+class Command(BaseCommand):
+    help = "Generates the image variants of the uploads stored without them, and reports the throughput."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=image_derivatives.workers, help="Processes generating the variants.",
+        )
+        parser.add_argument('--force', action='store_true', help="Generate the existing variants again.")
+        parser.add_argument(
+            '--skip-scan', action='store_true', help="Trust the file catalog instead of scanning the uploads first.",
+        )
+
+    def handle(self, *args, **options):
+        pipeline = DerivativePipeline(workers=options['workers'])
+        if not pipeline.available:
+            self.stderr.write(self.style.ERROR("Pillow is not installed, no variant can be generated."))
+            return
+        if not options['skip_scan']:
+            file_catalog.scan()
+
+        # One file per content, the variants being shared by its copies
+        images = (
+            StoredFile.objects.filter(content_type__in=IMAGE_TYPES)
+            .values('sha256', 'content_type').annotate(name=Min('name'), size=Min('size'))
+        )
+        started = time.perf_counter()
+        futures = {}
+        for image in images.iterator():
+            future = pipeline.submit(image['name'], image['sha256'], image['content_type'], force=options['force'])
+            if future is not None:
+                futures[future] = image
+
+        done = failed = source_bytes = written = 0
+        for future in as_completed(futures):
+            if future.exception() is not None:
+                failed += 1
+                self.stderr.write(f"{futures[future]['name']}: {future.exception()}")
+                continue
+            done += 1
+            source_bytes += futures[future]['size']
+            written += future.result()
+            if done % 100 == 0:
+                self.stdout.write(f"{done}/{len(futures)} images")
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        self.stdout.write(self.style.SUCCESS(
+            f"{done} images ({source_bytes / 2**20:.1f} MB) rendered in {elapsed:.2f}s with {pipeline.workers} "
+            f"workers: {done / elapsed:.1f} images/s, {source_bytes / 2**20 / elapsed:.1f} MB/s, "
+            f"{written / 2**20:.1f} MB written, {failed} failed"
+        ))
@@ -0,0 +1,81 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import os
+# Django Libraries
+from django.core.management.base import BaseCommand, CommandError
+# Project Libraries
+from bookings.traffic import SYNTHETIC_EMAIL, HttpTarget, ModelTarget, TrafficGenerator, parse_mix
+
+
+###################
+# COMMAND SECTION #
+###################
+class Command(BaseCommand):
+    help = (
+        "Generates a mix of booking creates, updates and deletes at a target rate, through the models "
+        "or the HTTP API, and reports the achieved throughput and latency percentiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rate', type=float, default=10, help="Operations per second to schedule.")
+        parser.add_argument('--duration', type=float, default=0, help="Seconds to run, until interrupted if 0.")
+        parser.add_argument(
+            '--mix', default='create=60,update=30,delete=10', help="Weights of the create, update and delete operations."
+        )
+        parser.add_argument('--workers', type=int, default=4, help="Threads running the operations.")
+        parser.add_argument(
+            '--target', choices=('orm', 'http'), default='orm',
+            help="Write through the models of this process or the API of a running server.",
+        )
+        parser.add_argument('--url', default='http://localhost:8000/', help="Root of the booking API, for --target http.")
+        parser.add_argument(
+            '--token', default=os.environ.get('TRAFFIC_TOKEN'),
+            help="API token, for --target http (defaults to the TRAFFIC_TOKEN environment variable).",
+        )
+        parser.add_argument('--report-interval', type=float, default=10, help="Seconds between progress reports.")
+        parser.add_argument(
+            '--cleanup', action='store_true', help=f"Delete the bookings with email {SYNTHETIC_EMAIL} when done (orm)."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            target = HttpTarget(options['url'], options['token']) if options['target'] == 'http' else ModelTarget()
+            generator = TrafficGenerator(
+                target, rate=options['rate'], mix=parse_mix(options['mix']), workers=options['workers']
+            )
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        mix = ', '.join(f'{operation} {weight:g}' for operation, weight in generator.mix.items())
+        self.stdout.write(f"Generating {options['rate']:g} operations/s through {target.name} ({mix}), Ctrl+C to stop")
+        stats = generator.run(
+            duration=options['duration'] or None, report=self.report, report_interval=options['report_interval']
+        )
+
+        self.stdout.write(self.style.SUCCESS("Done"))
+        self.report(stats)
+        for operation, counters in stats['operations'].items():
+            if counters['count']:
+                self.stdout.write(
+                    f"  {operation:<7} {counters['count']:8} ok {counters['count'] - counters['errors']:8}   "
+                    f"{self.format_latency(counters['latency_ms'])}"
+                )
+
+        if options['cleanup']:
+            from bookings.models import Booking
+            deleted, _ = Booking.objects.filter(customerEmail=SYNTHETIC_EMAIL).delete()
+            self.stdout.write(f"Cleaned up {deleted} generated bookings")
+
+    def report(self, stats):
+        self.stdout.write(
+            f"{stats['elapsed']:8.1f}s  {stats['completed']:8} operations  {stats['throughput']:8.1f}/s  "
+            f"errors {stats['errors']}  skipped {stats['skipped']}  {self.format_latency(stats['latency_ms'])}"
+        )
+
+    @staticmethod
+    def format_latency(latency):
+        if latency is None:
+            return "latency -"
+        return "latency ms p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f}  max {max:.1f}".format(**latency)
@@ -0,0 +1,31 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import time
+# Django Libraries
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+# Project Libraries
+from bookings.sqlite import sqlite_tuner
+
+
+###################
+# COMMAND SECTION #
+###################
+class Command(BaseCommand):
+    help = "Runs a full ANALYZE and PRAGMA optimize on the SQLite database, e.g. after a bulk load."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help="Database alias to optimize.")
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError("Only SQLite databases are supported.")
+
+        started = time.perf_counter()
+        sqlite_tuner.optimize(connection, full=True)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(f"Analyzed {connection.settings_dict['NAME']} in {elapsed:.2f}s"))
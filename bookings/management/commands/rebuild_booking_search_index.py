@@ -0,0 +1,33 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import time
+# Django Libraries
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+# Project Libraries
+from bookings import search
+from bookings.models import Booking
+
+
+###################
+# COMMAND SECTION #
+###################
+class Command(BaseCommand):
+    help = "Rebuilds the full-text index over booking names, emails and phones from the bookings table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help="Database alias to rebuild the index on.")
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if not search.is_available(using):
+            raise CommandError("The booking search index does not exist on this database (SQLite FTS5 trigram only).")
+
+        started = time.perf_counter()
+        search.rebuild_index(using)
+        elapsed = time.perf_counter() - started
+
+        count = Booking.objects.using(using).count()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} bookings in {elapsed:.2f}s"))
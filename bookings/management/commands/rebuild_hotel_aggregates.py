@@ -0,0 +1,44 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import time
+# Django Libraries
+from django.core.management.base import BaseCommand, CommandError
+# Project Libraries
+from bookings import aggregates
+
+
+###################
+# COMMAND SECTION #
+###################
+class Command(BaseCommand):
+    help = "Rebuilds the per-hotel room price aggregates and global totals, or checks them for drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help="Only compare the stored aggregates with freshly computed ones; exits with an error on drift."
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        if options['check']:
+            drift = aggregates.find_drift()
+            elapsed = time.perf_counter() - started
+            for kind in ('missing', 'stale', 'extra'):
+                self.stdout.write(f"{kind.capitalize()} hotel rows: {len(drift[kind])}")
+                for hotel_id in drift[kind][:10]:
+                    self.stdout.write(f"  {hotel_id}")
+            self.stdout.write(f"Global totals drifted: {'yes' if drift['totals'] else 'no'}")
+            self.stdout.write(f"Checked in {elapsed:.2f}s")
+
+            if drift['missing'] or drift['stale'] or drift['extra'] or drift['totals']:
+                raise CommandError("Aggregates drifted, run without --check to rebuild them.")
+            self.stdout.write(self.style.SUCCESS("Aggregates are up to date."))
+            return
+
+        written = aggregates.rebuild()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt aggregates for {written} hotels in {elapsed:.2f}s"))
@@ -0,0 +1,38 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import time
+# Django Libraries
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+# Project Libraries
+from bookings.replica import replica
+
+
+###################
+# COMMAND SECTION #
+###################
+class Command(BaseCommand):
+    help = "Copies the primary database into the read replica through the SQLite backup API."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help="Database alias to copy from.")
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help="Keep refreshing every this many seconds (keep it below REPLICA_MAX_LAG). Refreshes once if 0.",
+        )
+
+    def handle(self, *args, **options):
+        if replica.alias not in connections:
+            raise CommandError(f"No {replica.alias!r} database is configured.")
+
+        while True:
+            started = time.perf_counter()
+            replica.refresh(options['database'])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(f"Replica refreshed in {elapsed:.2f}s"))
+
+            if not options['interval']:
+                return
+            time.sleep(max(0.0, options['interval'] - elapsed))
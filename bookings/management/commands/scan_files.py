@@ -0,0 +1,36 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import time
+# Django Libraries
+from django.core.management.base import BaseCommand
+# Project Libraries
+from bookings.catalog import file_catalog
+
+
+###################
+# COMMAND SECTION #
+###################
+class Command(BaseCommand):
+    help = "Reconciles the file catalog with MEDIA_ROOT/uploads (files added, changed or removed outside the API)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help="Keep scanning every this many seconds. Scans once if 0.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            changes = file_catalog.scan()
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(
+                f"Catalog scanned in {elapsed:.2f}s: {changes['added']} added, "
+                f"{changes['updated']} updated, {changes['removed']} removed"
+            ))
+
+            if not options['interval']:
+                return
+            time.sleep(max(0.0, options['interval'] - elapsed))
@@ -0,0 +1,30 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import threading
+
+
+####################
+# REGISTRY SECTION #
+####################
+_sources = {}
+_lock = threading.Lock()
+
+
+def register(name, source):
+    """
+    Registers a callable returning a dict of counters under the given name.
+    Re-registering a name replaces the previous source.
+    """
+    with _lock:
+        _sources[name] = source
+
+
+def collect():
+    """
+    :return: A snapshot of every registered source's counters, keyed by source name.
+    """
+    with _lock:
+        sources = dict(_sources)
+    return {name: source() for name, source in sources.items()}
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-18 05:38
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0003_monitoreduser"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="operationlog",
+            name="timestamp",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
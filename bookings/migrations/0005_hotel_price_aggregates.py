@@ -0,0 +1,115 @@
+# Generated by Django 5.1.6 on 2026-10-18 05:42
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, Sum
+
+
+def populate_aggregates(apps, schema_editor):
+    Hotel = apps.get_model("bookings", "Hotel")
+    Room = apps.get_model("bookings", "Room")
+    HotelPriceAggregate = apps.get_model("bookings", "HotelPriceAggregate")
+    RoomPriceTotals = apps.get_model("bookings", "RoomPriceTotals")
+
+    ratings = dict(Hotel.objects.values_list("id", "rating"))
+    rows = (
+        Room.objects.values("hotel_id")
+        .annotate(
+            price_sum=Sum(
+                "price_per_night",
+                output_field=DecimalField(max_digits=20, decimal_places=2),
+            ),
+            room_count=Count("id"),
+            total_capacity=Sum("capacity"),
+        )
+        .order_by()
+    )
+
+    aggregates, price_sum, room_count = [], Decimal(0), 0
+    for row in rows.iterator(chunk_size=5_000):
+        aggregates.append(
+            HotelPriceAggregate(
+                hotel_id=row["hotel_id"],
+                price_sum=row["price_sum"],
+                room_count=row["room_count"],
+                total_capacity=row["total_capacity"],
+                avg_price=(row["price_sum"] / row["room_count"]).quantize(
+                    Decimal("0.01")
+                ),
+                rating=ratings[row["hotel_id"]],
+            )
+        )
+        price_sum += row["price_sum"]
+        room_count += row["room_count"]
+
+    HotelPriceAggregate.objects.bulk_create(aggregates, batch_size=5_000)
+    RoomPriceTotals.objects.create(pk=1, price_sum=price_sum, room_count=room_count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0004_operationlog_timestamp_default"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoomPriceTotals",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "price_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                ("room_count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="HotelPriceAggregate",
+            fields=[
+                (
+                    "hotel",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="price_aggregate",
+                        serialize=False,
+                        to="bookings.hotel",
+                    ),
+                ),
+                (
+                    "price_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=16),
+                ),
+                ("room_count", models.PositiveIntegerField(default=0)),
+                ("total_capacity", models.PositiveIntegerField(default=0)),
+                (
+                    "avg_price",
+                    models.DecimalField(decimal_places=2, max_digits=8, null=True),
+                ),
+                (
+                    "rating",
+                    models.DecimalField(decimal_places=1, default=0.0, max_digits=2),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["avg_price", "rating"],
+                        name="bookings_ho_avg_pri_e091d3_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_aggregates, migrations.RunPython.noop),
+    ]
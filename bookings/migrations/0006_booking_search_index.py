@@ -0,0 +1,84 @@
+# Full-text side index for the Booking contact columns (SQLite FTS5, trigram tokenizer)
+
+from django.db import migrations
+
+SEARCH_TABLE = "bookings_booking_search"
+
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(
+        customer_name, customer_email, customer_phone,
+        content='bookings_booking', content_rowid='rowid', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {SEARCH_TABLE}_insert AFTER INSERT ON bookings_booking BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, customer_name, customer_email, customer_phone)
+        VALUES (new.rowid, new.customer_name, new.customer_email, new.customer_phone);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {SEARCH_TABLE}_delete AFTER DELETE ON bookings_booking BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, customer_name, customer_email, customer_phone)
+        VALUES ('delete', old.rowid, old.customer_name, old.customer_email, old.customer_phone);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {SEARCH_TABLE}_update
+    AFTER UPDATE OF customer_name, customer_email, customer_phone ON bookings_booking BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, customer_name, customer_email, customer_phone)
+        VALUES ('delete', old.rowid, old.customer_name, old.customer_email, old.customer_phone);
+        INSERT INTO {SEARCH_TABLE}(rowid, customer_name, customer_email, customer_phone)
+        VALUES (new.rowid, new.customer_name, new.customer_email, new.customer_phone);
+    END
+    """,
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_update",
+    f"DROP TABLE IF EXISTS {SEARCH_TABLE}",
+]
+
+
+def supports_trigram(schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                "CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(value, tokenize='trigram')"
+            )
+            cursor.execute("DROP TABLE temp.trigram_probe")
+        except Exception:
+            return False
+    return True
+
+
+def create_search_index(apps, schema_editor):
+    # Other databases (or SQLite builds without FTS5 trigram) keep the icontains path
+    if not supports_trigram(schema_editor):
+        return
+    for statement in CREATE_SQL:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0005_hotel_price_aggregates"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
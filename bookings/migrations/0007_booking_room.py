@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-18 05:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0006_booking_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="booking",
+            name="room",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="bookings",
+                to="bookings.room",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["room", "endDate", "startDate", "state"],
+                name="bookings_bo_room_id_ba76e4_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.1.6 on 2026-10-18 05:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0007_booking_room"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="room",
+            options={"ordering": ["number", "id"]},
+        ),
+        migrations.RemoveIndex(
+            model_name="booking",
+            name="bookings_bo_start_d_8ecf7f_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="hotel",
+            name="bookings_ho_rating_9d44f6_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="room",
+            name="bookings_ro_hotel_i_49d77d_idx",
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["startDate", "endDate", "id"],
+                name="bookings_bo_start_d_89d525_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["endDate", "id"], name="bookings_bo_end_dat_ac80e0_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["createdAt", "id"], name="bookings_bo_created_b97bfb_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["customerName", "id"], name="bookings_bo_custome_ae5277_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hotel",
+            index=models.Index(
+                fields=["rating", "id"], name="bookings_ho_rating_c43ab4_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["number", "id"], name="bookings_ro_number_ff9983_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["hotel", "price_per_night", "id"],
+                name="bookings_ro_hotel_i_58f35d_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["price_per_night", "id"], name="bookings_ro_price_p_5b542c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["capacity", "id"], name="bookings_ro_capacit_3f0f78_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.6 on 2026-10-18 06:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0008_list_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StoredFile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("size", models.BigIntegerField()),
+                ("modified", models.DateTimeField()),
+                ("sha256", models.CharField(db_index=True, max_length=64)),
+                ("content_type", models.CharField(max_length=100)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["name", "id"], name="bookings_st_name_9d5f38_idx"
+                    ),
+                    models.Index(
+                        fields=["size", "id"], name="bookings_st_size_30a751_idx"
+                    ),
+                    models.Index(
+                        fields=["modified", "id"], name="bookings_st_modifie_9b0fd4_idx"
+                    ),
+                    models.Index(
+                        fields=["content_type", "name", "id"],
+                        name="bookings_st_content_e80066_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 07:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0009_stored_file"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="booking",
+            options={"base_manager_name": "objects"},
+        ),
+    ]
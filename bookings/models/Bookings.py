@@ -5,6 +5,56 @@
 import uuid
 # Django Libraries
 from django.db import models
+# Project Libraries
+from .Rooms import Room
+
+
+###########################
+##   QUERYSET SECTION    ##
+###########################
+class BookingQuerySet(models.QuerySet):
+    """
+    Sends the live query changes of bulk writes, which bypass the model signals
+    (deletes still send them, see bookings.live). Also the base manager's, through which a Room
+    delete sets the room of all its bookings to NULL in one update.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from bookings.live import live_queries, render, row_of
+
+        objs = list(objs)
+        created = super().bulk_create(objs, *args, **kwargs)
+        if live_queries.enabled:
+            for booking in objs:
+                live_queries.changed(None, row_of(booking), render(booking))
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        from bookings.live import live_queries, render, row_of, stored_rows
+
+        objs = list(objs)
+        if not live_queries.enabled:
+            return super().bulk_update(objs, fields, *args, **kwargs)
+
+        before = stored_rows(booking.pk for booking in objs)
+        updated = super().bulk_update(objs, fields, *args, **kwargs)
+        for booking in objs:
+            live_queries.changed(before.get(booking.pk), row_of(booking), render(booking))
+        return updated
+
+    def update(self, **kwargs):
+        from bookings.live import live_queries, render, row_of, stored_rows
+
+        if not live_queries.enabled:
+            return super().update(**kwargs)
+
+        before = stored_rows(self.values_list('pk', flat=True))
+        updated = super().update(**kwargs)
+        for booking in self.model.objects.filter(pk__in=list(before)):
+            live_queries.changed(before[booking.pk], row_of(booking), render(booking))
+        return updated
+
+    update.alters_data = True
 
 
 ###########################
@@ -30,8 +80,22 @@ class Booking(models.Model):
     )
     createdAt = models.DateTimeField(auto_now_add=True, db_column="created_at")
     completedAt = models.DateTimeField(null=True, blank=True, db_column="completed_at")
+    # Indexed through the (room, endDate, startDate, state) index below
+    room = models.ForeignKey(
+        Room, null=True, blank=True, on_delete=models.SET_NULL, related_name='bookings', db_index=False
+    )
+
+    objects = BookingQuerySet.as_manager()
 
     class Meta:
+        # The deletion collector updates the related bookings through it
+        base_manager_name = 'objects'
+        # One index per supported list ordering, ending with the id tiebreaker (see bookings.views.bookings)
         indexes = [
-            models.Index(fields=['startDate', 'endDate'])
+            models.Index(fields=['startDate', 'endDate', 'id']),
+            models.Index(fields=['endDate', 'id']),
+            models.Index(fields=['createdAt', 'id']),
+            models.Index(fields=['customerName', 'id']),
+            # Interval index for availability: per room, seek to the bookings ending after a date
+            models.Index(fields=['room', 'endDate', 'startDate', 'state']),
         ]
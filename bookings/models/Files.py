@@ -0,0 +1,33 @@
+###########################
+##    IMPORTS SECTION    ##
+###########################
+# Django Libraries
+from django.db import models
+
+
+###########################
+##     MODEL SECTION     ##
+###########################
+class StoredFile(models.Model):
+    """
+    Catalog entry of a file in MEDIA_ROOT/uploads, written by the upload views and reconciled with
+    the directory by bookings.catalog.FileCatalog.scan, so listing never walks the directory.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField()
+    modified = models.DateTimeField()
+    # sha256 of the content, also its blob name for content-addressed files (see bookings.uploads)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    content_type = models.CharField(max_length=100)
+
+    class Meta:
+        # One index per supported listing order, ending with the id tiebreaker
+        indexes = [
+            models.Index(fields=['name', 'id']),
+            models.Index(fields=['size', 'id']),
+            models.Index(fields=['modified', 'id']),
+            models.Index(fields=['content_type', 'name', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.size} bytes)"
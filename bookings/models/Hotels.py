@@ -4,8 +4,61 @@
 # Python Libraries
 import uuid
 # Django Libraries
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
+# Project Libraries
+from bookings.response_cache import response_cache
+
+
+###########################
+##   QUERYSET SECTION    ##
+###########################
+class HotelQuerySet(models.QuerySet):
+    """
+    Keeps the hotel price aggregates and the cached list responses in sync for
+    bulk writes, which bypass Hotel.save() and Hotel.delete().
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        response_cache.bump('hotel')
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        from bookings import aggregates
+
+        objs = list(objs)
+        updated = super().bulk_update(objs, fields, *args, **kwargs)
+        response_cache.bump('hotel')
+        if 'rating' in fields:
+            aggregates.sync_ratings([hotel.pk for hotel in objs])
+        return updated
+
+    def update(self, **kwargs):
+        from bookings import aggregates
+
+        response_cache.bump('hotel')
+        if 'rating' not in kwargs:
+            return super().update(**kwargs)
+
+        hotel_ids = list(self.values_list('pk', flat=True))
+        updated = super().update(**kwargs)
+        aggregates.sync_ratings(hotel_ids)
+        return updated
+
+    update.alters_data = True
+
+    def delete(self):
+        from bookings import aggregates
+
+        # Rooms are removed by the cascade without going through Room.delete()
+        response_cache.bump('hotel', 'room')
+        with transaction.atomic(using=self.db):
+            aggregates.remove_hotel_rooms(self.values('pk'))
+            return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
 
 
 ###########################
@@ -22,12 +75,31 @@ class Hotel(models.Model):
         help_text="Hotel rating between 0.0 and 5.0"
     )
 
+    objects = HotelQuerySet.as_manager()
+
     class Meta:
+        # Sorting by name is served by its unique index, see bookings.views.hotels for the others
         ordering = ['name']
         indexes = [
-            models.Index(fields=['rating'])
+            models.Index(fields=['rating', 'id'])
         ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        from bookings import aggregates
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            aggregates.sync_ratings([self.pk])
+            response_cache.bump('hotel')
+
+    def delete(self, *args, **kwargs):
+        from bookings import aggregates
+
+        with transaction.atomic():
+            response_cache.bump('hotel', 'room')
+            aggregates.remove_hotel_rooms([self.pk])
+            return super().delete(*args, **kwargs)
+
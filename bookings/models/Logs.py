@@ -4,6 +4,7 @@
 # Django Libraries
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 ###########################
@@ -26,7 +27,8 @@ class OperationLog(models.Model):
     model = models.CharField(max_length=50)
     object_id = models.CharField(max_length=100, blank=True, null=True)
     action = models.CharField(max_length=10, choices=ACTION_CHOICES)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the operation happens, not when the buffered writer flushes it
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
 
     def __str__(self):
         return f"{self.user} {self.action} {self.model}({self.object_id}) at {self.timestamp}"
@@ -4,12 +4,91 @@
 # Python Libraries
 import uuid
 # Django Libraries
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 # Project Libraries
+from bookings.response_cache import response_cache
 from .Hotels import Hotel
 
 
+###########################
+##   CONSTANTS SECTION   ##
+###########################
+# Fields feeding the hotel price aggregates
+AGGREGATED_FIELDS = {'price_per_night', 'capacity', 'hotel', 'hotel_id'}
+
+
+###########################
+##   QUERYSET SECTION    ##
+###########################
+class RoomQuerySet(models.QuerySet):
+    """
+    Keeps the hotel price aggregates and the cached list responses in sync for
+    bulk writes, which bypass Room.save() and Room.delete().
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from bookings import aggregates
+
+        objs = list(objs)
+        response_cache.bump('room')
+        with transaction.atomic(using=self.db):
+            conflicts = kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts')
+            if conflicts:
+                # Rows overwritten by an update may be moved away from another hotel
+                moved_from = {hotel_id for hotel_id, _ in aggregates.fetch_room_state([room.pk for room in objs])}
+            created = super().bulk_create(objs, *args, **kwargs)
+            if conflicts:
+                # Unknown which rows were inserted, recompute the touched hotels from what is stored
+                aggregates.rebuild(hotel_ids={room.hotel_id for room in objs} | moved_from)
+            else:
+                aggregates.room_changes([], [(room.hotel_id, room.price_per_night) for room in objs])
+        return created
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        from bookings import aggregates
+
+        objs = list(objs)
+        response_cache.bump('room')
+        if not AGGREGATED_FIELDS.intersection(fields):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+
+        with transaction.atomic(using=self.db):
+            before = aggregates.fetch_room_state([room.pk for room in objs])
+            updated = super().bulk_update(objs, fields, *args, **kwargs)
+            aggregates.room_changes(before, aggregates.fetch_room_state([room.pk for room in objs]))
+        return updated
+
+    def update(self, **kwargs):
+        from bookings import aggregates
+
+        response_cache.bump('room')
+        if not AGGREGATED_FIELDS.intersection(kwargs):
+            return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db):
+            room_ids = list(self.values_list('pk', flat=True))
+            before = aggregates.fetch_room_state(room_ids)
+            updated = super().update(**kwargs)
+            aggregates.room_changes(before, aggregates.fetch_room_state(room_ids))
+        return updated
+
+    update.alters_data = True
+
+    def delete(self):
+        from bookings import aggregates
+
+        response_cache.bump('room')
+        with transaction.atomic(using=self.db):
+            before = list(self.values_list('hotel_id', 'price_per_night'))
+            deleted = super().delete()
+            aggregates.room_changes(before, [])
+        return deleted
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
 ###########################
 ##     MODEL SECTION     ##
 ###########################
@@ -28,12 +107,37 @@ class Room(models.Model):
     )
     hotel = models.ForeignKey(to=Hotel, on_delete=models.CASCADE, related_name='rooms')
 
+    objects = RoomQuerySet.as_manager()
+
     class Meta:
         unique_together = ('number', 'hotel')
-        ordering = ['number']
+        # One index per supported list ordering, ending with the id tiebreaker (see bookings.views.rooms)
+        ordering = ['number', 'id']
         indexes = [
-            models.Index(fields=['hotel', 'price_per_night'])
+            models.Index(fields=['number', 'id']),
+            models.Index(fields=['hotel', 'price_per_night', 'id']),
+            models.Index(fields=['price_per_night', 'id']),
+            models.Index(fields=['capacity', 'id']),
         ]
 
     def __str__(self):
         return f"Room {self.number} - {self.hotel.name}"
+
+    def save(self, *args, **kwargs):
+        from bookings import aggregates
+
+        with transaction.atomic():
+            before = [] if self._state.adding else aggregates.fetch_room_state([self.pk])
+            super().save(*args, **kwargs)
+            aggregates.room_changes(before, [(self.hotel_id, self.price_per_night)])
+            response_cache.bump('room')
+
+    def delete(self, *args, **kwargs):
+        from bookings import aggregates
+
+        with transaction.atomic():
+            before = aggregates.fetch_room_state([self.pk])
+            deleted = super().delete(*args, **kwargs)
+            aggregates.room_changes(before, [])
+            response_cache.bump('room')
+        return deleted
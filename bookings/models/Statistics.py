@@ -0,0 +1,61 @@
+###########################
+##    IMPORTS SECTION    ##
+###########################
+# Python Libraries
+from decimal import Decimal
+# Django Libraries
+from django.db import models
+# Project Libraries
+from .Hotels import Hotel
+
+
+###########################
+##     MODEL SECTION     ##
+###########################
+class HotelPriceAggregate(models.Model):
+    """
+    Per-hotel room price statistics, kept up to date by Room writes (see bookings.aggregates).
+    Hotels without rooms have no row.
+    """
+    hotel = models.OneToOneField(
+        to=Hotel,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='price_aggregate'
+    )
+    price_sum = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    room_count = models.PositiveIntegerField(default=0)
+    total_capacity = models.PositiveIntegerField(default=0)
+    avg_price = models.DecimalField(max_digits=8, decimal_places=2, null=True)
+    # Copy of Hotel.rating so the stats ordering is served by a single index
+    rating = models.DecimalField(max_digits=2, decimal_places=1, default=0.0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['avg_price', 'rating'])
+        ]
+
+    def __str__(self):
+        return f"{self.hotel_id}: {self.room_count} rooms, avg {self.avg_price}"
+
+
+class RoomPriceTotals(models.Model):
+    """
+    Single row holding the running price sum and count over every Room.
+    """
+    price_sum = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    room_count = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    def load(cls):
+        totals, _ = cls.objects.get_or_create(pk=1)
+        return totals
+
+    @property
+    def avg_price(self):
+        if not self.room_count:
+            return None
+        return Decimal(self.price_sum) / self.room_count
+
+    def __str__(self):
+        return f"{self.room_count} rooms, price sum {self.price_sum}"
@@ -3,3 +3,5 @@ from .Hotels import Hotel
 from .Rooms import Room
 from .Users import BookingUser, MonitoredUser
 from .Logs import OperationLog
+from .Statistics import HotelPriceAggregate, RoomPriceTotals
+from .Files import StoredFile
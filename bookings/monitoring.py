@@ -0,0 +1,196 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import logging
+import threading
+import time
+# Django Libraries
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+# Project Libraries
+from bookings import metrics
+
+logger = logging.getLogger(__name__)
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+MONITOR_MODES = ('incremental', 'scan', 'both')
+
+
+####################
+# DETECTOR SECTION #
+####################
+class _UserWindow:
+    """
+    Ring buffer of per-bucket operation counts for one user.
+    """
+    __slots__ = ('counts', 'buckets', 'last_bucket')
+
+    def __init__(self, size):
+        self.counts = [0] * size
+        self.buckets = [-1] * size
+        self.last_bucket = -1
+
+
+class ActivityDetector:
+    """
+    Flags users doing more than `threshold` operations within `window` seconds.
+
+    Every logged operation bumps the user's counter for the current time bucket
+    (window / bucket_count seconds wide), so detection happens on the request
+    that crosses the threshold instead of at the next database scan. Newly
+    flagged users are kept in memory and written together by flush().
+
+    Counters are per process: with several workers a user spreading requests
+    across them is only caught by the reconciliation scan (MONITOR_MODE='both').
+    """
+
+    def __init__(self, window=60, threshold=20, bucket_count=12, enabled=True):
+        self.enabled = enabled
+        self.window = window
+        self.threshold = threshold
+        self.bucket_count = bucket_count
+        self.bucket_width = window / bucket_count
+
+        self._users = {}
+        self._flagged = set()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(('events', 'flagged', 'written'), 0)
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            window=getattr(settings, 'MONITOR_WINDOW_SIZE', 60),
+            threshold=getattr(settings, 'MONITOR_THRESHOLD', 20),
+            bucket_count=getattr(settings, 'MONITOR_WINDOW_BUCKETS', 12),
+            enabled=monitor_mode() in ('incremental', 'both'),
+        )
+
+    def record(self, user_id, now=None):
+        """
+        Counts one operation for the user.
+        :return: True if this operation made the user cross the threshold.
+        """
+        bucket = int((time.time() if now is None else now) // self.bucket_width)
+        slot = bucket % self.bucket_count
+        oldest = bucket - self.bucket_count
+
+        with self._lock:
+            self._counters['events'] += 1
+            user_window = self._users.get(user_id)
+            if user_window is None:
+                user_window = self._users[user_id] = _UserWindow(self.bucket_count)
+
+            if user_window.buckets[slot] != bucket:
+                user_window.buckets[slot] = bucket
+                user_window.counts[slot] = 0
+            user_window.counts[slot] += 1
+            user_window.last_bucket = bucket
+
+            if user_id in self._flagged:
+                return False
+
+            total = sum(count for count, seen in zip(user_window.counts, user_window.buckets) if seen > oldest)
+            if total <= self.threshold:
+                return False
+
+            self._flagged.add(user_id)
+            self._pending.add(user_id)
+            self._counters['flagged'] += 1
+            return True
+
+    def prune(self, now=None):
+        """
+        Forgets users without operations in the current window, so memory tracks active users only.
+        """
+        oldest = int((time.time() if now is None else now) // self.bucket_width) - self.bucket_count
+        with self._lock:
+            idle = [user_id for user_id, user_window in self._users.items() if user_window.last_bucket <= oldest]
+            for user_id in idle:
+                del self._users[user_id]
+                self._flagged.discard(user_id)
+        return len(idle)
+
+    def flush(self):
+        """
+        Writes every user flagged since the last flush in one batch.
+        :return: The ids of the users written.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        if not pending:
+            return []
+
+        flag_users(pending)
+        with self._lock:
+            self._counters['written'] += len(pending)
+        return list(pending)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            counters.update({'tracked_users': len(self._users), 'pending': len(self._pending)})
+        return counters
+
+
+###################
+# HELPERS SECTION #
+###################
+def monitor_mode():
+    mode = getattr(settings, 'MONITOR_MODE', 'both')
+    if mode not in MONITOR_MODES:
+        raise ValueError(f"Unknown MONITOR_MODE {mode!r}, expected one of {MONITOR_MODES}")
+    return mode
+
+
+def flag_users(user_ids):
+    """
+    Creates MonitoredUser entries for the given users in a single insert, skipping already flagged ones.
+    :return: The ids of the newly flagged users.
+    """
+    from bookings.models import MonitoredUser
+
+    flagged = set(MonitoredUser.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+    new_ids = [user_id for user_id in user_ids if user_id not in flagged]
+    # Still ignoring conflicts: another process may flag them meanwhile
+    MonitoredUser.objects.bulk_create(
+        [MonitoredUser(user_id=user_id) for user_id in new_ids],
+        ignore_conflicts=True
+    )
+    for user_id in new_ids:
+        logger.info("Flagged suspicious user %s", user_id)
+    return new_ids
+
+
+def scan_operation_logs(window, threshold):
+    """
+    Full re-aggregation of OperationLog over the window, used as a fallback and to
+    reconcile the per-process detectors.
+    :return: The ids of the users over the threshold.
+    """
+    from bookings.models import OperationLog
+
+    window_start = timezone.now() - timezone.timedelta(seconds=window)
+    user_ids = list(
+        OperationLog.objects
+        .filter(timestamp__gte=window_start)
+        .values('user')
+        .annotate(op_count=Count('id'))
+        .filter(op_count__gt=threshold)
+        .values_list('user', flat=True)
+    )
+    if user_ids:
+        flag_users(user_ids)
+    return user_ids
+
+
+#####################
+# SINGLETON SECTION #
+#####################
+activity_detector = ActivityDetector.from_settings()
+metrics.register('activity_detector', activity_detector.stats)
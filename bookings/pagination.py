@@ -0,0 +1,254 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+# Django Libraries
+from django.db.models import Q
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+DEFAULT_LIMIT = 10
+TRUE_VALUES = ('1', 'true', 'yes')
+FALSE_VALUES = ('0', 'false', 'no')
+
+
+###################
+# HELPERS SECTION #
+###################
+def _to_json_value(value):
+    """
+    Converts a sort key value into something json can encode losslessly.
+    """
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+def encode_cursor(keys, values):
+    """
+    Builds an opaque cursor from the sort keys and the last row's values.
+    """
+    payload = json.dumps({'k': list(keys), 'v': [_to_json_value(v) for v in values]}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, keys):
+    """
+    Returns the values stored in a cursor, validating it was built for the same sort keys.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        stored_keys, values = payload['k'], payload['v']
+    except (ValueError, TypeError, KeyError):
+        raise ValueError('cursor is invalid')
+
+    if stored_keys != list(keys) or len(values) != len(keys):
+        raise ValueError('cursor does not match the requested ordering')
+    return values
+
+
+def seek_filter(keys, values, descending=False):
+    """
+    Builds the "after this row" condition for a composite sort key.
+
+    For keys (a, b, id) this produces
+        a >= x AND (a > x OR (a = x AND (b > y OR (b = y AND id > z))))
+    so that the leading column stays a plain range the index can seek on.
+    """
+    strict = 'lt' if descending else 'gt'
+    loose = 'lte' if descending else 'gte'
+
+    condition = Q(**{f'{keys[-1]}__{strict}': values[-1]})
+    for key, value in zip(reversed(keys[:-1]), reversed(values[:-1])):
+        condition = Q(**{f'{key}__{strict}': value}) | (Q(**{key: value}) & condition)
+
+    return Q(**{f'{keys[0]}__{loose}': values[0]}) & condition
+
+
+def _key_value(row, key):
+    # Rows are model instances, or dicts for .values() querysets
+    return row[key] if isinstance(row, dict) else getattr(row, key)
+
+
+def sort_columns(orderings):
+    """
+    :return: Every column used by an endpoint's declared orderings, to fetch alongside projected rows.
+    """
+    columns = []
+    for keyset in orderings.values():
+        columns.extend(key for key in keyset if key not in columns)
+    return columns
+
+
+def resolve_ordering(params, orderings):
+    """
+    Resolves the "ordering" parameter ("key" or "-key") against the endpoint's declared orderings.
+    :param orderings: Maps each supported sort key to its keyset, the columns of a composite index
+                      ending with the "id" tiebreaker. The first entry is the default.
+    :return: (keyset, descending, requested), "requested" telling whether the parameter was given.
+    :raises ValueError: If the sort key is not supported, so no request can trigger an unindexed sort.
+    """
+    ordering = params.get('ordering', '')
+    if not ordering:
+        return next(iter(orderings.values())), False, False
+
+    key = ordering[1:] if ordering.startswith('-') else ordering
+    if key not in orderings:
+        raise ValueError(f"ordering must be one of: {', '.join(orderings)} (prefix with - to sort descending)")
+    return orderings[key], ordering.startswith('-'), True
+
+
+def order_fields(params, orderings):
+    """
+    :return: The order_by() arguments for the requested (or default) ordering.
+    :raises ValueError: If the sort key is not supported.
+    """
+    keyset, descending, _ = resolve_ordering(params, orderings)
+    prefix = '-' if descending else ''
+    return [prefix + key for key in keyset]
+
+
+def _parse_flag(params, name, default):
+    value = params.get(name)
+    if value is None or value == '':
+        return default
+    value = value.lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f'{name} must be a boolean')
+
+
+#####################
+# PAGINATOR SECTION #
+#####################
+class Page:
+    """
+    A single page of rows plus the metadata the list endpoints return with it.
+    """
+
+    def __init__(self, rows, cursor_mode=False, count=None, next_offset=None, next_cursor=None, has_more=None):
+        self.rows = rows
+        self.cursor_mode = cursor_mode
+        self.count = count
+        self.next_offset = next_offset
+        self.next_cursor = next_cursor
+        self.has_more = has_more
+
+    def data(self, results):
+        """
+        :return: The response body for the serialized page results.
+        """
+        body = {}
+        if self.count is not None:
+            body['count'] = self.count
+        body['results'] = results
+        if self.cursor_mode:
+            body['next_cursor'] = self.next_cursor
+        else:
+            body['next_offset'] = self.next_offset
+        if self.has_more is not None:
+            body['has_more'] = self.has_more
+        return body
+
+
+def _plan(params, queryset, orderings):
+    """
+    Validates the pagination parameters and orders the queryset, shared by paginate and apaginate.
+    :return: (queryset, limit, offset, with_count, keyset, cursor_mode)
+    """
+    try:
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+        offset = int(params.get('offset', 0))
+    except ValueError:
+        raise ValueError('limit and offset must be integers')
+
+    keyset, descending, requested = resolve_ordering(params, orderings)
+    prefix = '-' if descending else ''
+    cursor = params.get('cursor')
+
+    # Offset pagination
+    if cursor is None:
+        with_count = _parse_flag(params, 'count', True)
+        if requested or not queryset.query.order_by:
+            queryset = queryset.order_by(*[prefix + key for key in keyset])
+        return queryset, limit, offset, with_count, keyset, False
+
+    # Cursor (keyset) pagination
+    with_count = _parse_flag(params, 'count', False)
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+    queryset = queryset.order_by(*[prefix + key for key in keyset])
+    if cursor:
+        queryset = queryset.filter(seek_filter(keyset, decode_cursor(cursor, keyset), descending))
+    return queryset, limit, offset, with_count, keyset, True
+
+
+def _offset_page(rows, limit, offset, total):
+    if total is not None:
+        return Page(rows, count=total, next_offset=offset + limit if offset + limit < total else None)
+    has_more = len(rows) > limit
+    return Page(rows[:limit], next_offset=offset + limit if has_more else None, has_more=has_more)
+
+
+def _cursor_page(rows, limit, keyset, total):
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(keyset, [_key_value(rows[-1], key) for key in keyset])
+    return Page(rows, cursor_mode=True, count=total, next_cursor=next_cursor, has_more=has_more)
+
+
+def paginate(request, queryset, orderings):
+    """
+    Slices a list queryset according to the request's pagination parameters.
+
+    Sorting is limited to the endpoint's declared orderings (see resolve_ordering),
+    every one of them backed by an index and made total by the "id" tiebreaker.
+    Without "ordering", an explicitly ordered queryset (e.g. by search rank) keeps
+    its order in offset mode, anything else gets the default ordering.
+
+    Offset mode (default) keeps the historic limit/offset behaviour. Cursor mode
+    is enabled by passing "cursor" (empty for the first page) and seeks past the
+    last row using the ordering's keyset, so every page costs the same.
+
+    The exact count is computed by default in offset mode only; "count=false"
+    or "count=true" overrides that and, without a count, one extra row is
+    fetched to tell whether there is a next page.
+
+    :raises ValueError: With a client facing message when the parameters are invalid.
+    """
+    queryset, limit, offset, with_count, keyset, cursor_mode = _plan(request.GET, queryset, orderings)
+    total = queryset.count() if with_count else None
+
+    if cursor_mode:
+        return _cursor_page(list(queryset[:limit + 1]), limit, keyset, total)
+    if total is not None:
+        return _offset_page(queryset[offset:offset + limit], limit, offset, total)
+    return _offset_page(list(queryset[offset:offset + limit + 1]), limit, offset, total)
+
+
+async def apaginate(request, queryset, orderings):
+    """
+    paginate for async views, running the queries through the async ORM.
+    """
+    queryset, limit, offset, with_count, keyset, cursor_mode = _plan(request.GET, queryset, orderings)
+    total = await queryset.acount() if with_count else None
+
+    if cursor_mode:
+        return _cursor_page([row async for row in queryset[:limit + 1]], limit, keyset, total)
+    if total is not None:
+        return _offset_page([row async for row in queryset[offset:offset + limit]], limit, offset, total)
+    return _offset_page([row async for row in queryset[offset:offset + limit + 1]], limit, offset, total)
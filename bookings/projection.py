@@ -0,0 +1,168 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import decimal
+# Django Rest Framework Libraries
+from rest_framework import fields as drf_fields
+from rest_framework.relations import PrimaryKeyRelatedField, RelatedField
+from rest_framework.settings import api_settings
+
+
+######################
+# CONVERTERS SECTION #
+######################
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.localize or field.normalize_output or field.decimal_places is None:
+        return field.to_representation
+
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        quantized = value.quantize(exponent, rounding=rounding, context=context)
+        return '{:f}'.format(quantized) if coerce_to_string else quantized
+    return convert
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != drf_fields.ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str):
+            return value
+        text = value.astimezone(field_timezone).isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return convert
+
+
+def _converter(field):
+    """
+    :return: A function doing what field.to_representation does for a stored value, without the
+             per-call setting lookups, or None when the value is already what the serializer returns.
+    """
+    if isinstance(field, PrimaryKeyRelatedField) and field.pk_field is None:
+        return None
+    if isinstance(field, drf_fields.UUIDField) and field.uuid_format == 'hex_verbose':
+        return str
+    if isinstance(field, drf_fields.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, drf_fields.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, drf_fields.DateField):
+        output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+        if output_format is not None and output_format.lower() == drf_fields.ISO_8601:
+            return lambda value: value if isinstance(value, str) else value.isoformat()
+        return field.to_representation
+    if isinstance(field, drf_fields.ChoiceField):
+        choices = field.choice_strings_to_values
+        return lambda value: choices.get(str(value), value) if value != '' else value
+    if type(field) in (drf_fields.CharField, drf_fields.EmailField):
+        return str
+    if type(field) is drf_fields.IntegerField:
+        return int
+    if type(field) is drf_fields.FloatField:
+        return float
+    return field.to_representation
+
+
+######################
+# PROJECTION SECTION #
+######################
+class Projection:
+    """
+    Read-only fast path for a ModelSerializer: rows are fetched with .values()
+    and turned into the serializer's output through converters compiled once
+    from its fields, instead of building model instances and running the DRF
+    field machinery per row. The rendered JSON is identical to the serializer's.
+
+    Settings such as the current timezone are resolved once, when the
+    projection is built.
+
+    The serializer's readable fields are the whitelist for sparse fieldsets:
+    select() narrows a projection to the "fields" a client asked for, which
+    then trims the SQL column list as well as the output.
+    """
+
+    def __init__(self, serializer_class, columns=None):
+        self.serializer_class = serializer_class
+        if columns is None:
+            columns = []
+            for name, field in serializer_class().fields.items():
+                if field.write_only:
+                    continue
+                source = f'{field.source}_id' if isinstance(field, RelatedField) else field.source
+                columns.append((name, source, _converter(field), field.source))
+        self.columns = columns
+        self.names = [column[0] for column in columns]
+        self.sources = [column[1] for column in columns]
+        self.partial = False
+
+    def select(self, fields):
+        """
+        Narrows the projection to a "fields" query parameter (comma separated names).
+        :return: This projection when no fields are requested, else a narrowed copy, in declared order.
+        :raises ValueError: If a requested field is not one of the serializer's fields.
+        """
+        if not fields:
+            return self
+        requested = {name.strip() for name in fields.split(',') if name.strip()}
+        unknown = sorted(requested.difference(self.names))
+        if unknown:
+            raise ValueError(f"unknown fields: {', '.join(unknown)}; allowed: {', '.join(self.names)}")
+
+        narrowed = Projection(self.serializer_class, [column for column in self.columns if column[0] in requested])
+        narrowed.partial = True
+        return narrowed
+
+    def queryset(self, queryset, *extra):
+        """
+        :param extra: Columns fetched without being rendered, e.g. the pagination keyset.
+        :return: The queryset projected to the columns the serializer reads, as dicts.
+        """
+        return queryset.values(*self.sources, *[source for source in extra if source not in self.sources])
+
+    def only(self, queryset):
+        """
+        :return: The queryset loading only the selected columns, for serializing model instances.
+        """
+        if not self.partial:
+            return queryset
+        return queryset.only(*[column[3] for column in self.columns])
+
+    def trim(self, serializer):
+        """
+        :return: The serializer, without the fields left out of the projection.
+        """
+        if self.partial:
+            for name in set(serializer.fields).difference(self.names):
+                serializer.fields.pop(name)
+        return serializer
+
+    def render_instance(self, instance):
+        """
+        :return: The serializer's representation of a model instance, loaded with only() when partial.
+        """
+        return self.render([{source: getattr(instance, source) for source in self.sources}])[0]
+
+    def render(self, rows):
+        """
+        :return: The serializer's representation of .values() rows.
+        """
+        results = []
+        for row in rows:
+            item = {}
+            for name, source, convert, _ in self.columns:
+                value = row[source]
+                item[name] = value if value is None or convert is None else convert(value)
+            results.append(item)
+        return results
@@ -0,0 +1,306 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import contextvars
+import threading
+import time
+from functools import wraps
+# Django Libraries
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+# Project Libraries
+from bookings import metrics
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+REPLICA_ALIAS = 'replica'
+# Table written into the replica after each refresh, never present on the primary
+STATE_TABLE = 'replica_state'
+READ_METHODS = ('GET', 'HEAD')
+
+
+###################
+# ROUTING SECTION #
+###################
+class Route:
+    """
+    Routing state of the request being served.
+    """
+
+    def __init__(self):
+        # Set by reads_from_replica when the replica may serve this request
+        self.replica = False
+        # Set on the first write, every later read of the request goes to the primary
+        self.wrote = False
+        # Snapshot time of the replica, once a read was sent to it
+        self.replica_synced_at = None
+
+
+_route = contextvars.ContextVar('bookings_replica_route', default=None)
+
+
+class Replica:
+    """
+    Read replica of the primary database: a second SQLite file, refreshed
+    through the backup API by `manage.py refresh_replica`, used once REPLICA_ENABLED.
+
+    Reads go to the replica only from views decorated with reads_from_replica,
+    for GET and HEAD requests, and only while:
+    - the replica is at most max_lag seconds behind the primary;
+    - the request has not written yet (sticky primary for the rest of the request);
+    - the user's last write is already in the replica (read-your-own-writes),
+      otherwise they are sent to the primary until the next refresh catches up.
+
+    Write times are kept in the state_cache alias, which must be shared by
+    every worker (e.g. file based) for the last rule to hold across them:
+    while it is a per process LocMemCache, every read goes to the primary.
+    """
+
+    def __init__(self, alias=REPLICA_ALIAS, max_lag=30, status_interval=1.0, state_cache='replica_state'):
+        self.alias = alias
+        self.max_lag = max_lag
+        self.status_interval = status_interval
+        self.state_cache = state_cache
+
+        self._synced_at = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(('replica_reads', 'sticky_reads', 'stale', 'unshared_state', 'refreshes'), 0)
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            max_lag=getattr(settings, 'REPLICA_MAX_LAG', 30),
+            status_interval=getattr(settings, 'REPLICA_STATUS_INTERVAL', 1.0),
+            state_cache=getattr(settings, 'REPLICA_STATE_CACHE', 'replica_state'),
+        )
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'REPLICA_ENABLED', False) and self.alias in connections.settings
+
+    @property
+    def shared_state(self):
+        """
+        :return: Whether the write times are seen by every worker, which a LocMemCache is not.
+        """
+        return not isinstance(caches[self.state_cache], LocMemCache)
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def synced_at(self):
+        """
+        :return: The primary's time when the replica's snapshot was taken, or None if it was never refreshed.
+        """
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.status_interval:
+            return self._synced_at
+
+        try:
+            with connections[self.alias].cursor() as cursor:
+                cursor.execute(f'SELECT synced_at FROM {STATE_TABLE} WHERE id = 1')
+                row = cursor.fetchone()
+            self._synced_at = row[0] if row else None
+        except DatabaseError:
+            self._synced_at = None
+        self._checked_at = now
+        return self._synced_at
+
+    def lag(self):
+        """
+        :return: Seconds the replica is behind the primary, None if it is unusable.
+        """
+        synced_at = self.synced_at() if self.enabled else None
+        return None if synced_at is None else max(0.0, time.time() - synced_at)
+
+    def readable_by(self, user):
+        """
+        :return: Whether reads of this user's request may be served by the replica.
+        """
+        if not self.shared_state:
+            # Another worker's writes would go unseen, and its users read stale rows
+            self._count('unshared_state')
+            return False
+        synced_at = self.synced_at()
+        if synced_at is None or time.time() - synced_at > self.max_lag:
+            self._count('stale')
+            return False
+        if user is None or not user.is_authenticated:
+            return True
+        last_write = caches[self.state_cache].get(f'replica:write:{user.pk}')
+        return last_write is None or synced_at >= last_write
+
+    def record_write(self, user):
+        """
+        Remembers a write until the replica is either past it or too far behind to be used anyway.
+        """
+        if not self.enabled:
+            return
+        values = {'replica:write': time.time()}
+        if user is not None and user.is_authenticated:
+            values[f'replica:write:{user.pk}'] = values['replica:write']
+        caches[self.state_cache].set_many(values, timeout=self.max_lag)
+
+    def behind_writes(self):
+        """
+        :return: Whether the current request read replica rows older than the latest write,
+                 which must not be cached as the current state.
+        """
+        route = _route.get()
+        if route is None or route.replica_synced_at is None:
+            return False
+        last_write = caches[self.state_cache].get('replica:write')
+        return last_write is not None and route.replica_synced_at < last_write
+
+    def refresh(self, source=DEFAULT_DB_ALIAS):
+        """
+        Copies the source database into the replica with the SQLite backup API, then stamps the snapshot time.
+        """
+        primary, target = connections[source], connections[self.alias]
+        primary.ensure_connection()
+        target.ensure_connection()
+
+        started = time.time()
+        primary.connection.backup(target.connection)
+        with target.cursor() as cursor:
+            cursor.execute(f'CREATE TABLE IF NOT EXISTS {STATE_TABLE} (id INTEGER PRIMARY KEY, synced_at REAL NOT NULL)')
+            cursor.execute(f'INSERT OR REPLACE INTO {STATE_TABLE} (id, synced_at) VALUES (1, %s)', [started])
+        self._checked_at = None
+        self._count('refreshes')
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        counters['enabled'] = self.enabled
+        counters['shared_state'] = self.shared_state
+        counters['lag'] = self.lag()
+        return counters
+
+
+replica = Replica.from_settings()
+metrics.register('replica', replica.stats)
+
+
+##################
+# ROUTER SECTION #
+##################
+class ReplicaRouter:
+    """
+    Sends the reads of requests allowed to use the replica there, everything else to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        route = _route.get()
+        if route is None or not route.replica:
+            return DEFAULT_DB_ALIAS
+        if route.wrote:
+            replica._count('sticky_reads')
+            return DEFAULT_DB_ALIAS
+        route.replica_synced_at = replica.synced_at()
+        replica._count('replica_reads')
+        return replica.alias
+
+    def db_for_write(self, model, **hints):
+        route = _route.get()
+        if route is not None:
+            route.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary, schema included
+        return db != replica.alias
+
+
+######################
+# MIDDLEWARE SECTION #
+######################
+class ReplicaMiddleware:
+    """
+    Tracks the writes of each request, so the next reads of the same user stay on the primary.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        route = Route()
+        token = _route.set(route)
+        try:
+            response = self.get_response(request)
+        finally:
+            _route.reset(token)
+
+        if route.wrote:
+            replica.record_write(getattr(request, 'user', None))
+        return response
+
+    async def __acall__(self, request):
+        route = Route()
+        token = _route.set(route)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _route.reset(token)
+
+        if route.wrote:
+            await sync_to_async(replica.record_write)(getattr(request, 'user', None))
+        return response
+
+
+def _own_route():
+    # Views called without the middleware (e.g. in tests) get their own route
+    return _route.set(Route()) if _route.get() is None else None
+
+
+def reads_from_replica(func):
+    """
+    View decorator letting the GET and HEAD requests of a view read from the replica (see Replica).
+    Goes under @api_view (or async_api_view), so the user is authenticated by the time it runs.
+    """
+    if iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapped(request, *args, **kwargs):
+            if request.method not in READ_METHODS or not replica.enabled:
+                return await func(request, *args, **kwargs)
+
+            token = _own_route()
+            try:
+                _route.get().replica = await sync_to_async(replica.readable_by)(request.user)
+                return await func(request, *args, **kwargs)
+            finally:
+                if token is not None:
+                    _route.reset(token)
+        return wrapped
+
+    @wraps(func)
+    def wrapped(request, *args, **kwargs):
+        if request.method not in READ_METHODS or not replica.enabled:
+            return func(request, *args, **kwargs)
+
+        token = _own_route()
+        try:
+            _route.get().replica = replica.readable_by(request.user)
+            return func(request, *args, **kwargs)
+        finally:
+            if token is not None:
+                _route.reset(token)
+    return wrapped
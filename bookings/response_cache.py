@@ -0,0 +1,154 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import hashlib
+import threading
+import uuid
+from functools import wraps
+from urllib.parse import urlencode
+# Django Libraries
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+# Django Rest Framework Libraries
+from rest_framework import status
+from rest_framework.response import Response
+# Project Libraries
+from bookings import metrics
+from bookings.async_api import json_response
+from bookings.replica import replica
+
+
+#################
+# CACHE SECTION #
+#################
+class ResponseCache:
+    """
+    Caches the data of list GET responses, keyed on the view, the normalized
+    query string and the current version of every model the view reads.
+
+    A write to one of those models replaces the model's version token, so
+    older entries are never read again and simply age out of the backend
+    (LRU in local memory, MAX_ENTRIES culling on disk): no key scans needed.
+    Versions live in the cache backend itself, so with the shared file
+    backend every worker sees the bumps of the others.
+    """
+
+    def __init__(self, alias='responses', timeout=300):
+        self.alias = alias
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(('hits', 'misses', 'stores', 'bumps'), 0)
+        self._views = {}
+
+    @classmethod
+    def from_settings(cls):
+        return cls(timeout=getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def _count(self, name, view_name=None):
+        with self._lock:
+            self._counters[name] += 1
+            if view_name is not None:
+                self._views.setdefault(view_name, {'hits': 0, 'misses': 0})[name] += 1
+
+    def version(self, model_name):
+        """
+        :return: The current version token of a model, created on first use.
+        """
+        key = f'version:{model_name}'
+        token = self.backend.get(key)
+        if token is None:
+            self.backend.add(key, uuid.uuid4().hex, timeout=None)
+            token = self.backend.get(key)
+        return token
+
+    def bump(self, *model_names):
+        """
+        Invalidates every entry built from these models.
+
+        Bumped right away, so the writing transaction stops reading older
+        entries, and again once it commits: in between, a concurrent reader
+        may have cached the pre-commit rows under the first new version.
+        """
+        def replace_tokens():
+            self.backend.set_many({f'version:{name}': uuid.uuid4().hex for name in model_names}, timeout=None)
+            self._count('bumps')
+
+        replace_tokens()
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(replace_tokens)
+
+    def key(self, view_name, model_names, params):
+        query = urlencode(sorted((name, value) for name in params for value in params.getlist(name)))
+        versions = ':'.join(self.version(name) for name in model_names)
+        return f'response:{view_name}:{versions}:{hashlib.sha1(query.encode()).hexdigest()}'
+
+    def _lookup(self, view_name, model_names, params):
+        key = self.key(view_name, model_names, params)
+        data = self.backend.get(key)
+        self._count('misses' if data is None else 'hits', view_name)
+        return key, data
+
+    def _store(self, key, response):
+        if (getattr(response, 'data', None) is not None and response.status_code == status.HTTP_200_OK
+                and not replica.behind_writes()):
+            self.backend.set(key, response.data, timeout=self.timeout)
+            self._count('stores')
+
+    def cached(self, view_name, model_names):
+        """
+        Decorator serving GET requests of a list view from the cache; other methods pass through.
+        Only 200 responses are stored, and not when they were read from a replica missing a later write.
+        Works on sync and async views, which share the entries of a view name.
+        """
+        def decorator(func):
+            if iscoroutinefunction(func):
+                @wraps(func)
+                async def wrapped(request, *args, **kwargs):
+                    if request.method != 'GET':
+                        return await func(request, *args, **kwargs)
+
+                    # The backend may do file I/O, keep it off the event loop
+                    key, data = await sync_to_async(self._lookup)(view_name, model_names, request.GET)
+                    if data is not None:
+                        return json_response(data)
+                    response = await func(request, *args, **kwargs)
+                    await sync_to_async(self._store)(key, response)
+                    return response
+                return wrapped
+
+            @wraps(func)
+            def wrapped(request, *args, **kwargs):
+                if request.method != 'GET':
+                    return func(request, *args, **kwargs)
+
+                key, data = self._lookup(view_name, model_names, request.GET)
+                if data is not None:
+                    return Response(data)
+                response = func(request, *args, **kwargs)
+                self._store(key, response)
+                return response
+            return wrapped
+        return decorator
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            counters['views'] = {name: dict(view) for name, view in self._views.items()}
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_rate'] = round(counters['hits'] / lookups, 4) if lookups else None
+        counters['backend'] = self.backend.__class__.__name__
+        return counters
+
+
+#####################
+# SINGLETON SECTION #
+#####################
+response_cache = ResponseCache.from_settings()
+metrics.register('response_cache', response_cache.stats)
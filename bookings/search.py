@@ -0,0 +1,127 @@
+###################
+# IMPORTS SECTION #
+###################
+# Django Libraries
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+# FTS5 table indexing the Booking contact columns, kept in sync by triggers (migration 0006)
+SEARCH_TABLE = 'bookings_booking_search'
+BOOKING_TABLE = 'bookings_booking'
+# The trigram tokenizer cannot use its index for shorter terms
+MIN_TERM_LENGTH = 3
+# Query parameter / model field -> indexed column
+SEARCH_COLUMNS = {
+    'customerName': 'customer_name',
+    'customerEmail': 'customer_email',
+    'customerPhone': 'customer_phone',
+}
+
+_available = {}
+
+
+###################
+# HELPERS SECTION #
+###################
+def is_available(using='default'):
+    """
+    :return: Whether the FTS5 side index exists on the given database (SQLite with trigram support only).
+    """
+    connection = connections[using]
+    key = (using, connection.settings_dict['NAME'])
+    if key not in _available:
+        if connection.vendor != 'sqlite':
+            _available[key] = False
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SEARCH_TABLE])
+                _available[key] = cursor.fetchone() is not None
+    return _available[key]
+
+
+def _indexable(value):
+    # LIKE wildcards would need an ESCAPE clause, which the trigram index does not support
+    return len(value) >= MIN_TERM_LENGTH and '%' not in value and '_' not in value
+
+
+def match_expression(text):
+    """
+    Turns free text into an FTS5 query: every term long enough to be indexed, quoted, all required.
+    :return: The MATCH expression, or None if no term can use the index.
+    """
+    terms = [term for term in text.split() if len(term) >= MIN_TERM_LENGTH]
+    if not terms:
+        return None
+    return ' AND '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def _matching_ids(where, params):
+    return RawSQL(
+        f'SELECT {BOOKING_TABLE}.id FROM {SEARCH_TABLE} '
+        f'JOIN {BOOKING_TABLE} ON {BOOKING_TABLE}.rowid = {SEARCH_TABLE}.rowid WHERE {where}',
+        params
+    )
+
+
+##################
+# SEARCH SECTION #
+##################
+def filter_contains(queryset, field, value):
+    """
+    Case-insensitive substring filter on one of the Booking contact fields.
+
+    Served by the trigram index when possible, otherwise falls back to the
+    historic icontains (a LIKE full scan).
+    """
+    if not _indexable(value) or not is_available(queryset.db):
+        return queryset.filter(**{f'{field}__icontains': value})
+
+    column = SEARCH_COLUMNS[field]
+    return queryset.filter(id__in=_matching_ids(f'{SEARCH_TABLE}.{column} LIKE %s', (f'%{value}%',)))
+
+
+def search(queryset, text):
+    """
+    Full-text search over name, email and phone, best matches (bm25) first.
+
+    Every term must appear in one of the fields. Terms of at least three
+    characters go through the index; shorter ones (or all of them, without
+    the index) fall back to icontains and leave the results unranked.
+    """
+    expression = match_expression(text) if is_available(queryset.db) else None
+
+    for term in text.split():
+        if expression is None or len(term) < MIN_TERM_LENGTH:
+            queryset = queryset.filter(
+                Q(customerName__icontains=term) | Q(customerEmail__icontains=term) | Q(customerPhone__icontains=term)
+            )
+    if expression is None:
+        return queryset
+
+    # The index joined once: SQLite runs the MATCH as the outer loop, each match computing its rank
+    # once and reaching its booking by rowid
+    return (
+        queryset
+        .extra(
+            select={'search_rank': f'{SEARCH_TABLE}.rank'},
+            tables=[SEARCH_TABLE],
+            where=[f'{SEARCH_TABLE} MATCH %s', f'{SEARCH_TABLE}.rowid = {BOOKING_TABLE}.rowid'],
+            params=[expression],
+        )
+        .order_by('search_rank', 'id')
+    )
+
+
+def rebuild_index(using='default'):
+    """
+    Repopulates the side index from the bookings table and merges its segments.
+    Needed after VACUUM, which may renumber the rowids the index is keyed on.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
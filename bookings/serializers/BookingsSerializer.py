@@ -1,8 +1,16 @@
 ###################
 # IMPORTS SECTION #
 ###################
+from django.db import connection, transaction
 from rest_framework import serializers
-from bookings.models import Booking
+from bookings.availability import NON_BLOCKING_STATE, conflicting_bookings
+from bookings.models import Booking, Room
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+ROOM_TAKEN_MESSAGE = 'This room is already booked for these dates.'
 
 
 #######################
@@ -14,3 +22,49 @@ class BookingSerializer(serializers.ModelSerializer):
     class Meta:
         model = Booking
         fields = '__all__'
+
+    def validate(self, attrs):
+        """
+        Rejects a booking holding a room already held by another booking for overlapping dates.
+        """
+        def current(name):
+            return attrs[name] if name in attrs else getattr(self.instance, name, None)
+
+        self._check_room(current('room'), current('startDate'), current('endDate'), current('state'), self.instance)
+        return attrs
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            self._lock_room(validated_data.get('room'))
+            booking = super().create(validated_data)
+            self._check_saved(booking)
+        return booking
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            self._lock_room(validated_data.get('room', instance.room))
+            booking = super().update(instance, validated_data)
+            self._check_saved(booking)
+        return booking
+
+    @staticmethod
+    def _check_room(room, start, end, state, booking=None):
+        if room is not None and start and end and state != NON_BLOCKING_STATE:
+            conflicts = conflicting_bookings(room, start, end)
+            if booking is not None:
+                conflicts = conflicts.exclude(pk=booking.pk)
+            if conflicts.exists():
+                raise serializers.ValidationError({'room': [ROOM_TAKEN_MESSAGE]})
+
+    @staticmethod
+    def _lock_room(room):
+        # Concurrent bookings of the room wait for this one; SQLite has no row locks but takes
+        # its write lock with the save, before _check_saved() reads
+        if room is not None and connection.features.has_select_for_update:
+            list(Room.objects.select_for_update().filter(pk=room.pk).values_list('pk'))
+
+    def _check_saved(self, booking):
+        """
+        The validate() check again, once saved: a booking committed since then rolls this one back.
+        """
+        self._check_room(booking.room, booking.startDate, booking.endDate, booking.state, booking)
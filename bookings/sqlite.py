@@ -0,0 +1,142 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import random
+import threading
+import time
+# Django Libraries
+from django.conf import settings
+from django.db import OperationalError
+from django.db.backends.signals import connection_created
+# Project Libraries
+from bookings import metrics
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+PROFILES = ('tuned', 'default')
+# Rows sampled per index by ANALYZE when run through PRAGMA optimize, keeps it in the milliseconds
+ANALYSIS_LIMIT = 400
+
+
+#################
+# TUNER SECTION #
+#################
+class SQLiteTuner:
+    """
+    Connection setup layer for the SQLite backend, installed by BookingsConfig.ready.
+
+    With the 'tuned' profile, every new connection gets:
+    - the SQLITE_PRAGMAS profile (WAL journal, synchronous, busy_timeout, mmap_size,
+      cache_size, temp_store), so readers no longer block writers and the other way round;
+    - an execute wrapper retrying "database is locked" errors with exponential backoff
+      and jitter. Only statements that cannot be part of a half done transaction are
+      retried: autocommit statements and the BEGIN opening an atomic block;
+    - a bounded "PRAGMA optimize" (which runs ANALYZE where the statistics are stale)
+      on the first connection of the process, then at most every optimize_interval seconds.
+
+    The 'default' profile leaves SQLite's defaults untouched, for comparison.
+    """
+
+    def __init__(self, profile='tuned', pragmas=None, lock_retries=5, retry_delay=0.05, optimize_interval=3600):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown SQLite profile {profile!r}, expected one of {PROFILES}")
+
+        self.profile = profile
+        self.pragmas = dict(pragmas or {})
+        self.lock_retries = lock_retries
+        self.retry_delay = retry_delay
+        self.optimize_interval = optimize_interval
+
+        self._next_optimize = 0.0
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(('connections', 'lock_retries', 'lock_failures', 'optimizations'), 0)
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            profile=getattr(settings, 'SQLITE_PROFILE', 'tuned'),
+            pragmas=getattr(settings, 'SQLITE_PRAGMAS', {}),
+            lock_retries=getattr(settings, 'SQLITE_LOCK_RETRIES', 5),
+            retry_delay=getattr(settings, 'SQLITE_LOCK_RETRY_DELAY', 0.05),
+            optimize_interval=getattr(settings, 'SQLITE_OPTIMIZE_INTERVAL', 3600),
+        )
+
+    @property
+    def enabled(self):
+        return self.profile == 'tuned'
+
+    def install(self):
+        """
+        Hooks the tuner into every connection opened from now on in this process.
+        """
+        connection_created.connect(self.connection_created, dispatch_uid='bookings.sqlite')
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def connection_created(self, sender, connection, **kwargs):
+        """
+        connection_created receiver: applies the pragma profile and installs the retry wrapper.
+        """
+        if connection.vendor != 'sqlite' or not self.enabled:
+            return
+
+        with connection.cursor() as cursor:
+            for name, value in self.pragmas.items():
+                cursor.execute(f'PRAGMA {name} = {value}')
+        if self.lock_retries and self.retry_locked not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self.retry_locked)
+        self._count('connections')
+
+        with self._lock:
+            due = time.monotonic() >= self._next_optimize
+            if due:
+                self._next_optimize = time.monotonic() + self.optimize_interval
+        if due:
+            self.optimize(connection)
+
+    def optimize(self, connection, full=False):
+        """
+        Refreshes the query planner statistics.
+        :param full: Run a complete ANALYZE instead of the bounded PRAGMA optimize, e.g. after a bulk load.
+        """
+        with connection.cursor() as cursor:
+            if full:
+                cursor.execute('ANALYZE')
+            else:
+                cursor.execute(f'PRAGMA analysis_limit = {ANALYSIS_LIMIT}')
+            cursor.execute('PRAGMA optimize')
+        self._count('optimizations')
+
+    def retry_locked(self, execute, sql, params, many, context):
+        """
+        Execute wrapper retrying lock errors with backoff (see connection.execute_wrapper).
+        """
+        connection = context['connection']
+        attempt = 0
+        while True:
+            try:
+                return execute(sql, params, many, context)
+            except OperationalError as error:
+                # Inside a transaction the earlier statements are lost with the lock, let it fail
+                retryable = connection.get_autocommit() or sql.lstrip().upper().startswith('BEGIN')
+                if 'locked' not in str(error) or not retryable:
+                    raise
+                if attempt >= self.lock_retries:
+                    self._count('lock_failures')
+                    raise
+                self._count('lock_retries')
+                time.sleep(self.retry_delay * (2 ** attempt) * random.uniform(0.5, 1.5))
+                attempt += 1
+
+    def stats(self):
+        with self._lock:
+            return {'profile': self.profile, **self._counters}
+
+
+sqlite_tuner = SQLiteTuner.from_settings()
+metrics.register('sqlite', sqlite_tuner.stats)
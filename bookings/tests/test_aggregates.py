@@ -0,0 +1,98 @@
+###################
+# IMPORTS SECTION #
+###################
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from bookings import aggregates
+from bookings.models import Hotel, HotelPriceAggregate, Room, RoomPriceTotals
+from bookings.views import high_end_hotels_stats_view
+
+
+#################
+# TESTS SECTION #
+#################
+class TestHotelPriceAggregates(TestCase):
+    def setUp(self):
+        self.cheap = Hotel.objects.create(name="Cheap", address="Street 1", rating=3.0)
+        self.fancy = Hotel.objects.create(name="Fancy", address="Street 2", rating=4.5)
+        Room.objects.create(number=1, hotel=self.cheap, price_per_night=Decimal('50.00'), capacity=2)
+        Room.objects.create(number=2, hotel=self.cheap, price_per_night=Decimal('70.00'), capacity=1)
+        self.suite = Room.objects.create(number=1, hotel=self.fancy, price_per_night=Decimal('300.00'), capacity=4)
+
+    def assertNoDrift(self):
+        drift = aggregates.find_drift()
+        self.assertEqual(drift, {'missing': [], 'stale': [], 'extra': [], 'totals': False})
+
+    def test_single_writes_keep_aggregates_in_sync(self):
+        aggregate = HotelPriceAggregate.objects.get(hotel=self.cheap)
+        self.assertEqual((aggregate.room_count, aggregate.total_capacity, aggregate.avg_price), (2, 3, Decimal('60.00')))
+
+        # Moving a room to another hotel updates both hotels
+        self.suite.hotel = self.cheap
+        self.suite.number = 3
+        self.suite.save()
+        self.assertFalse(HotelPriceAggregate.objects.filter(hotel=self.fancy).exists())
+        self.assertNoDrift()
+
+        Room.objects.get(number=1, hotel=self.cheap, capacity=2).delete()
+        self.assertNoDrift()
+
+    def test_bulk_writes_keep_aggregates_in_sync(self):
+        Room.objects.bulk_create([Room(number=n, hotel=self.fancy, price_per_night=100.5) for n in range(2, 6)])
+        self.assertNoDrift()
+
+        Room.objects.filter(hotel=self.fancy).update(price_per_night=Decimal('10.00'))
+        self.assertNoDrift()
+
+        Hotel.objects.filter(pk=self.fancy.pk).update(rating=1.0)
+        self.assertNoDrift()
+
+        Room.objects.filter(number__gte=4).delete()
+        self.assertNoDrift()
+
+        Hotel.objects.filter(pk=self.cheap.pk).delete()
+        self.assertNoDrift()
+        self.assertEqual(RoomPriceTotals.load().room_count, Room.objects.count())
+
+    def test_conflicting_bulk_create_only_recomputes_its_hotels(self):
+        # Drift on a hotel the write does not touch stays there: it is not recomputed
+        HotelPriceAggregate.objects.filter(hotel=self.cheap).update(room_count=10)
+        Room.objects.bulk_create(
+            [Room(number=1, hotel=self.fancy, price_per_night=Decimal('500.00'), capacity=4),
+             Room(number=2, hotel=self.fancy, price_per_night=Decimal('100.00'), capacity=2)],
+            update_conflicts=True, unique_fields=['number', 'hotel'], update_fields=['price_per_night'],
+        )
+        self.assertEqual(aggregates.find_drift(), {'missing': [], 'stale': [self.cheap.pk], 'extra': [], 'totals': False})
+        self.assertEqual(HotelPriceAggregate.objects.get(hotel=self.fancy).avg_price, Decimal('300.00'))
+
+    def test_totals_are_moved_in_one_query(self):
+        with self.assertNumQueries(1):
+            aggregates.adjust_totals(Decimal('10.00'), 1)
+        self.assertEqual(RoomPriceTotals.objects.get().room_count, 4)
+
+    def test_rebuild_repairs_drift(self):
+        HotelPriceAggregate.objects.filter(hotel=self.cheap).update(room_count=10)
+        RoomPriceTotals.objects.update(room_count=0)
+        self.assertEqual(aggregates.find_drift()['stale'], [self.cheap.pk])
+
+        aggregates.rebuild()
+        self.assertNoDrift()
+
+    def test_stats_view_uses_aggregates(self):
+        response = high_end_hotels_stats_view(APIRequestFactory().get('/loadtest/high_end_hotels_stats_view'))
+        self.assertEqual([row['name'] for row in response.data], ["Fancy"])
+        self.assertEqual(response.data[0]['avg_price'], Decimal('300.00'))
+        self.assertEqual(response.data[0]['total_capacity'], 4)
+
+    def test_stats_view_compares_averages_at_the_same_precision(self):
+        Hotel.objects.all().delete()
+        # Global average 10.0033.., rounded to 10.00 like the hotels' 10.005 and 10.00
+        above = Hotel.objects.create(name="Above", address="Street 3", rating=3.0)
+        level = Hotel.objects.create(name="Level", address="Street 4", rating=3.0)
+        Room.objects.create(number=1, hotel=above, price_per_night=Decimal('10.00'), capacity=1)
+        Room.objects.create(number=2, hotel=above, price_per_night=Decimal('10.01'), capacity=1)
+        Room.objects.create(number=1, hotel=level, price_per_night=Decimal('10.00'), capacity=1)
+
+        response = high_end_hotels_stats_view(APIRequestFactory().get('/loadtest/high_end_hotels_stats_view'))
+        self.assertEqual([row['name'] for row in response.data], ["Above"])
@@ -0,0 +1,94 @@
+###################
+# IMPORTS SECTION #
+###################
+from datetime import date
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from bookings.models import Booking, BookingUser, Hotel, Room
+
+
+#################
+# TESTS SECTION #
+#################
+class TestAsyncViews(TestCase):
+    def setUp(self):
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+        self.token = Token.objects.create(user=self.user)
+
+        self.hotel = Hotel.objects.create(name="Grand", address="Street 1", rating=4)
+        Hotel.objects.create(name="Plaza", address="Street 2", rating=5)
+        room = Room.objects.create(number=7, hotel=self.hotel, price_per_night=99, capacity=2)
+        for day in range(1, 4):
+            Booking.objects.create(
+                customerName=f"Guest {day}", customerEmail="guest@mail.com", customerPhone="0700000000",
+                startDate=date(2025, 1, day), endDate=date(2025, 1, day + 2), room=room,
+            )
+
+    def get(self, path, params=None, headers=None):
+        # AsyncClient does not send client-wide headers, only per request ones
+        headers = {'Authorization': f'Token {self.token.key}', **(headers or {})}
+        return self.async_client.get(path, params, headers=headers)
+
+    def sync_get(self, path, params):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client.get(path, params)
+
+    async def test_requires_credentials(self):
+        response = await AsyncClient().get('/async/hotels/')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+        response = await AsyncClient().get('/async/hotels/', headers={'Authorization': 'Token wrong'})
+        self.assertEqual(response.status_code, 401)
+
+        # HEAD stays public, as on the sync endpoint
+        self.assertEqual((await AsyncClient().head('/async/bookings/')).status_code, 200)
+
+    async def test_lists_match_the_sync_views(self):
+        for path, params in [
+            ('/bookings/', {'limit': 2, 'ordering': '-startDate'}),
+            ('/bookings/', {'cursor': '', 'limit': 2, 'fields': 'id,customerName'}),
+            ('/hotels/', {'limit': 10, 'ordering': 'rating'}),
+            ('/rooms/', {'limit': 10, 'hotel_id': str(self.hotel.pk)}),
+        ]:
+            response = await self.get(f'/async{path}', params)
+            self.assertEqual(response.status_code, 200)
+            expected = await sync_to_async(self.sync_get)(path, params)
+            self.assertEqual(response.content, expected.content)
+
+    async def test_cursor_walk(self):
+        names, cursor = [], ''
+        while cursor is not None:
+            data = (await self.get('/async/bookings/', {'cursor': cursor, 'limit': 2})).json()
+            names += [row['customerName'] for row in data['results']]
+            cursor = data['next_cursor']
+        self.assertEqual(names, ["Guest 1", "Guest 2", "Guest 3"])
+
+    async def test_detail_is_conditional(self):
+        response = await self.get(f'/async/hotels/{self.hotel.pk}/', {'fields': 'name'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'name': "Grand"})
+
+        etag = response['ETag']
+        response = await self.get(f'/async/hotels/{self.hotel.pk}/', {'fields': 'name'}, {'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        booking = await Booking.objects.afirst()
+        response = await self.get(f'/async/bookings/{booking.pk}/')
+        self.assertEqual(response.json()['customerName'], booking.customerName)
+
+        missing = await self.get(f'/async/rooms/{self.user.pk}/')
+        self.assertEqual(missing.status_code, 404)
+
+    async def test_invalid_requests(self):
+        response = await self.get('/async/rooms/', {'fields': 'secret'})
+        self.assertEqual(response.status_code, 400)
+        response = await self.get('/async/bookings/', {'ordering': 'customerEmail'})
+        self.assertEqual(response.status_code, 400)
+
+        response = await self.async_client.post('/async/hotels/', {'name': "Ritz"})
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response['Allow'], 'GET')
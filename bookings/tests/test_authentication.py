@@ -0,0 +1,127 @@
+###################
+# IMPORTS SECTION #
+###################
+import tempfile
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from bookings.authentication import CachedTokenAuthentication, TokenCache, token_cache
+from bookings.models import BookingUser
+
+
+#################
+# TESTS SECTION #
+#################
+class TestCachedTokenAuthentication(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+        self.token = Token.objects.create(user=self.user)
+        self.counters = token_cache.stats()
+
+    def counted(self, name):
+        # Since setUp, the counters being process-wide
+        return token_cache.stats()[name] - self.counters[name]
+
+    def authenticate(self, key=None):
+        request = RequestFactory().get('/', headers={'Authorization': f'Token {key or self.token.key}'})
+        return CachedTokenAuthentication().authenticate(request)
+
+    def test_token_is_read_once(self):
+        with self.assertNumQueries(1):
+            user, token = self.authenticate()
+        with self.assertNumQueries(0):
+            cached_user, cached_token = self.authenticate()
+        self.assertEqual((cached_user, cached_user.role, cached_token), (user, 'user', token))
+        self.assertIs(cached_token.user, cached_user)
+
+        # Every request gets its own copy
+        cached_user.first_name = "Changed"
+        self.assertEqual(self.authenticate()[0].first_name, "")
+        self.assertEqual((self.counted('hits'), self.counted('misses')), (2, 1))
+
+        self.assertEqual(self.client.get('/files/', headers={'Authorization': f'Token {token.key}'}).status_code, 200)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate('wrong')
+
+    def test_writes_invalidate(self):
+        self.authenticate()
+        self.user.role = 'admin'
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate()[0].role, 'admin')
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+        self.user.is_active = True
+        self.user.save()
+        self.authenticate()
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_async_views_share_the_cache(self):
+        headers = {'Authorization': f'Token {self.token.key}'}
+        self.assertEqual(self.client.get('/async/hotels/', headers=headers).status_code, 200)
+        self.assertEqual(self.client.get('/async/hotels/', headers=headers).status_code, 200)
+        self.assertEqual((self.counted('hits'), self.counted('misses')), (1, 1))
+
+
+class TestTokenCache(TestCase):
+    def setUp(self):
+        self.now = 0
+        self.cache = TokenCache(max_size=2, ttl=10, clock=lambda: self.now)
+        self.tokens = [
+            Token.objects.create(user=BookingUser.objects.create_user(username=f"user{index}"))
+            for index in range(3)
+        ]
+
+    def test_size_and_age_bounds(self):
+        for token in self.tokens:
+            self.cache.put(token, self.cache.snapshot())
+        # Least recently used first out
+        self.assertIsNone(self.cache.get(self.tokens[0].key))
+        self.assertIsNotNone(self.cache.get(self.tokens[1].key))
+
+        self.now = 10
+        self.assertIsNone(self.cache.get(self.tokens[1].key))
+        self.assertEqual(
+            {name: self.cache.stats()[name] for name in ('hits', 'misses', 'expired', 'evictions', 'size', 'hit_rate')},
+            {'hits': 1, 'misses': 2, 'expired': 1, 'evictions': 1, 'size': 1, 'hit_rate': 0.3333},
+        )
+
+    def test_lookup_overtaken_by_a_write_is_not_stored(self):
+        snapshot = self.cache.snapshot()
+        self.cache.invalidate(user_id=self.tokens[0].user_id)
+        self.cache.put(self.tokens[0], snapshot)
+        self.assertIsNone(self.cache.get(self.tokens[0].key))
+
+    def test_writes_reach_the_other_processes(self):
+        # Two aliases on one directory stand in for two workers' file caches
+        with tempfile.TemporaryDirectory() as directory:
+            backend = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory}
+            with override_settings(CACHES={'default': backend, 'worker1': backend, 'worker2': backend}):
+                writer = TokenCache(ttl=10, shared_cache='worker1')
+                reader = TokenCache(ttl=10, shared_cache='worker2', clock=lambda: self.now, refresh_interval=1)
+                for token in self.tokens[:2]:
+                    reader.put(token, reader.snapshot())
+                self.assertIsNotNone(reader.get(self.tokens[0].key))
+
+                # Seen once the last write time is read again
+                writer.invalidate(user_id=self.tokens[0].user_id)
+                self.assertIsNotNone(reader.get(self.tokens[0].key))
+                self.now = 1
+                self.assertIsNone(reader.get(self.tokens[0].key))
+                self.assertIsNotNone(reader.get(self.tokens[1].key))
+                writer.invalidate(key=self.tokens[1].key, user_id=None)
+                self.now = 2
+                self.assertIsNone(reader.get(self.tokens[1].key))
+
+                # Read again after the write, the shared cache is not read until the next one
+                reader.put(self.tokens[0], reader.snapshot())
+                self.assertIsNotNone(reader.get(self.tokens[0].key))
+                self.assertEqual({name: reader.stats()[name] for name in ('revoked', 'refreshes')},
+                                 {'revoked': 2, 'refreshes': 3})
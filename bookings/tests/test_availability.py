@@ -0,0 +1,80 @@
+###################
+# IMPORTS SECTION #
+###################
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIRequestFactory, force_authenticate
+from bookings.models import Booking, BookingUser, Hotel, Room
+from bookings.serializers import BookingSerializer
+from bookings.views import room_availability
+
+
+#################
+# TESTS SECTION #
+#################
+class TestRoomAvailability(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+        self.hotel = Hotel.objects.create(name="Grand", address="Street 1", rating=4.0)
+        self.single = Room.objects.create(number=1, hotel=self.hotel, price_per_night=Decimal('50.00'), capacity=1)
+        self.double = Room.objects.create(number=2, hotel=self.hotel, price_per_night=Decimal('80.00'), capacity=2)
+        self.suite = Room.objects.create(number=3, hotel=self.hotel, price_per_night=Decimal('200.00'), capacity=4)
+        self.book(self.double, date(2025, 3, 10), date(2025, 3, 15))
+        self.book(self.suite, date(2025, 3, 1), date(2025, 3, 31), state=Booking.BookingState.CANCELLED)
+
+    def book(self, room, start, end, state=Booking.BookingState.CONFIRMED):
+        return Booking.objects.create(
+            customerName="Ion", customerEmail="ion@mail.com", customerPhone="0700000000",
+            startDate=start, endDate=end, state=state, room=room,
+        )
+
+    def available(self, **params):
+        request = self.factory.get('/availability/', params)
+        force_authenticate(request, user=self.user)
+        return room_availability(request)
+
+    def test_overlapping_bookings_block_rooms(self):
+        response = self.available(start_date='2025-03-14', end_date='2025-03-16', hotel=self.hotel.pk)
+        self.assertEqual([room['number'] for room in response.data['results']], [1, 3])
+
+        # Check-out day is free again
+        response = self.available(start_date='2025-03-15', end_date='2025-03-16', min_capacity=2)
+        self.assertEqual(sorted(room['number'] for room in response.data['results']), [2, 3])
+
+    def test_invalid_ranges(self):
+        self.assertEqual(self.available(start_date='2025-03-14').status_code, 400)
+        self.assertEqual(self.available(start_date='2025-03-14', end_date='2025-03-14').status_code, 400)
+
+    def test_serializer_rejects_double_booking(self):
+        data = {
+            'customerName': "Ana", 'customerEmail': "ana@mail.com", 'customerPhone': "0711111111",
+            'startDate': '2025-03-12', 'endDate': '2025-03-20', 'room': str(self.double.pk),
+        }
+        serializer = BookingSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('room', serializer.errors)
+
+        self.assertTrue(BookingSerializer(data={**data, 'room': str(self.suite.pk)}).is_valid())
+        booking = Booking.objects.get(room=self.double)
+        self.assertTrue(BookingSerializer(booking, data={'endDate': '2025-03-16'}, partial=True).is_valid())
+
+    def test_bookings_validated_together_are_saved_once(self):
+        # Both validated before either is saved, as two concurrent requests are
+        data = {
+            'customerName': "Ana", 'customerEmail': "ana@mail.com", 'customerPhone': "0711111111",
+            'startDate': '2025-04-01', 'endDate': '2025-04-05', 'room': str(self.single.pk),
+        }
+        first, second = BookingSerializer(data=data), BookingSerializer(data={**data, 'customerName': "Ion"})
+        moved = BookingSerializer(Booking.objects.get(room=self.double), data={'room': str(self.single.pk),
+                                  'startDate': '2025-04-03', 'endDate': '2025-04-04'}, partial=True)
+        self.assertTrue(first.is_valid() and second.is_valid() and moved.is_valid())
+
+        first.save()
+        for serializer in (second, moved):
+            with self.assertRaises(ValidationError):
+                serializer.save()
+        self.assertEqual(list(Booking.objects.filter(room=self.single).values_list('customerName', flat=True)), ["Ana"])
+        self.assertEqual(Booking.objects.get(pk=moved.instance.pk).room, self.double)
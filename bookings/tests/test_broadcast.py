@@ -0,0 +1,84 @@
+###################
+# IMPORTS SECTION #
+###################
+import asyncio
+import json
+import time
+from datetime import date
+from asgiref.testing import ApplicationCommunicator
+from channels.layers import get_channel_layer
+from django.test import SimpleTestCase, override_settings
+from bookings.broadcast import Broadcaster, broadcaster
+from bookings.consumer import BookingConsumer
+from bookings.live import live_queries, row_of
+from bookings.models import Booking
+
+
+#################
+# TESTS SECTION #
+#################
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class TestBookingBroadcast(SimpleTestCase):
+    async def connect(self, query=b''):
+        communicator = ApplicationCommunicator(BookingConsumer.as_asgi(), {
+            'type': 'websocket', 'path': '/ws/bookings/', 'query_string': query, 'headers': [], 'subprotocols': [],
+        })
+        await communicator.send_input({'type': 'websocket.connect'})
+        self.assertEqual((await communicator.receive_output(1))['type'], 'websocket.accept')
+        return communicator
+
+    async def frame(self, communicator):
+        return json.loads((await communicator.receive_output(1))['text'])
+
+    async def publish(self, index):
+        # A booking insert, as bookings.live sends it once committed
+        booking = Booking(customerName=f'Customer {index}', customerEmail='c@example.com', customerPhone='0711',
+                          startDate=date(2025, 4, 2), endDate=date(2025, 4, 3))
+        await get_channel_layer().group_send(live_queries.group, {
+            'type': 'booking_change', 'before': None, 'after': row_of(booking), 'data': {'id': index},
+            'sent': time.time(),
+        })
+
+    async def test_every_client_gets_the_encoded_event(self):
+        clients = [await self.connect(), await self.connect()]
+        await self.publish(1)
+        await self.publish(2)
+
+        for client in clients:
+            self.assertEqual(await self.frame(client), {'new_booking': {'id': 1}})
+            self.assertEqual(await self.frame(client), {'new_booking': {'id': 2}})
+            await client.send_input({'type': 'websocket.disconnect', 'code': 1000})
+            await client.wait()
+        self.assertIsNotNone(broadcaster.stats()['latency_ms'])
+
+    async def test_batch_clients_get_coalesced_frames(self):
+        client = await self.connect(b'batch=1')
+        for index in range(3):
+            await self.publish(index)
+
+        self.assertEqual(await self.frame(client), {'batch': [{'new_booking': {'id': index}} for index in range(3)]})
+        self.assertTrue(await client.receive_nothing(0.1))
+        await client.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await client.wait()
+
+
+class TestOutbox(SimpleTestCase):
+    async def test_slow_connection_merges_then_drops(self):
+        written, release = [], asyncio.Event()
+
+        async def slow_send(text):
+            await release.wait()
+            written.append(json.loads(text))
+
+        publisher = Broadcaster(queue_size=2, batch_size=10, batch_interval=0)
+        outbox = publisher.outbox(slow_send, batch=True)
+        for key, state in [(1, 'PENDING'), (2, 'PENDING'), (1, 'CONFIRMED'), (3, 'PENDING')]:
+            outbox.put(publisher.message({'id': key, 'state': state}, key=key))
+        release.set()
+        await asyncio.sleep(0.05)
+        outbox.close()
+
+        # Booking 1's update replaced its pending event, then the full queue dropped it for booking 3
+        self.assertEqual(written, [{'batch': [{'id': 2, 'state': 'PENDING'}, {'id': 3, 'state': 'PENDING'}]}])
+        stats = publisher.stats()
+        self.assertEqual((stats['merged'], stats['dropped_frames'], stats['frames']), (1, 1, 1))
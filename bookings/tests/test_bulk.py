@@ -0,0 +1,126 @@
+###################
+# IMPORTS SECTION #
+###################
+from datetime import date, timedelta
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from bookings import aggregates
+from bookings.models import Booking, BookingUser, Hotel, OperationLog, Room
+from bookings.views import booking_bulk, hotel_bulk, room_bulk
+
+
+#################
+# TESTS SECTION #
+#################
+class TestBulkEndpoints(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+        self.hotel = Hotel.objects.create(name="Grand", address="Street 1", rating=4.0)
+
+    def send(self, view, method, items):
+        request = getattr(self.factory, method)('/bulk/', items, format='json')
+        force_authenticate(request, user=self.user)
+        return view(request)
+
+    def rooms(self, count, start=1):
+        return [
+            {'number': number, 'capacity': 2, 'price_per_night': '99.90', 'hotel': str(self.hotel.pk)}
+            for number in range(start, start + count)
+        ]
+
+    def test_create_uses_a_constant_number_of_queries(self):
+        with CaptureQueriesContext(connection) as few:
+            self.assertEqual(self.send(room_bulk, 'post', self.rooms(5)).status_code, 201)
+        with CaptureQueriesContext(connection) as many:
+            response = self.send(room_bulk, 'post', self.rooms(60, start=6))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(Room.objects.filter(hotel=self.hotel).count(), 65)
+        self.assertEqual(response.data[0]['hotel'], self.hotel.pk)
+        self.assertEqual(OperationLog.objects.filter(model='Room', action='CREATE').count(), 65)
+        self.assertFalse(any(aggregates.find_drift().values()))
+
+    def test_errors_are_reported_per_item_and_nothing_is_written(self):
+        Room.objects.create(number=1, hotel=self.hotel, price_per_night=Decimal('10.00'), capacity=1)
+        items = self.rooms(3) + [{'number': 9, 'capacity': 1, 'price_per_night': '1.00', 'hotel': '0' * 32}]
+        items[1]['number'] = 3
+
+        response = self.send(room_bulk, 'post', items)
+        self.assertEqual(response.status_code, 400)
+        errors = response.data['errors']
+        self.assertIn('non_field_errors', errors[0])
+        self.assertEqual(errors[1], {})
+        self.assertIn('non_field_errors', errors[2])
+        self.assertIn('hotel', errors[3])
+        self.assertEqual(Room.objects.count(), 1)
+
+        response = self.send(hotel_bulk, 'post', [
+            {'name': "Grand", 'address': "Street 2", 'rating': 3.0},
+            {'name': "Plaza", 'address': "Street 3", 'rating': 3.0},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('name', response.data['errors'][0])
+        self.assertEqual(response.data['errors'][1], {})
+
+    def test_update_and_delete(self):
+        created = self.send(hotel_bulk, 'post', [
+            {'name': f"Hotel {index}", 'address': "Street", 'rating': 2.0} for index in range(3)
+        ]).data
+
+        response = self.send(hotel_bulk, 'patch', [{'id': hotel['id'], 'rating': 5.0} for hotel in created])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Hotel.objects.filter(rating=5.0).count(), 3)
+
+        # Renaming onto an existing name is rejected
+        response = self.send(hotel_bulk, 'patch', [{'id': created[0]['id'], 'name': "Grand"}])
+        self.assertEqual(response.status_code, 400)
+
+        response = self.send(hotel_bulk, 'delete', [hotel['id'] for hotel in created] + ['0' * 32])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'][3], {'id': ['Not found.']})
+
+        response = self.send(hotel_bulk, 'delete', [hotel['id'] for hotel in created])
+        self.assertEqual(response.data, {'deleted': 3})
+        self.assertEqual(Hotel.objects.count(), 1)
+
+    def bookings(self, rooms, first_day, count):
+        return [
+            {
+                'customerName': f"Guest {index}", 'customerEmail': "guest@mail.com", 'customerPhone': "0700000000",
+                'startDate': str(first_day + timedelta(days=2 * index)),
+                'endDate': str(first_day + timedelta(days=2 * index + 2)),
+                'room': str(rooms[index % len(rooms)].pk),
+            }
+            for index in range(count)
+        ]
+
+    def test_booking_overlaps_are_checked_for_the_batch(self):
+        rooms = [Room.objects.create(number=n, hotel=self.hotel, price_per_night=10, capacity=1) for n in range(3)]
+        with CaptureQueriesContext(connection) as few:
+            self.assertEqual(self.send(booking_bulk, 'post', self.bookings(rooms, date(2025, 1, 1), 3)).status_code, 201)
+        with CaptureQueriesContext(connection) as many:
+            response = self.send(booking_bulk, 'post', self.bookings(rooms, date(2025, 3, 1), 60))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(many), len(few))
+
+        # Overlapping a stored booking, and two new ones overlapping each other
+        items = self.bookings(rooms[:1], date(2025, 1, 1), 1) + self.bookings(rooms[1:2], date(2026, 1, 1), 2)
+        items[2]['startDate'] = items[1]['startDate']
+        items.append({**items[1], 'room': str(rooms[2].pk)})
+        items.append({**items[1], 'state': Booking.BookingState.CANCELLED})
+        response = self.send(booking_bulk, 'post', items)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [list(errors) for errors in response.data['errors']], [['room'], ['room'], ['room'], [], []]
+        )
+        self.assertEqual(Booking.objects.count(), 63)
+
+        # Moving a booking within its own dates is not a conflict with its stored version
+        stored = Booking.objects.filter(room=rooms[0]).order_by('startDate').first()
+        response = self.send(booking_bulk, 'patch', [{'id': str(stored.pk), 'endDate': str(stored.endDate - timedelta(days=1))}])
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,89 @@
+###################
+# IMPORTS SECTION #
+###################
+import hashlib
+import os
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from bookings.catalog import file_catalog
+from bookings.models import BookingUser, StoredFile
+
+
+#################
+# TESTS SECTION #
+#################
+class TestFileCatalog(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name)
+        self.settings_override.enable()
+        self.client = APIClient()
+        self.client.force_authenticate(BookingUser.objects.create_user(username="tester", password="secret"))
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media.cleanup()
+
+    def upload(self, filename, content):
+        response = self.client.post(
+            f'/upload/{filename}/', {'file': SimpleUploadedFile(filename, content)}, format='multipart'
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def write(self, filename, content):
+        os.makedirs(os.path.join(self.media.name, 'uploads'), exist_ok=True)
+        with open(os.path.join(self.media.name, 'uploads', filename), 'wb') as file:
+            file.write(content)
+
+    def test_uploads_are_recorded(self):
+        self.upload('hotel.jpg', b'jpeg data')
+        stored = StoredFile.objects.get(name='hotel.jpg')
+        self.assertEqual((stored.size, stored.content_type), (9, 'image/jpeg'))
+        self.assertEqual(stored.sha256, hashlib.sha256(b'jpeg data').hexdigest())
+
+        # Same name, new content: the entry follows
+        self.upload('hotel.jpg', b'new jpeg data')
+        self.assertEqual(StoredFile.objects.get(name='hotel.jpg').size, 13)
+        self.assertEqual(file_catalog.scan(), {'added': 0, 'updated': 0, 'removed': 0})
+
+    def test_scan_reconciles_the_directory(self):
+        self.upload('kept.txt', b'kept')
+        self.upload('deleted.txt', b'deleted')
+        os.remove(os.path.join(self.media.name, 'uploads', 'deleted.txt'))
+        self.write('copied.pdf', b'copied in')
+        self.write('.partial', b'temporary')
+
+        self.assertEqual(file_catalog.scan(), {'added': 1, 'updated': 0, 'removed': 1})
+        self.assertEqual(set(StoredFile.objects.values_list('name', flat=True)), {'kept.txt', 'copied.pdf'})
+        self.assertEqual(StoredFile.objects.get(name='copied.pdf').sha256, hashlib.sha256(b'copied in').hexdigest())
+
+        # Rewritten in place
+        self.write('copied.pdf', b'copied in again')
+        os.utime(os.path.join(self.media.name, 'uploads', 'copied.pdf'), (1, 1))
+        self.assertEqual(file_catalog.scan(), {'added': 0, 'updated': 1, 'removed': 0})
+        self.assertEqual(StoredFile.objects.get(name='copied.pdf').size, 15)
+
+    def test_list_is_filtered_sorted_and_paginated(self):
+        for index in range(5):
+            self.upload(f'room{index}.jpg', b'x' * (index + 1))
+        self.upload('notes.txt', b'notes')
+
+        body = self.client.get('/files/').json()
+        self.assertEqual(body['count'], 6)
+        self.assertEqual(body['files'], ['notes.txt'] + [f'room{index}.jpg' for index in range(5)])
+        self.assertEqual(body['results'][0]['content_type'], 'text/plain')
+
+        body = self.client.get('/files/?type=image/&min_size=2&ordering=-size').json()
+        self.assertEqual(body['files'], ['room4.jpg', 'room3.jpg', 'room2.jpg', 'room1.jpg'])
+
+        names, cursor = [], ''
+        while cursor is not None:
+            body = self.client.get('/files/', {'cursor': cursor, 'limit': 4, 'ordering': '-modified'}).json()
+            names += body['files']
+            cursor = body['next_cursor']
+        self.assertEqual(sorted(names), sorted(StoredFile.objects.values_list('name', flat=True)))
+
+        self.assertEqual(self.client.get('/files/?min_size=big').status_code, 400)
+        self.assertEqual(self.client.get('/files/?ordering=sha256').status_code, 400)
@@ -0,0 +1,99 @@
+###################
+# IMPORTS SECTION #
+###################
+import asyncio
+import os
+import tempfile
+from datetime import date
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase
+from bookings.channel_layer import SQLiteChannelLayer
+
+
+#################
+# TESTS SECTION #
+#################
+class TestSQLiteChannelLayer(SimpleTestCase):
+    # Two layers on the same file stand for two worker processes
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, 'channels.sqlite3')
+        self.first = SQLiteChannelLayer(path, poll_interval=0.001)
+        self.second = SQLiteChannelLayer(path, poll_interval=0.001)
+
+    async def close_layers(self):
+        # Inside each test: the pollers run on the test's event loop
+        await self.first.close()
+        await self.second.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def receive(self, layer, channel):
+        return await asyncio.wait_for(layer.receive(channel), timeout=2)
+
+    async def test_group_send_reaches_every_process(self):
+        try:
+            local = await self.first.new_channel()
+            remote = await self.second.new_channel()
+            await self.first.group_add('booking_updates', local)
+            await self.second.group_add('booking_updates', remote)
+
+            message = {'type': 'booking.update', 'data': {'startDate': date(2025, 1, 1)}}
+            await self.first.group_send('booking_updates', message)
+
+            self.assertEqual(await self.receive(self.first, local), message)
+            self.assertEqual(
+                await self.receive(self.second, remote), {'type': 'booking.update', 'data': {'startDate': '2025-01-01'}}
+            )
+            # One row per broadcast, not per subscriber
+            self.assertEqual(self.first.stats()['published'], 1)
+        finally:
+            await self.close_layers()
+
+    async def test_specific_channels_and_remote_groups(self):
+        try:
+            remote = await self.second.new_channel()
+            await self.first.send(remote, {'type': 'hello'})
+            self.assertEqual(await self.receive(self.second, remote), {'type': 'hello'})
+
+            # Memberships of another process's channel are forwarded to it
+            await self.first.group_add('rooms', remote)
+            await asyncio.sleep(0.05)
+            await self.first.group_send('rooms', {'type': 'rooms.changed'})
+            self.assertEqual(await self.receive(self.second, remote), {'type': 'rooms.changed'})
+
+            await self.first.group_discard('rooms', remote)
+            await asyncio.sleep(0.05)
+            self.assertNotIn('rooms', self.second.groups)
+        finally:
+            await self.close_layers()
+
+    async def test_general_channel_is_delivered_once(self):
+        try:
+            receivers = [
+                asyncio.ensure_future(layer.receive('tasks')) for layer in (self.first, self.second)
+            ]
+            await asyncio.sleep(0.05)
+            await self.first.send('tasks', {'type': 'task'})
+
+            done, pending = await asyncio.wait(receivers, timeout=2, return_when=asyncio.FIRST_COMPLETED)
+            await asyncio.sleep(0.05)
+            self.assertEqual([task.result() for task in done], [{'type': 'task'}])
+            self.assertEqual(len(pending), 1)
+            for task in pending:
+                task.cancel()
+        finally:
+            await self.close_layers()
+
+    async def test_broadcast_from_another_thread(self):
+        try:
+            channel = await self.first.new_channel()
+            await self.first.group_add('booking_updates', channel)
+
+            # Like the booking generator: async_to_sync from a background thread
+            send = async_to_sync(self.first.group_send)
+            await asyncio.get_running_loop().run_in_executor(None, send, 'booking_updates', {'type': 'update'})
+            self.assertEqual(await self.receive(self.first, channel), {'type': 'update'})
+        finally:
+            await self.close_layers()
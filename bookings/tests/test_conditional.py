@@ -0,0 +1,55 @@
+###################
+# IMPORTS SECTION #
+###################
+from datetime import date
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from bookings.models import Booking, BookingUser, Hotel
+from bookings.views import booking_detail, hotel_detail
+
+
+#################
+# TESTS SECTION #
+#################
+class TestConditionalRequests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+        self.hotel = Hotel.objects.create(name="Grand", address="Street 1", rating=4.0)
+        self.booking = Booking.objects.create(
+            customerName="Ion", customerEmail="ion@mail.com", customerPhone="0700000000",
+            startDate=date(2025, 1, 1), endDate=date(2025, 1, 5),
+        )
+
+    def send(self, view, method, pk, data=None, **headers):
+        request = getattr(self.factory, method)('/detail/', data, format='json', headers=headers)
+        force_authenticate(request, user=self.user)
+        return view(request, pk=pk)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.send(hotel_detail, 'get', self.hotel.pk)['ETag']
+
+        response = self.send(hotel_detail, 'get', self.hotel.pk, If_None_Match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.send(hotel_detail, 'get', self.hotel.pk, If_None_Match=f'W/{etag}').status_code, 304)
+
+        Hotel.objects.filter(pk=self.hotel.pk).update(rating=2.0)
+        response = self.send(hotel_detail, 'get', self.hotel.pk, If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_if_match_guards_writes(self):
+        etag = self.send(booking_detail, 'get', self.booking.pk)['ETag']
+
+        response = self.send(
+            booking_detail, 'patch', self.booking.pk, {'completedAt': '2025-01-05T12:00:00+02:00'}, If_Match=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        # The new ETag matches the stored row
+        self.assertEqual(self.send(booking_detail, 'get', self.booking.pk)['ETag'], response['ETag'])
+
+        # A stale version is rejected
+        response = self.send(booking_detail, 'delete', self.booking.pk, If_Match=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertTrue(Booking.objects.filter(pk=self.booking.pk).exists())
@@ -0,0 +1,130 @@
+###################
+# IMPORTS SECTION #
+###################
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from bookings.catalog import file_catalog
+from bookings.derivatives import DerivativePipeline, image_derivatives
+from bookings.models import BookingUser
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+#################
+# TESTS SECTION #
+#################
+@unittest.skipIf(Image is None, "Pillow is not installed")
+class TestImageDerivatives(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name)
+        self.settings_override.enable()
+        self.client = APIClient()
+        self.client.force_authenticate(BookingUser.objects.create_user(username="tester", password="secret"))
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media.cleanup()
+
+    def image(self, image_format, mode='RGB', size=(3000, 2000)):
+        buffer = io.BytesIO()
+        Image.new(mode, size, (200, 120, 40, 128)[:len(mode)]).save(buffer, image_format)
+        return buffer.getvalue()
+
+    def wait(self, content):
+        # The pending generation's Future, None once the variants exist
+        digest = hashlib.sha256(content).hexdigest()
+        future = image_derivatives._pending.get(digest)
+        if future is not None:
+            future.result(timeout=120)
+        return digest
+
+    def variant(self, filename, variant):
+        response = self.client.get(f'/download/{filename}/', {'variant': variant})
+        return response, b''.join(response.streaming_content) if response.status_code == 200 else b''
+
+    def test_uploaded_images_get_their_variants(self):
+        content = self.image('JPEG')
+        self.client.post('/upload/hotel1.jpg/', {'file': SimpleUploadedFile('hotel1.jpg', content)}, format='multipart')
+        digest = self.wait(content)
+
+        expected = {'webp': ('WEBP', (2048, 1365)), 'medium': ('JPEG', (1024, 683)), 'thumbnail': ('JPEG', (256, 171))}
+        for variant, (image_format, size) in expected.items():
+            response, body = self.variant('hotel1.jpg', variant)
+            self.assertEqual(response['ETag'], f'"{digest}-{variant}"')
+            self.assertIn('inline', response['Content-Disposition'])
+            with Image.open(io.BytesIO(body)) as image:
+                self.assertEqual((image.format, image.size), (image_format, size), variant)
+
+        self.assertEqual(self.variant('hotel1.jpg', 'thumbnail')[0]['Content-Type'], 'image/jpeg')
+        self.assertEqual(self.variant('hotel1.jpg', 'webp')[0]['Content-Type'], 'image/webp')
+
+    def test_original_is_served_until_generated(self):
+        content = self.image('PNG', mode='RGBA', size=(400, 300))
+        os.makedirs(os.path.join(self.media.name, 'uploads'))
+        with open(os.path.join(self.media.name, 'uploads', 'lobby.png'), 'wb') as file:
+            file.write(content)
+        file_catalog.scan()
+
+        response, body = self.variant('lobby.png', 'thumbnail')
+        self.assertEqual((body, response['Content-Type']), (content, 'image/png'))
+        self.wait(content)
+        response, body = self.variant('lobby.png', 'thumbnail')
+        with Image.open(io.BytesIO(body)) as image:
+            self.assertEqual((image.format, image.size), ('JPEG', (256, 192)))
+
+    def test_variants_of_other_files(self):
+        self.client.post('/upload/notes.txt/', {'file': SimpleUploadedFile('notes.txt', b'notes')}, format='multipart')
+        self.assertEqual(self.variant('notes.txt', 'thumbnail')[0].status_code, 404)
+        self.assertEqual(self.variant('notes.txt', 'huge')[0].status_code, 400)
+        self.assertEqual(self.variant('missing.jpg', 'thumbnail')[0].status_code, 404)
+
+    def test_backfill(self):
+        os.makedirs(os.path.join(self.media.name, 'uploads'))
+        contents = {'a.jpg': self.image('JPEG', size=(800, 600)), 'b.gif': self.image('GIF', mode='P'), 'c.txt': b'c'}
+        # A copy of a.jpg: rendered once
+        contents['copy.jpg'] = contents['a.jpg']
+        for filename, content in contents.items():
+            with open(os.path.join(self.media.name, 'uploads', filename), 'wb') as file:
+                file.write(content)
+
+        output = io.StringIO()
+        call_command('backfill_derivatives', workers=1, stdout=output)
+        self.assertIn('2 images', output.getvalue())
+        self.assertIn('0 failed', output.getvalue())
+        self.assertTrue(image_derivatives.generated(hashlib.sha256(contents['b.gif']).hexdigest()))
+
+        output = io.StringIO()
+        call_command('backfill_derivatives', workers=1, stdout=output)
+        self.assertIn('0 images', output.getvalue())
+
+
+class TestDerivativeFailures(TestCase):
+    def finish(self, pipeline, digest, error):
+        future = Future()
+        pipeline._pending[digest] = future
+        future.add_done_callback(lambda done: pipeline._finished(digest, done))
+        future.set_exception(error)
+
+    def test_only_unreadable_images_are_not_retried(self):
+        pipeline = DerivativePipeline(workers=1)
+        pipeline._executor = executor = object()
+        self.finish(pipeline, 'a' * 64, OSError("cannot identify image file"))
+        self.assertEqual((pipeline._failed, pipeline._executor), ({'a' * 64}, executor))
+
+        # A dead worker is the pool's failure, not the image's
+        self.finish(pipeline, 'b' * 64, BrokenProcessPool())
+        self.assertEqual((pipeline._failed, pipeline._executor), ({'a' * 64}, None))
+        self.assertEqual((pipeline.stats()['failed'], pipeline.stats()['pending']), (2, 0))
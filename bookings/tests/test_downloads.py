@@ -0,0 +1,111 @@
+###################
+# IMPORTS SECTION #
+###################
+import hashlib
+import os
+import tempfile
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+from bookings.downloads import Downloader, FileRange, parse_ranges
+from bookings.models import BookingUser
+from bookings.uploads import upload_store
+
+
+#################
+# TESTS SECTION #
+#################
+class TestParseRanges(TestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_ranges('bytes=0-9', 100), [(0, 9)])
+        self.assertEqual(parse_ranges('bytes=-10', 100), [(90, 99)])
+        self.assertEqual(parse_ranges('bytes=95-', 100), [(95, 99)])
+        self.assertEqual(parse_ranges('bytes=50-60, 0-9, 5-12, 61-70', 100), [(0, 12), (50, 70)])
+        self.assertEqual(parse_ranges('bytes=100-200', 100), [])
+        for ignored in [None, 'items=0-1', 'bytes=5-1', 'bytes=a-b', 'bytes=-', ','.join(['bytes=0-0'] + ['2-2'] * 16)]:
+            self.assertIsNone(parse_ranges(ignored, 100), ignored)
+
+
+class TestDownloads(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name)
+        self.settings_override.enable()
+        self.client = APIClient()
+        self.client.force_authenticate(BookingUser.objects.create_user(username="tester", password="secret"))
+        self.content = os.urandom(10_000)
+        self.digest = hashlib.sha256(self.content).hexdigest()
+        upload_store.save('hotel.jpg', [self.content])
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media.cleanup()
+
+    def download(self, **headers):
+        return self.client.get('/download/hotel.jpg/', headers=headers)
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_download_carries_validators(self):
+        response = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), self.content)
+        self.assertEqual((response['ETag'], response['Accept-Ranges']), (f'"{self.digest}"', 'bytes'))
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertIn('attachment', response['Content-Disposition'])
+
+        self.assertEqual(self.download(if_none_match=response['ETag']).status_code, 304)
+        self.assertEqual(self.download(if_modified_since=response['Last-Modified']).status_code, 304)
+        self.assertEqual(self.client.get('/download/missing.jpg/').status_code, 404)
+
+    def test_single_and_multiple_ranges(self):
+        response = self.download(range='bytes=100-199')
+        self.assertEqual((response.status_code, response['Content-Range']), (206, 'bytes 100-199/10000'))
+        self.assertEqual(self.body(response), self.content[100:200])
+
+        response = self.download(range='bytes=0-9,-10')
+        self.assertEqual(response.status_code, 206)
+        boundary = response['Content-Type'].split('boundary=')[1]
+        body = self.body(response)
+        self.assertEqual(len(body), int(response['Content-Length']))
+        parts = body.split(f'--{boundary}'.encode())[1:-1]
+        self.assertEqual([part.split(b'\r\n\r\n', 1)[1][:-2] for part in parts], [self.content[:10], self.content[-10:]])
+        self.assertIn(b'Content-Range: bytes 9990-9999/10000', parts[1])
+
+    def test_unsatisfiable_and_stale_ranges(self):
+        response = self.download(range='bytes=20000-')
+        self.assertEqual((response.status_code, response['Content-Range']), (416, 'bytes */10000'))
+
+        # The client's copy is another version: the whole file
+        response = self.download(range='bytes=0-9', if_range='"another"')
+        self.assertEqual((response.status_code, len(self.body(response))), (200, 10_000))
+        response = self.download(range='bytes=0-9', if_range=f'"{self.digest}"')
+        self.assertEqual(response.status_code, 206)
+
+    def test_file_wrapper_gets_the_positioned_file(self):
+        request = RequestFactory().get('/', headers={'range': 'bytes=4000-4999'})
+        response = Downloader().serve(request, os.path.join(self.media.name, 'uploads', 'hotel.jpg'), 'hotel.jpg')
+
+        # What gunicorn's sendfile reads: the descriptor's position and the Content-Length
+        self.assertIsInstance(response.file_to_stream, FileRange)
+        self.assertEqual(os.lseek(response.file_to_stream.fileno(), 0, os.SEEK_CUR), 4000)
+        self.assertEqual(response['Content-Length'], '1000')
+        self.assertEqual(self.body(response), self.content[4000:5000])
+
+    async def test_asgi_streams_from_a_thread(self):
+        request = AsyncRequestFactory().get('/', headers={'range': 'bytes=0-1,8000-8001'})
+        response = Downloader().serve(request, os.path.join(self.media.name, 'uploads', 'hotel.jpg'), 'hotel.jpg')
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertIn(self.content[8000:8002], body)
+
+    def test_proxy_modes(self):
+        request = RequestFactory().get('/')
+        path = os.path.join(self.media.name, 'uploads', 'hotel.jpg')
+
+        response = Downloader(mode='x-accel-redirect').serve(request, path, 'hotel.jpg', digest=self.digest)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/blobs/{self.digest[:2]}/{self.digest}')
+        self.assertEqual((response.content, response['ETag']), (b'', f'"{self.digest}"'))
+
+        response = Downloader(mode='x-sendfile').serve(request, path, 'hotel.jpg')
+        self.assertEqual(response['X-Sendfile'], os.path.realpath(path))
@@ -0,0 +1,65 @@
+###################
+# IMPORTS SECTION #
+###################
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from bookings import export
+from bookings.models import Booking, BookingUser, Hotel, Room
+from bookings.serializers import BookingSerializer, RoomSerializer
+from bookings.views import booking_export, hotel_export, room_export
+
+
+#################
+# TESTS SECTION #
+#################
+class TestExport(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+        self.hotel = Hotel.objects.create(name="Grand", address="Street 1", rating=4.0)
+        for number in range(1, 4):
+            Room.objects.create(number=number, hotel=self.hotel, price_per_night=Decimal('80.50'), capacity=number)
+        for day in range(1, 6):
+            Booking.objects.create(
+                customerName=f"Customer {day}", customerEmail=f"customer{day}@mail.com", customerPhone="0700000000",
+                startDate=date(2025, 1, day), endDate=date(2025, 1, day + 2),
+            )
+
+    def get(self, view, params):
+        request = self.factory.get('/export/', params)
+        force_authenticate(request, user=self.user)
+        return view(request)
+
+    def body(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_rows_match_serializer(self):
+        response = self.get(booking_export, {'start_date': '2025-01-03'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        rows = [json.loads(line) for line in self.body(response).splitlines()]
+        expected = BookingSerializer(Booking.objects.filter(startDate__gte='2025-01-03').order_by('startDate'), many=True)
+        self.assertEqual(rows, json.loads(json.dumps(expected.data)))
+
+    def test_csv_export_streams_in_chunks(self):
+        export.CHUNK_SIZE, chunk_size = 2, export.CHUNK_SIZE
+        try:
+            response = self.get(room_export, {'output': 'csv', 'min_capacity': '2'})
+            chunks = list(response.streaming_content)
+        finally:
+            export.CHUNK_SIZE = chunk_size
+
+        self.assertGreater(len(chunks), 1)
+        rows = list(csv.reader(io.StringIO(b''.join(chunks).decode())))
+        self.assertEqual(rows[0], list(RoomSerializer().fields))
+        self.assertEqual(sorted(row[1] for row in rows[1:]), ['2', '3'])
+        self.assertEqual(rows[1][3], '80.50')
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.get(hotel_export, {'output': 'xml'}).status_code, 400)
+        self.assertEqual(self.get(room_export, {'max_price': 'cheap'}).status_code, 400)
@@ -0,0 +1,56 @@
+###################
+# IMPORTS SECTION #
+###################
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from bookings.models import BookingUser, Hotel, Room
+from bookings.views import hotel_detail, hotel_list, room_list
+
+
+#################
+# TESTS SECTION #
+#################
+class TestSparseFieldsets(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+        self.hotel = Hotel.objects.create(name="Grand", address="A long address", rating=4.0)
+        Room.objects.create(number=1, hotel=self.hotel, price_per_night=Decimal('50.00'), capacity=2)
+
+    def get(self, view, params, **kwargs):
+        request = self.factory.get('/', params)
+        force_authenticate(request, user=self.user)
+        return view(request, **kwargs)
+
+    def test_list_selects_only_requested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(hotel_list, {'fields': 'name,id', 'cursor': ''})
+
+        self.assertEqual(response.data['results'], [{'id': str(self.hotel.pk), 'name': "Grand"}])
+        select = next(query['sql'] for query in queries if query['sql'].startswith('SELECT'))
+        self.assertNotIn('"address"', select)
+
+        # The keyset is still fetched for the next cursor
+        Hotel.objects.create(name="Plaza", address="Street 2", rating=4.5)
+        first = self.get(hotel_list, {'fields': 'name', 'cursor': '', 'limit': 1}).data
+        second = self.get(hotel_list, {'fields': 'name', 'cursor': first['next_cursor'], 'limit': 1}).data
+        self.assertEqual(first['results'] + second['results'], [{'name': "Grand"}, {'name': "Plaza"}])
+
+        response = self.get(room_list, {'fields': 'price_per_night'})
+        self.assertEqual(response.data['results'], [{'price_per_night': '50.00'}])
+
+    def test_detail_loads_only_requested_columns(self):
+        full_etag = self.get(hotel_detail, {}, pk=self.hotel.pk)['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(hotel_detail, {'fields': 'rating'}, pk=self.hotel.pk)
+
+        self.assertEqual(response.data, {'rating': '4.0'})
+        self.assertNotIn('"address"', queries[0]['sql'])
+        self.assertNotEqual(response['ETag'], full_etag)
+
+    def test_unknown_fields_are_rejected(self):
+        self.assertEqual(self.get(hotel_list, {'fields': 'name,password'}).status_code, 400)
+        self.assertEqual(self.get(hotel_detail, {'fields': 'rooms'}, pk=self.hotel.pk).status_code, 400)
@@ -0,0 +1,173 @@
+###################
+# IMPORTS SECTION #
+###################
+import json
+from datetime import date
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from bookings.consumer import BookingConsumer
+from bookings.filters import filter_bookings
+from bookings.live import Subscription, SubscriptionIndex, _decode_row, live_queries, row_of
+from bookings.models import Booking, Hotel, Room
+
+
+#################
+# TESTS SECTION #
+#################
+class TestSubscriptions(TestCase):
+    def setUp(self):
+        hotel = Hotel.objects.create(name='Grand', address='Street 1', rating=4.0)
+        self.room = Room.objects.create(number=101, hotel=hotel, price_per_night=100, capacity=1)
+        self.bookings = [
+            Booking.objects.create(
+                customerName=name, customerEmail=f'{name.split()[0].lower()}@example.com', customerPhone=phone,
+                startDate=start, endDate=end, state=state, room=room,
+            )
+            for name, phone, start, end, state, room in [
+                ('Ana Pop', '0711', date(2025, 1, 1), date(2025, 1, 5), 'PENDING', self.room),
+                ('Ion Pop', '0722', date(2025, 2, 1), date(2025, 2, 3), 'CONFIRMED', None),
+                ('Maria Ionescu', '0733', date(2025, 3, 1), date(2025, 3, 9), 'PENDING', None),
+            ]
+        ]
+
+    def test_matches_like_the_list_filters(self):
+        for params in [
+            {}, {'state': 'PENDING'}, {'room': str(self.room.pk)}, {'name': 'pop'}, {'email': 'MARIA'},
+            {'q': 'pop 072'}, {'start_date': '2025-02-01'}, {'end_date': '2025-02-28'},
+            {'start_date': '2025-01-01', 'end_date': '2025-02-28', 'state': 'CONFIRMED'},
+            {'id': str(self.bookings[2].pk)},
+        ]:
+            subscription = Subscription(params, outbox=None)
+            expected = set(filter_bookings(Booking.objects.all(), params).values_list('pk', flat=True))
+            matched = {booking.pk for booking in self.bookings if subscription.matches(_row(booking))}
+            self.assertEqual(matched, expected, params)
+
+    def test_invalid_filters_are_rejected(self):
+        for params in [{'room': 'nope'}, {'start_date': '2025-13-01'}, {'created_at': 'yesterday'}]:
+            with self.assertRaises(ValueError):
+                Subscription(params, outbox=None)
+
+    def test_index_only_checks_possible_matches(self):
+        index = SubscriptionIndex()
+        subscriptions = [Subscription({'state': f'STATE{number}'}, outbox=None) for number in range(1000)]
+        subscriptions += [Subscription({'start_date': f'2025-{month:02}-01'}, outbox=None) for month in range(1, 13)]
+        subscriptions.append(Subscription({}, outbox=None))
+        for subscription in subscriptions:
+            index.add(subscription)
+
+        row = _row(self.bookings[1])
+        row['state'] = 'STATE7'
+        candidates = index.candidates(row)
+        # Its state's bucket, the January and February start dates and the unfiltered subscription
+        self.assertEqual(len(candidates), 4)
+        self.assertEqual({subscription for subscription in subscriptions if subscription.matches(row)}, candidates)
+
+        for subscription in subscriptions:
+            index.remove(subscription)
+        self.assertEqual((len(index), index.candidates(row)), (0, set()))
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class TestLiveQueries(TestCase):
+    def setUp(self):
+        live_queries.install()
+
+    def tearDown(self):
+        live_queries.uninstall()
+
+    async def connect(self, query):
+        communicator = ApplicationCommunicator(BookingConsumer.as_asgi(), {
+            'type': 'websocket', 'path': '/ws/bookings/', 'query_string': query, 'headers': [], 'subprotocols': [],
+        })
+        await communicator.send_input({'type': 'websocket.connect'})
+        self.assertEqual((await communicator.receive_output(1))['type'], 'websocket.accept')
+        return communicator
+
+    async def frame(self, communicator):
+        return json.loads((await communicator.receive_output(1))['text'])
+
+    async def write(self, change, *args, **kwargs):
+        # The changes are sent once committed
+        def run():
+            with self.captureOnCommitCallbacks(execute=True):
+                return change(*args, **kwargs)
+        return await sync_to_async(run)()
+
+    async def test_subscribers_get_the_changes_of_their_results(self):
+        pending = await self.connect(b'state=PENDING')
+        everything = await self.connect(b'')
+        booking = await self.write(
+            Booking.objects.create, customerName='Ana', customerEmail='ana@example.com',
+            customerPhone='0711', startDate='2025-04-02', endDate='2025-04-03', state='PENDING',
+        )
+        booking_id = str(booking.pk)
+        created = await self.frame(pending)
+        self.assertEqual((created['new_booking']['id'], created['new_booking']['state']), (booking_id, 'PENDING'))
+        self.assertIn('new_booking', await self.frame(everything))
+
+        # Leaving the filtered results is a delete for that subscriber only
+        await self.write(Booking.objects.filter(pk=booking.pk).update, state='CONFIRMED')
+        self.assertEqual(await self.frame(pending), {'deleted_booking': {'id': booking_id}})
+        self.assertEqual((await self.frame(everything))['updated_booking']['state'], 'CONFIRMED')
+
+        await self.write(booking.delete)
+        self.assertEqual(await self.frame(everything), {'deleted_booking': {'id': booking_id}})
+        self.assertTrue(await pending.receive_nothing(0.1))
+
+        for communicator in (pending, everything):
+            await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+            await communicator.wait()
+        self.assertEqual(live_queries.stats()['subscriptions'], 0)
+
+    async def test_room_deletes_reach_the_subscribers_of_its_bookings(self):
+        hotel = await Hotel.objects.acreate(name='Grand', address='Street 1', rating=4.0)
+        room = await Room.objects.acreate(number=101, hotel=hotel, price_per_night=100, capacity=1)
+        booking = await Booking.objects.acreate(
+            customerName='Ana', customerEmail='ana@example.com', customerPhone='0711',
+            startDate='2025-04-02', endDate='2025-04-03', state='PENDING', room=room,
+        )
+        in_room = await self.connect(f'room={room.pk}'.encode())
+        everything = await self.connect(b'')
+
+        # The collector sets the bookings' room to NULL with an update that sends no signal
+        await self.write(room.delete)
+        self.assertEqual(await self.frame(in_room), {'deleted_booking': {'id': str(booking.pk)}})
+        updated = (await self.frame(everything))['updated_booking']
+        self.assertEqual((updated['id'], updated['room']), (str(booking.pk), None))
+
+        for communicator in (in_room, everything):
+            await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+            await communicator.wait()
+
+    def test_room_deletes_cost_the_same_queries_for_any_number_of_rooms(self):
+        queries, changes = [], []
+        for rooms in (1, 5):
+            hotel = Hotel.objects.create(name=f'Hotel {rooms}', address='Street 1', rating=4.0)
+            for number in range(rooms):
+                room = Room.objects.create(number=number, hotel=hotel, price_per_night=100, capacity=1)
+                Booking.objects.create(
+                    customerName='Ana', customerEmail='ana@example.com', customerPhone='0711',
+                    startDate='2025-04-02', endDate='2025-04-03', state='PENDING', room=room,
+                )
+            with self.captureOnCommitCallbacks() as callbacks, CaptureQueriesContext(connection) as captured:
+                hotel.delete()
+            queries.append(len(captured))
+            changes.append(len(callbacks))
+        # One change sent per cleared booking
+        self.assertEqual((queries[1] - queries[0], changes[1] - changes[0]), (0, 4))
+        self.assertFalse(Booking.objects.filter(room__isnull=False).exists())
+
+    async def test_invalid_filters_close_the_connection(self):
+        communicator = await self.connect(b'room=nope')
+        self.assertEqual(await self.frame(communicator), {'error': 'room must be a UUID'})
+        self.assertEqual(await communicator.receive_output(1), {'type': 'websocket.close', 'code': 4000})
+
+
+###################
+# HELPERS SECTION #
+###################
+def _row(booking):
+    return _decode_row(row_of(booking))
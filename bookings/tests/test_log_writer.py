@@ -0,0 +1,63 @@
+###################
+# IMPORTS SECTION #
+###################
+from unittest import mock
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from bookings.log_writer import OperationLogWriter
+from bookings.models import BookingUser, OperationLog
+from bookings.views import hotel_list
+
+
+#################
+# TESTS SECTION #
+#################
+class TestOperationLogWriter(TestCase):
+    def setUp(self):
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+
+    def record(self, index):
+        return (self.user.pk, 'Hotel', str(index), 'LIST', timezone.now())
+
+    def test_drop_policy_discards_when_full(self):
+        writer = OperationLogWriter(max_queue_size=2, batch_size=10, overflow_policy='drop')
+        results = [writer._enqueue(self.record(i)) for i in range(3)]
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(writer.stats()['dropped'], 1)
+        self.assertEqual(writer.stats()['queue_depth'], 2)
+
+    def test_sample_policy_thins_out_past_half_full(self):
+        writer = OperationLogWriter(max_queue_size=4, overflow_policy='sample', sample_rate=0.0)
+        results = [writer._enqueue(self.record(i)) for i in range(4)]
+        self.assertEqual(results, [True, True, False, False])
+        self.assertEqual(writer.stats()['sampled_out'], 2)
+
+    def test_flush_writes_in_batches(self):
+        writer = OperationLogWriter(max_queue_size=10, batch_size=3)
+        for index in range(5):
+            writer._enqueue(self.record(index))
+
+        self.assertEqual(writer.flush(), 3)
+        self.assertEqual(writer.flush(), 2)
+        self.assertEqual(writer.flush(), 0)
+        self.assertEqual(OperationLog.objects.count(), 5)
+        self.assertEqual(writer.stats()['batches'], 2)
+
+    def test_failed_flush_is_logged_and_counted(self):
+        writer = OperationLogWriter(max_queue_size=10, batch_size=10)
+        for index in range(3):
+            writer._enqueue(self.record(index))
+
+        with mock.patch.object(OperationLog.objects, 'bulk_create', side_effect=RuntimeError("disk full")), \
+                self.assertLogs('bookings.log_writer', level='ERROR') as logs:
+            writer.flush()
+        self.assertIn("3 records lost", logs.output[0])
+        self.assertEqual((writer.stats()['failed'], writer.stats()['lost']), (1, 3))
+
+    def test_log_crud_writes_synchronously_when_not_started(self):
+        request = APIRequestFactory().get('/hotels/')
+        force_authenticate(request, user=self.user)
+        hotel_list(request)
+        log = OperationLog.objects.get()
+        self.assertEqual((log.model, log.action, log.object_id), ('Hotel', 'LIST', 'ALL'))
@@ -0,0 +1,51 @@
+###################
+# IMPORTS SECTION #
+###################
+from django.test import TestCase
+from bookings.models import BookingUser, MonitoredUser, OperationLog
+from bookings.monitoring import ActivityDetector, scan_operation_logs
+
+
+#################
+# TESTS SECTION #
+#################
+class TestActivityDetector(TestCase):
+    def setUp(self):
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+        self.detector = ActivityDetector(window=60, threshold=20, bucket_count=12)
+
+    def test_flags_on_the_operation_crossing_the_threshold(self):
+        results = [self.detector.record(self.user.pk, now=1000 + i) for i in range(21)]
+        self.assertEqual(results, [False] * 20 + [True])
+        # Already flagged users are not reported again
+        self.assertFalse(self.detector.record(self.user.pk, now=1021))
+
+    def test_operations_outside_the_window_expire(self):
+        for second in range(0, 200, 10):
+            self.assertFalse(self.detector.record(self.user.pk, now=second))
+
+    def test_flush_writes_flagged_users_once(self):
+        for i in range(21):
+            self.detector.record(self.user.pk, now=1000)
+        self.assertEqual(self.detector.flush(), [self.user.pk])
+        self.assertEqual(self.detector.flush(), [])
+        self.assertTrue(MonitoredUser.objects.filter(user=self.user).exists())
+
+    def test_prune_forgets_idle_users(self):
+        self.detector.record(self.user.pk, now=1000)
+        self.assertEqual(self.detector.prune(now=1030), 0)
+        self.assertEqual(self.detector.prune(now=1100), 1)
+        self.assertEqual(self.detector.stats()['tracked_users'], 0)
+
+    def test_reconciliation_scan(self):
+        OperationLog.objects.bulk_create([
+            OperationLog(user=self.user, model='Hotel', object_id='ALL', action='LIST') for _ in range(21)
+        ])
+        with self.assertLogs('bookings.monitoring', 'INFO') as logs:
+            self.assertEqual(scan_operation_logs(window=60, threshold=20), [self.user.pk])
+        self.assertEqual(logs.output, [f'INFO:bookings.monitoring:Flagged suspicious user {self.user.pk}'])
+
+        # Already flagged: not reported again
+        with self.assertNoLogs('bookings.monitoring', 'INFO'):
+            self.assertEqual(scan_operation_logs(window=60, threshold=20), [self.user.pk])
+        self.assertEqual(MonitoredUser.objects.count(), 1)
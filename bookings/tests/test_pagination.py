@@ -0,0 +1,89 @@
+###################
+# IMPORTS SECTION #
+###################
+from datetime import date, timedelta
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework import status
+from bookings.models import Booking, BookingUser, Hotel, Room
+from bookings.views import booking_list, hotel_list, room_list
+
+
+#################
+# TESTS SECTION #
+#################
+class TestCursorPagination(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+        for index in range(7):
+            Booking.objects.create(
+                customerName=f"Customer {index}",
+                customerEmail=f"customer{index}@example.com",
+                customerPhone="0722333444",
+                # Two bookings share every start date to exercise the tiebreakers
+                startDate=date(2025, 1, 1) + timedelta(days=index // 2),
+                endDate=date(2025, 1, 10),
+            )
+
+    def get(self, view, params):
+        request = self.factory.get('/', params)
+        force_authenticate(request, user=self.user)
+        return view(request)
+
+    def walk(self, view, params):
+        seen, cursor = [], ''
+        while cursor is not None:
+            response = self.get(view, {**params, 'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            seen.extend(row['id'] for row in response.data['results'])
+            cursor = response.data['next_cursor']
+            self.assertEqual(response.data['has_more'], cursor is not None)
+        return seen
+
+    def test_cursor_walk_matches_keyset_order(self):
+        expected = [str(pk) for pk in Booking.objects.order_by('startDate', 'endDate', 'id').values_list('id', flat=True)]
+        self.assertEqual(self.walk(booking_list, {'limit': 3}), expected)
+
+    def test_cursor_walk_descending(self):
+        expected = [str(pk) for pk in Booking.objects.order_by('-startDate', '-endDate', '-id').values_list('id', flat=True)]
+        self.assertEqual(self.walk(booking_list, {'limit': 2, 'ordering': '-startDate'}), expected)
+
+    def test_cursor_walk_by_declared_ordering(self):
+        expected = [str(pk) for pk in Booking.objects.order_by('-customerName', '-id').values_list('id', flat=True)]
+        self.assertEqual(self.walk(booking_list, {'limit': 3, 'ordering': '-customerName'}), expected)
+
+    def test_unsupported_ordering_is_rejected(self):
+        for params in [{'ordering': 'customerEmail'}, {'ordering': '-state', 'cursor': ''}, {'ordering': 'id'}]:
+            response = self.get(booking_list, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('startDate', response.data['error'])
+        self.assertEqual(self.get(room_list, {'ordering': 'hotel__name'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_offset_ordering_has_id_tiebreaker(self):
+        names = [row['customerName'] for row in self.get(booking_list, {'ordering': 'endDate', 'limit': 7}).data['results']]
+        expected = list(Booking.objects.order_by('endDate', 'id').values_list('customerName', flat=True))
+        self.assertEqual(names, expected)
+
+    def test_cursor_rejects_garbage(self):
+        response = self.get(booking_list, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_offset_mode_without_count(self):
+        response = self.get(booking_list, {'limit': 5, 'count': 'false'})
+        self.assertNotIn('count', response.data)
+        self.assertTrue(response.data['has_more'])
+        self.assertEqual(response.data['next_offset'], 5)
+
+    def test_hotel_and_room_cursor_walk(self):
+        hotels = [Hotel.objects.create(name=f"Hotel {i}", address="Street", rating=i % 2) for i in range(3)]
+        for hotel in hotels:
+            for number in range(3):
+                Room.objects.create(number=number, hotel=hotel, price_per_night=100 + number % 2)
+
+        self.assertEqual(sorted(self.walk(hotel_list, {'limit': 2})), sorted(str(h.id) for h in hotels))
+        self.assertEqual(len(self.walk(room_list, {'limit': 4})), 9)
+        self.assertEqual(len(self.walk(room_list, {'limit': 4, 'ordering': 'hotel'})), 9)
+        rated = [str(pk) for pk in Hotel.objects.order_by('-rating', '-id').values_list('id', flat=True)]
+        self.assertEqual(self.walk(hotel_list, {'limit': 2, 'ordering': '-rating'}), rated)
@@ -0,0 +1,52 @@
+###################
+# IMPORTS SECTION #
+###################
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+from bookings.models import Booking, BookingUser, Hotel, Room
+from bookings.projection import Projection
+from bookings.serializers import BookingSerializer, HotelSerializer, RoomSerializer
+from bookings.views import booking_list
+
+
+#################
+# TESTS SECTION #
+#################
+class TestProjection(TestCase):
+    def setUp(self):
+        hotel = Hotel.objects.create(name="Grand été", address="Street \"1\"", rating=4.5)
+        Hotel.objects.create(name="Zero", address="Street 2", rating=0)
+        room = Room.objects.create(number=7, hotel=hotel, price_per_night=Decimal('99.9'), capacity=3)
+        Room.objects.create(number=8, hotel=hotel, price_per_night=100, capacity=1)
+        Booking.objects.create(
+            customerName="Ion", customerEmail="ion@mail.com", customerPhone="0700000000",
+            startDate=date(2025, 1, 1), endDate=date(2025, 1, 5), room=room,
+            completedAt=datetime(2025, 1, 5, 10, 30, 15, 123456, tzinfo=timezone.utc),
+        )
+        Booking.objects.create(
+            customerName="Ana", customerEmail="ana@mail.com", customerPhone="0711111111",
+            startDate=date(2025, 2, 1), endDate=date(2025, 2, 3), state=Booking.BookingState.CANCELLED,
+        )
+
+    def test_output_is_byte_identical(self):
+        for model, serializer_class in [(Booking, BookingSerializer), (Hotel, HotelSerializer), (Room, RoomSerializer)]:
+            queryset = model.objects.order_by('pk')
+            expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+            projection = Projection(serializer_class)
+            self.assertEqual(JSONRenderer().render(projection.render(projection.queryset(queryset))), expected)
+
+    def test_cursor_pagination_over_projected_rows(self):
+        user = BookingUser.objects.create_user(username="tester", password="secret")
+        request = APIRequestFactory().get('/bookings/', {'cursor': '', 'limit': 1})
+        force_authenticate(request, user=user)
+        first = booking_list(request).data
+
+        request = APIRequestFactory().get('/bookings/', {'cursor': first['next_cursor'], 'limit': 1})
+        force_authenticate(request, user=user)
+        second = booking_list(request).data
+
+        self.assertEqual([first['results'][0]['customerName'], second['results'][0]['customerName']], ["Ion", "Ana"])
+        self.assertFalse(second['has_more'])
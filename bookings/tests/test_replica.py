@@ -0,0 +1,103 @@
+###################
+# IMPORTS SECTION #
+###################
+import tempfile
+from django.core.cache import caches
+from django.test import TransactionTestCase, override_settings
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from bookings.models import BookingUser, Hotel
+from bookings.replica import REPLICA_ALIAS, Replica, reads_from_replica, replica
+from bookings.response_cache import response_cache
+from bookings.views import high_end_hotels_stats_view, hotel_list
+
+
+#################
+# TESTS SECTION #
+#################
+@api_view(['GET'])
+@reads_from_replica
+def write_then_read(request):
+    before = Hotel.objects.all().db
+    Hotel.objects.create(name="Written", address="Street", rating=3)
+    return Response({'before': before, 'after': Hotel.objects.all().db})
+
+
+@override_settings(REPLICA_ENABLED=True)
+class TestReplicaRouting(TransactionTestCase):
+    # Not TestCase: the backup API cannot write into a replica kept inside a transaction
+    databases = {'default', REPLICA_ALIAS}
+
+    def setUp(self):
+        caches[replica.state_cache].clear()
+        self.factory = APIRequestFactory()
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+        Hotel.objects.create(name="Grand", address="Street 1", rating=4)
+        replica.refresh()
+        # Only on the primary
+        Hotel.objects.create(name="Plaza", address="Street 2", rating=5)
+
+    def list_names(self, user=None):
+        request = self.factory.get('/hotels/', {'limit': 10})
+        force_authenticate(request, user=user or self.user)
+        return [row['name'] for row in hotel_list(request).data['results']]
+
+    def test_reads_from_fresh_replica(self):
+        self.assertEqual(self.list_names(), ["Grand"])
+        self.assertEqual(high_end_hotels_stats_view(self.factory.get('/stats/')).status_code, 200)
+
+    def test_own_writes_are_read_from_primary(self):
+        replica.record_write(self.user)
+
+        # Other users keep reading the replica, without caching what it misses
+        other = BookingUser.objects.create_user(username="other", password="secret")
+        stores = response_cache.stats()['stores']
+        self.assertEqual(self.list_names(other), ["Grand"])
+        self.assertEqual(response_cache.stats()['stores'], stores)
+
+        self.assertEqual(self.list_names(), ["Grand", "Plaza"])
+
+        replica.refresh()
+        self.assertEqual(self.list_names(), ["Grand", "Plaza"])
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        max_lag, replica.max_lag = replica.max_lag, -1
+        try:
+            self.assertEqual(self.list_names(), ["Grand", "Plaza"])
+        finally:
+            replica.max_lag = max_lag
+
+    def test_primary_is_sticky_after_a_write(self):
+        request = self.factory.get('/')
+        force_authenticate(request, user=self.user)
+        self.assertEqual(write_then_read(request).data, {'before': REPLICA_ALIAS, 'after': 'default'})
+
+    def test_write_requests_pin_the_writer_to_primary(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post('/hotels/', {'name': "Ritz", 'address': "Street 3", 'rating': '4.5'}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        names = [row['name'] for row in client.get('/hotels/', {'limit': 10}).data['results']]
+        self.assertEqual(names, ["Grand", "Plaza", "Ritz"])
+
+    def test_workers_share_the_write_times(self):
+        # Two aliases on one directory stand in for two workers' file caches
+        with tempfile.TemporaryDirectory() as directory:
+            backend = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory}
+            locmem = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+            with override_settings(CACHES={'default': locmem, 'worker1': backend, 'worker2': backend}):
+                writer, reader = Replica(state_cache='worker1'), Replica(state_cache='worker2')
+                writer.refresh()
+                self.assertTrue(reader.readable_by(self.user))
+                writer.record_write(self.user)
+                self.assertFalse(reader.readable_by(self.user))
+
+    def test_unshared_write_times_keep_reads_on_primary(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            local = Replica(state_cache='default')
+            local.refresh()
+            self.assertFalse(local.readable_by(self.user))
+            self.assertFalse(local.readable_by(None))
+            self.assertEqual(local.stats()['unshared_state'], 2)
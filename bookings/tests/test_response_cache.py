@@ -0,0 +1,56 @@
+###################
+# IMPORTS SECTION #
+###################
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from bookings.models import BookingUser, Hotel, Room
+from bookings.response_cache import response_cache
+from bookings.views import hotel_list, room_list
+
+
+#################
+# TESTS SECTION #
+#################
+class TestResponseCache(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+        self.hotel = Hotel.objects.create(name="Grand", address="Street 1", rating=4.0)
+        Room.objects.create(number=1, hotel=self.hotel, price_per_night=Decimal('50.00'), capacity=2)
+        response_cache.backend.clear()
+
+    def get(self, view, query):
+        request = self.factory.get(f'/list/?{query}')
+        force_authenticate(request, user=self.user)
+        return view(request)
+
+    def test_hits_ignore_parameter_order(self):
+        hits = response_cache.stats()['hits']
+        first = self.get(hotel_list, 'limit=5&min_rating=3')
+        # Only the operation log write is left
+        with self.assertNumQueries(1):
+            second = self.get(hotel_list, 'min_rating=3&limit=5')
+
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(response_cache.stats()['hits'], hits + 1)
+
+    def test_writes_invalidate_entries(self):
+        self.assertEqual(self.get(hotel_list, 'limit=5').data['count'], 1)
+        self.assertEqual(self.get(room_list, 'limit=5').data['count'], 1)
+
+        Hotel.objects.bulk_create([Hotel(name="Plaza", address="Street 2", rating=3.0)])
+        self.assertEqual(self.get(hotel_list, 'limit=5').data['count'], 2)
+
+        Room.objects.filter(hotel=self.hotel).update(capacity=3)
+        self.assertEqual(self.get(room_list, 'limit=5').data['results'][0]['capacity'], 3)
+
+        # Deleting a hotel cascades to its rooms
+        self.hotel.delete()
+        self.assertEqual(self.get(room_list, 'limit=5').data['count'], 0)
+
+    def test_errors_are_not_cached(self):
+        hits = response_cache.stats()['views'].get('room_list', {}).get('hits', 0)
+        self.assertEqual(self.get(room_list, 'number=abc').status_code, 400)
+        self.assertEqual(self.get(room_list, 'number=abc').status_code, 400)
+        self.assertEqual(response_cache.stats()['views']['room_list']['hits'], hits)
@@ -0,0 +1,78 @@
+###################
+# IMPORTS SECTION #
+###################
+from datetime import date
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from bookings import search
+from bookings.models import Booking, BookingUser
+from bookings.views import booking_list
+
+
+#################
+# TESTS SECTION #
+#################
+class TestBookingSearch(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = BookingUser.objects.create_user(username="tester", password="secret")
+        self.ion = self.create("Ion Popescu", "ion@popescu.ro", "0722333444")
+        self.maria = self.create("Maria Ionescu", "maria@ionescu.ro", "0733445566")
+        self.ana = self.create("Ana Iacob", "ana@iacob.ro", "0744556677")
+
+    def create(self, name, email, phone):
+        return Booking.objects.create(
+            customerName=name, customerEmail=email, customerPhone=phone,
+            startDate=date(2025, 1, 1), endDate=date(2025, 1, 5),
+        )
+
+    def ids(self, queryset):
+        return set(queryset.values_list('id', flat=True))
+
+    def test_index_is_created_by_migrations(self):
+        self.assertTrue(search.is_available())
+
+    def test_filter_matches_icontains(self):
+        for field, value in [('customerName', 'IONESCU'), ('customerEmail', 'iacob'), ('customerPhone', '0733'),
+                             ('customerName', 'io'), ('customerName', 'a_a')]:
+            self.assertEqual(
+                self.ids(search.filter_contains(Booking.objects.all(), field, value)),
+                self.ids(Booking.objects.filter(**{f'{field}__icontains': value})),
+            )
+
+    def test_index_follows_updates_and_deletes(self):
+        self.ion.customerName = "Vasile Pop"
+        self.ion.save()
+        self.assertEqual(self.ids(search.filter_contains(Booking.objects.all(), 'customerName', 'vasile')), {self.ion.id})
+        self.assertEqual(self.ids(search.filter_contains(Booking.objects.all(), 'customerName', 'popescu')), set())
+
+        Booking.objects.filter(pk=self.ana.pk).delete()
+        self.assertEqual(self.ids(search.filter_contains(Booking.objects.all(), 'customerEmail', 'iacob')), set())
+
+    def test_full_text_search_ranks_matches(self):
+        self.create("Ion Ionescu", "ion@ionescu.ro", "0755000000")
+        request = self.factory.get('/bookings/', {'q': 'ionescu'})
+        force_authenticate(request, user=self.user)
+        response = booking_list(request)
+
+        names = [row['customerName'] for row in response.data['results']]
+        self.assertEqual(set(names), {"Maria Ionescu", "Ion Ionescu"})
+        # The booking matching in both name and email ranks first
+        self.assertEqual(names[0], "Ion Ionescu")
+
+    def test_full_text_search_keeps_short_terms(self):
+        self.assertEqual(self.ids(search.search(Booking.objects.all(), 'ion po')), {self.ion.id})
+
+    def test_full_text_search_matches_once_per_query(self):
+        request = self.factory.get('/bookings/', {'q': 'ionescu'})
+        force_authenticate(request, user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            booking_list(request)
+
+        searches = [query['sql'] for query in queries.captured_queries if 'MATCH' in query['sql']]
+        self.assertTrue(searches)
+        for sql in searches:
+            # Neither a correlated rank subquery nor a separate id subquery evaluating it again
+            self.assertEqual(sql.count('MATCH'), 1, sql)
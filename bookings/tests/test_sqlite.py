@@ -0,0 +1,83 @@
+###################
+# IMPORTS SECTION #
+###################
+import os
+import sqlite3
+import tempfile
+from django.db import OperationalError, connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import TestCase
+from bookings.sqlite import SQLiteTuner
+
+
+#################
+# TESTS SECTION #
+#################
+class TestSQLiteProfile(TestCase):
+    def test_profile_applied_to_connections(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA temp_store')
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+    def test_file_database_switches_to_wal(self):
+        tuner = SQLiteTuner(pragmas={'journal_mode': 'wal', 'synchronous': 'normal'}, optimize_interval=0)
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': os.path.join(directory, 'db.sqlite3')})
+            wrapper.ensure_connection()
+            tuner.connection_created(sender=DatabaseWrapper, connection=wrapper)
+            with wrapper.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                self.assertEqual(cursor.fetchone()[0], 'wal')
+                cursor.execute('PRAGMA synchronous')
+                self.assertEqual(cursor.fetchone()[0], 1)
+            self.assertIn(tuner.retry_locked, wrapper.execute_wrappers)
+            self.assertEqual(tuner.stats()['optimizations'], 1)
+            wrapper.close()
+
+    def test_default_profile_leaves_connections_alone(self):
+        tuner = SQLiteTuner(profile='default', pragmas={'busy_timeout': 1})
+        tuner.connection_created(sender=DatabaseWrapper, connection=connection)
+        self.assertNotIn(tuner.retry_locked, connection.execute_wrappers)
+        self.assertEqual(tuner.stats()['connections'], 0)
+
+
+class TestLockRetries(TestCase):
+    def setUp(self):
+        self.tuner = SQLiteTuner(lock_retries=3, retry_delay=0)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'db.sqlite3')
+        self.wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': self.path})
+        with self.wrapper.cursor() as cursor:
+            # Fail right away instead of waiting for the lock, only this tuner retries
+            cursor.execute('PRAGMA busy_timeout = 0')
+            cursor.execute('CREATE TABLE item (id INTEGER PRIMARY KEY)')
+        self.wrapper.execute_wrappers[:] = [self.tuner.retry_locked]
+
+        # Another process holding the write lock
+        self.holder = sqlite3.connect(self.path, isolation_level=None)
+        self.holder.execute('BEGIN IMMEDIATE')
+
+    def tearDown(self):
+        self.holder.close()
+        self.wrapper.close()
+        self.directory.cleanup()
+
+    def test_autocommit_write_is_retried_until_the_lock_is_released(self):
+        def release(execute, sql, params, many, context):
+            if self.tuner.stats()['lock_retries'] == 2 and self.holder.in_transaction:
+                self.holder.execute('COMMIT')
+            return execute(sql, params, many, context)
+
+        self.wrapper.execute_wrappers.append(release)
+        with self.wrapper.cursor() as cursor:
+            cursor.execute('INSERT INTO item (id) VALUES (1)')
+        self.assertEqual(self.tuner.stats()['lock_retries'], 2)
+        self.assertEqual(self.holder.execute('SELECT count(*) FROM item').fetchone()[0], 1)
+
+    def test_gives_up_after_the_retries(self):
+        with self.assertRaises(OperationalError), self.wrapper.cursor() as cursor:
+            cursor.execute('INSERT INTO item (id) VALUES (1)')
+        self.assertEqual(self.tuner.stats()['lock_retries'], 3)
+        self.assertEqual(self.tuner.stats()['lock_failures'], 1)
@@ -0,0 +1,50 @@
+###################
+# IMPORTS SECTION #
+###################
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase, TransactionTestCase
+from bookings.models import Booking
+from bookings.traffic import SYNTHETIC_EMAIL, ModelTarget, TrafficGenerator, parse_mix
+
+
+#################
+# TESTS SECTION #
+#################
+class TestMix(SimpleTestCase):
+    def test_weights_are_parsed(self):
+        self.assertEqual(parse_mix('create=3, update=1,delete=0'), {'create': 3.0, 'update': 1.0})
+
+    def test_bad_mixes_are_rejected(self):
+        for text in ['create=x', 'insert=1', 'create=-1', 'create=0']:
+            with self.assertRaises(ValueError):
+                parse_mix(text)
+
+
+class TestTrafficGenerator(TransactionTestCase):
+    # The workers write from their own threads, hence committed data
+    def test_runs_the_mix_at_the_target_rate(self):
+        Booking.objects.create(
+            customerName='Real', customerEmail='real@example.com', customerPhone='0711',
+            startDate='2025-01-01', endDate='2025-01-02', state='PENDING',
+        )
+        generator = TrafficGenerator(ModelTarget(), rate=200, mix=parse_mix('create=2,update=1,delete=1'), workers=2)
+        stats = generator.run(duration=0.5)
+
+        self.assertEqual(stats['errors'], 0)
+        self.assertGreater(stats['completed'], 50)
+        self.assertTrue(all(stats['operations'][operation]['count'] for operation in ('create', 'update', 'delete')))
+        self.assertIsNotNone(stats['latency_ms'])
+        # Only the generated bookings are touched, and the pool follows the table
+        self.assertTrue(Booking.objects.filter(customerEmail='real@example.com').exists())
+        self.assertEqual(Booking.objects.filter(customerEmail=SYNTHETIC_EMAIL).count(), stats['bookings'])
+
+    def test_command_reports_and_cleans_up(self):
+        out = StringIO()
+        call_command('generate_traffic', rate=100, duration=0.3, mix='create=1', cleanup=True, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('operations', output)
+        self.assertIn('p99', output)
+        self.assertIn('Cleaned up', output)
+        self.assertFalse(Booking.objects.filter(customerEmail=SYNTHETIC_EMAIL).exists())
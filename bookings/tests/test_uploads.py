@@ -0,0 +1,163 @@
+###################
+# IMPORTS SECTION #
+###################
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from bookings.models import BookingUser
+from bookings.uploads import OffsetMismatch, upload_store
+
+
+#################
+# TESTS SECTION #
+#################
+class TestResumableUploads(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name)
+        self.settings_override.enable()
+        self.client = APIClient()
+        self.client.force_authenticate(BookingUser.objects.create_user(username="tester", password="secret"))
+        self.content = os.urandom(300_000)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media.cleanup()
+
+    def start(self, filename, content, **extra):
+        response = self.client.post('/uploads/', {'filename': filename, 'size': len(content), **extra}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def put(self, upload_id, offset, chunk):
+        return self.client.put(
+            f'/uploads/{upload_id}/?offset={offset}', data=chunk, content_type='application/octet-stream'
+        )
+
+    def stored(self, filename):
+        with open(os.path.join(self.media.name, 'uploads', filename), 'rb') as file:
+            return file.read()
+
+    def test_chunks_resume_from_the_stored_offset(self):
+        upload = self.start('hotel.jpg', self.content)
+        self.assertEqual(self.put(upload['id'], 0, self.content[:100_000]).json(), {'offset': 100_000})
+
+        # A retried or out of order chunk is refused with the offset to resume from
+        response = self.put(upload['id'], 0, self.content[:100_000])
+        self.assertEqual((response.status_code, response.json()['offset']), (409, 100_000))
+        self.assertEqual(self.client.get(f"/uploads/{upload['id']}/").json()['offset'], 100_000)
+        self.assertEqual(self.client.post(f"/uploads/{upload['id']}/commit/").status_code, 409)
+
+        self.put(upload['id'], 100_000, self.content[100_000:])
+        response = self.client.post(f"/uploads/{upload['id']}/commit/")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['sha256'], hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(self.stored('hotel.jpg'), self.content)
+        self.assertEqual(self.client.get(f"/uploads/{upload['id']}/").status_code, 404)
+
+    def test_chunks_need_a_length(self):
+        upload = self.start('hotel.jpg', self.content)
+        response = self.client.put(
+            f"/uploads/{upload['id']}/?offset=0", data=self.content, content_type='application/octet-stream',
+            CONTENT_LENGTH='', HTTP_TRANSFER_ENCODING='chunked',
+        )
+        self.assertEqual(response.status_code, 411)
+        self.assertEqual(self.client.get(f"/uploads/{upload['id']}/").json()['offset'], 0)
+
+    def test_concurrent_chunks_at_one_offset(self):
+        upload = self.start('hotel.jpg', self.content)
+        other = {}
+
+        def write_other():
+            try:
+                other['offset'] = upload_store.write(upload['id'], 0, _Stream(b'x' * 1000), 1000)
+            except OffsetMismatch as error:
+                other['error'] = error
+
+        class Racing(_Stream):
+            # The other chunk starts while this one is being written
+            def read(self, size):
+                if not hasattr(self, 'thread'):
+                    self.thread = threading.Thread(target=write_other)
+                    self.thread.start()
+                    time.sleep(0.2)
+                return super().read(size)
+
+        stream = Racing(self.content[:100_000])
+        self.assertEqual(upload_store.write(upload['id'], 0, stream, 100_000), 100_000)
+        stream.thread.join()
+        self.assertEqual((other.get('offset'), other['error'].offset), (None, 100_000))
+
+        self.put(upload['id'], 100_000, self.content[100_000:])
+        response = self.client.post(f"/uploads/{upload['id']}/commit/")
+        self.assertEqual(response.json()['sha256'], hashlib.sha256(self.content).hexdigest())
+
+    def test_concurrent_commits(self):
+        upload = self.start('hotel.jpg', self.content)
+        self.put(upload['id'], 0, self.content)
+        store, other = upload_store._store, {}
+
+        def commit_other():
+            other['response'] = self.client.post(f"/uploads/{upload['id']}/commit/")
+
+        def racing_store(*args):
+            # The other commit starts while this one is being stored
+            if 'thread' not in other:
+                other['thread'] = threading.Thread(target=commit_other)
+                other['thread'].start()
+                time.sleep(0.2)
+            return store(*args)
+
+        committed = upload_store.stats()['committed']
+        with mock.patch.object(upload_store, '_store', side_effect=racing_store):
+            self.assertEqual(self.client.post(f"/uploads/{upload['id']}/commit/").status_code, 201)
+            other['thread'].join()
+        self.assertEqual(other['response'].status_code, 404)
+        self.assertEqual(upload_store.stats()['committed'], committed + 1)
+        self.assertEqual(self.stored('hotel.jpg'), self.content)
+
+    def test_same_content_is_stored_once(self):
+        digest = hashlib.sha256(self.content).hexdigest()
+        first = self.client.post(
+            '/upload/hotel1.jpg/', {'file': SimpleUploadedFile('hotel1.jpg', self.content)}, format='multipart'
+        ).json()
+        self.assertEqual((first['sha256'], first['deduplicated']), (digest, False))
+
+        # Known content: named without being sent again
+        second = self.start('copy.jpg', self.content, sha256=digest)
+        self.assertTrue(second['deduplicated'])
+        self.assertEqual(self.stored('copy.jpg'), self.content)
+        self.assertEqual(upload_store.digest_of('copy.jpg'), digest)
+        self.assertEqual(os.listdir(os.path.join(self.media.name, 'blobs', digest[:2])), [digest])
+
+    def test_content_not_matching_its_hash_is_discarded(self):
+        upload = self.start('hotel.jpg', self.content, sha256='0' * 64)
+        self.put(upload['id'], 0, self.content)
+        self.assertEqual(self.client.post(f"/uploads/{upload['id']}/commit/").status_code, 400)
+        self.assertFalse(os.path.exists(os.path.join(self.media.name, 'uploads', 'hotel.jpg')))
+
+    def test_names_cannot_leave_the_uploads(self):
+        for filename in ['..', '.hidden', 'a/b']:
+            response = self.client.post('/uploads/', {'filename': filename, 'size': 1}, format='json')
+            self.assertEqual(response.status_code, 400, filename)
+        self.assertEqual(self.client.get('/uploads/../').status_code, 404)
+
+
+###################
+# HELPERS SECTION #
+###################
+class _Stream:
+    def __init__(self, content):
+        self.content = content
+        self.position = 0
+
+    def read(self, size):
+        data = self.content[self.position:self.position + size]
+        self.position += len(data)
+        return data
@@ -0,0 +1,330 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import collections
+import http.client
+import json
+import queue
+import random
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+# Django Libraries
+from django.db import connection
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+OPERATIONS = ('create', 'update', 'delete')
+# Marks the generated bookings, only those are updated, deleted and cleaned up
+SYNTHETIC_EMAIL = 'auto@example.com'
+STATES = ('PENDING', 'COMPLETED', 'CANCELLED', 'CONFIRMED')
+FIRST_DAY = date(2025, 1, 1)
+# Latencies kept per operation for the percentiles
+LATENCY_SAMPLES = 100_000
+
+
+###################
+# HELPERS SECTION #
+###################
+def parse_mix(text):
+    """
+    :param text: Operation weights, e.g. "create=60,update=30,delete=10".
+    :return: {operation: weight} of the positive weights.
+    :raises ValueError: On an unknown operation or a bad weight.
+    """
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}, expected one of {OPERATIONS}")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise ValueError(f"The weight of {name} must be a number")
+        if mix[name] < 0:
+            raise ValueError(f"The weight of {name} must not be negative")
+    mix = {name: weight for name, weight in mix.items() if weight}
+    if not mix:
+        raise ValueError("The mix needs at least one positive weight")
+    return mix
+
+
+def booking_data(index):
+    start = FIRST_DAY + timedelta(days=random.randrange(365))
+    return {
+        'customerName': f'Auto Generated{index}',
+        'customerEmail': SYNTHETIC_EMAIL,
+        'customerPhone': f'07{random.randrange(10 ** 8):08}',
+        'startDate': start.isoformat(),
+        'endDate': (start + timedelta(days=random.randint(1, 14))).isoformat(),
+        'state': random.choice(STATES),
+    }
+
+
+def booking_changes():
+    return {'state': random.choice(STATES), 'customerPhone': f'07{random.randrange(10 ** 8):08}'}
+
+
+def _percentiles(latencies):
+    if not latencies:
+        return None
+    latencies = sorted(latencies)
+    return {
+        'p50': latencies[len(latencies) // 2],
+        'p95': latencies[int(len(latencies) * 0.95)],
+        'p99': latencies[int(len(latencies) * 0.99)],
+        'max': latencies[-1],
+    }
+
+
+###################
+# TARGETS SECTION #
+###################
+class ModelTarget:
+    """
+    Writes through the Booking model, so the model signals (and the websocket subscribers) see them.
+    """
+    name = 'orm'
+
+    def existing(self):
+        from bookings.models import Booking
+        return [str(pk) for pk in Booking.objects.filter(customerEmail=SYNTHETIC_EMAIL).values_list('pk', flat=True)]
+
+    def create(self, data):
+        from bookings.models import Booking
+        return str(Booking.objects.create(**data).pk)
+
+    def update(self, pk, changes):
+        from bookings.models import Booking
+        return Booking.objects.filter(pk=pk).update(**changes) == 1
+
+    def delete(self, pk):
+        from bookings.models import Booking
+        deleted, _ = Booking.objects.filter(pk=pk).delete()
+        return deleted == 1
+
+    def close(self):
+        # Each worker thread opened its own connection
+        connection.close()
+
+
+class HttpTarget:
+    """
+    Writes through the booking API of a running server, one keep-alive connection per worker thread.
+    """
+    name = 'http'
+
+    def __init__(self, url, token=None):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError("The API url must start with http:// or https://")
+        self.scheme, self.host = parts.scheme, parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.headers = {'Content-Type': 'application/json'}
+        if token:
+            self.headers['Authorization'] = f'Token {token}'
+        self._local = threading.local()
+
+    def _request(self, method, path, body=None):
+        connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        for attempt in range(2):
+            if getattr(self._local, 'connection', None) is None:
+                self._local.connection = connection_class(self.host, timeout=30)
+            try:
+                self._local.connection.request(
+                    method, self.prefix + path, None if body is None else json.dumps(body), self.headers
+                )
+                response = self._local.connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed the kept-alive connection, retry once on a new one
+                self.close()
+                if attempt:
+                    raise
+
+    def existing(self):
+        return []
+
+    def create(self, data):
+        status, body = self._request('POST', '/bookings/', data)
+        return json.loads(body)['id'] if status == 201 else None
+
+    def update(self, pk, changes):
+        return self._request('PATCH', f'/bookings/{pk}/', changes)[0] == 200
+
+    def delete(self, pk):
+        return self._request('DELETE', f'/bookings/{pk}/')[0] == 204
+
+    def close(self):
+        if getattr(self._local, 'connection', None) is not None:
+            self._local.connection.close()
+            self._local.connection = None
+
+
+#####################
+# GENERATOR SECTION #
+#####################
+class TrafficGenerator:
+    """
+    Synthetic booking writes at a target rate, for soak tests of the write path and the websocket.
+
+    Operations are drawn from the mix and scheduled open-loop, every 1/rate seconds whatever the
+    previous ones took, and run by a pool of worker threads. Latencies are counted from the scheduled
+    time, so a target falling behind shows as latency rather than as a silently lower rate.
+
+    Updates and deletes only pick bookings carrying SYNTHETIC_EMAIL: the ones created so far and,
+    through the ORM, those left by earlier runs. With none left, a create is run instead.
+    """
+
+    def __init__(self, target, rate=10.0, mix=None, workers=4, queue_size=1000):
+        if rate <= 0:
+            raise ValueError("The rate must be positive")
+        if workers < 1:
+            raise ValueError("At least one worker is needed")
+
+        self.target = target
+        self.rate = rate
+        self.mix = mix or parse_mix('create=60,update=30,delete=10')
+        self.workers = workers
+
+        self._pending = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._bookings = []
+        self._created = 0
+        self.reset()
+
+    def reset(self):
+        """
+        Starts a new measurement window.
+        """
+        with self._lock:
+            self._started = time.monotonic()
+            self._counters = {operation: {'count': 0, 'errors': 0} for operation in OPERATIONS}
+            self._latencies = {operation: collections.deque(maxlen=LATENCY_SAMPLES) for operation in OPERATIONS}
+            self._skipped = 0
+
+    # Booking pool
+
+    def _take(self, remove):
+        with self._lock:
+            if not self._bookings:
+                return None
+            position = random.randrange(len(self._bookings))
+            if not remove:
+                return self._bookings[position]
+            # Swap with the last one, pops stay O(1)
+            self._bookings[position], self._bookings[-1] = self._bookings[-1], self._bookings[position]
+            return self._bookings.pop()
+
+    def _execute(self, operation):
+        """
+        :return: The operation actually run and whether it succeeded.
+        """
+        pk = self._take(remove=operation == 'delete') if operation != 'create' else None
+        if pk is None:
+            with self._lock:
+                self._created += 1
+                index = self._created
+            pk = self.target.create(booking_data(index))
+            if pk is not None:
+                with self._lock:
+                    self._bookings.append(pk)
+            return 'create', pk is not None
+        if operation == 'update':
+            return operation, self.target.update(pk, booking_changes())
+        return operation, self.target.delete(pk)
+
+    # Running
+
+    def _work(self):
+        try:
+            while True:
+                scheduled = self._pending.get()
+                if scheduled is None:
+                    return
+                operation, due = scheduled
+                try:
+                    operation, succeeded = self._execute(operation)
+                except Exception:
+                    succeeded = False
+                latency = (time.monotonic() - due) * 1000
+                with self._lock:
+                    self._counters[operation]['count'] += 1
+                    self._counters[operation]['errors'] += not succeeded
+                    self._latencies[operation].append(latency)
+        finally:
+            self.target.close()
+
+    def run(self, duration=None, report=None, report_interval=10.0):
+        """
+        Generates traffic for duration seconds, or until interrupted when None.
+        :param report: Called with stats() every report_interval seconds.
+        :return: The stats() of the whole run.
+        """
+        with self._lock:
+            self._bookings = self.target.existing()
+        workers = [threading.Thread(target=self._work, daemon=True) for _ in range(self.workers)]
+        for worker in workers:
+            worker.start()
+
+        operations, weights = list(self.mix), list(self.mix.values())
+        self.reset()
+        started = next_report = time.monotonic()
+        deadline = None if duration is None else started + duration
+        sent = 0
+        try:
+            while True:
+                due = started + sent / self.rate
+                if deadline is not None and due >= deadline:
+                    break
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    self._pending.put_nowait((random.choices(operations, weights)[0], due))
+                except queue.Full:
+                    # Too far behind, the schedule moves on without this operation
+                    with self._lock:
+                        self._skipped += 1
+                sent += 1
+
+                if report is not None and time.monotonic() >= next_report + report_interval:
+                    next_report = time.monotonic()
+                    report(self.stats())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for _ in workers:
+                self._pending.put(None)
+            for worker in workers:
+                worker.join()
+        return self.stats()
+
+    def stats(self):
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            operations = {
+                operation: dict(counters, latency_ms=_percentiles(self._latencies[operation]))
+                for operation, counters in self._counters.items()
+            }
+            latencies = [latency for values in self._latencies.values() for latency in values]
+            skipped, bookings = self._skipped, len(self._bookings)
+
+        completed = sum(counters['count'] for counters in operations.values())
+        return {
+            'target': self.target.name,
+            'rate': self.rate,
+            'elapsed': elapsed,
+            'completed': completed,
+            'throughput': completed / elapsed if elapsed else 0.0,
+            'errors': sum(counters['errors'] for counters in operations.values()),
+            'skipped': skipped,
+            'bookings': bookings,
+            'latency_ms': _percentiles(latencies),
+            'operations': operations,
+        }
@@ -0,0 +1,366 @@
+###################
+# IMPORTS SECTION #
+###################
+# Python Libraries
+import contextlib
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+# Django Libraries
+from django.conf import settings
+# Project Libraries
+from bookings import metrics
+
+# Optional: without fcntl (Windows) concurrent chunks and commits of one upload are not serialized
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+# Bytes read from a request or a file at a time
+BUFFER_SIZE = 1024 * 1024
+# Seconds between two purges of the abandoned upload sessions
+PURGE_INTERVAL = 3600
+UPLOAD_ID = re.compile(r'^[0-9a-f]{32}$')
+DIGEST = re.compile(r'^[0-9a-f]{64}$')
+
+
+##################
+# ERRORS SECTION #
+##################
+class OffsetMismatch(ValueError):
+    """
+    A chunk was sent for another offset than the one the upload is at.
+    """
+
+    def __init__(self, offset):
+        super().__init__(f"The upload is at offset {offset}")
+        self.offset = offset
+
+
+#################
+# STORE SECTION #
+#################
+class UploadStore:
+    """
+    Content-addressed storage of the uploaded files, with resumable uploads.
+
+    Every content is stored once, as blobs/<2 hex>/<sha256> under MEDIA_ROOT. A file name is a
+    symbolic link uploads/<name> to its blob, so the same photo uploaded under two names (or twice)
+    takes the space of one, and the name maps to its hash through the link.
+
+    Resumable uploads go through .incoming/: start() records the name and size, write() appends a
+    chunk at the current offset (the size of the partial file, so any worker process can take the
+    next chunk, and a client can resume from status(); the partial file is locked while a chunk is
+    checked and written, two requests cannot both write at it), commit() moves the complete file into its
+    blob. Chunks are hashed as they are written; when they reached another process, commit() reads
+    the file once instead.
+    """
+
+    def __init__(self, root=None, chunk_max_size=64 * 1024 * 1024, session_expiry=24 * 3600):
+        self._root = root
+        self.chunk_max_size = chunk_max_size
+        self.session_expiry = session_expiry
+
+        self._lock = threading.Lock()
+        # Upload id -> (offset, sha256 of the bytes before it) of the chunks written by this process
+        self._hashers = {}
+        self._next_purge = 0.0
+        self._counters = dict.fromkeys(
+            ('sessions', 'chunks', 'bytes', 'committed', 'deduplicated', 'rehashed', 'purged'), 0
+        )
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            chunk_max_size=getattr(settings, 'UPLOAD_CHUNK_MAX_SIZE', 64 * 1024 * 1024),
+            session_expiry=getattr(settings, 'UPLOAD_SESSION_EXPIRY', 24 * 3600),
+        )
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    # Layout
+
+    @property
+    def root(self):
+        return self._root or settings.MEDIA_ROOT
+
+    @property
+    def uploads_dir(self):
+        return os.path.join(self.root, 'uploads')
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, 'blobs', digest[:2], digest)
+
+    def _session_path(self, upload_id, extension):
+        if not UPLOAD_ID.match(upload_id):
+            raise KeyError(upload_id)
+        return os.path.join(self.root, '.incoming', f'{upload_id}.{extension}')
+
+    @staticmethod
+    def check_name(filename):
+        if not filename or filename in ('.', '..') or os.path.basename(filename) != filename or '\0' in filename:
+            raise ValueError("Invalid file name")
+        if filename.startswith('.'):
+            raise ValueError("File names cannot start with a dot")
+        return filename
+
+    def digest_of(self, filename):
+        """
+        :return: The sha256 of a stored file name, None for a file stored before the blobs.
+        """
+        try:
+            target = os.readlink(os.path.join(self.uploads_dir, filename))
+        except OSError:
+            return None
+        digest = os.path.basename(target)
+        return digest if DIGEST.match(digest) else None
+
+    # Whole files
+
+    def save(self, filename, chunks):
+        """
+        Stores a file given as an iterable of bytes, e.g. the chunks of an UploadedFile.
+        :return: See commit().
+        """
+        self.check_name(filename)
+        part = self._session_path(uuid.uuid4().hex, 'part')
+        os.makedirs(os.path.dirname(part), exist_ok=True)
+
+        hasher, size = hashlib.sha256(), 0
+        with open(part, 'wb') as destination:
+            for chunk in chunks:
+                destination.write(chunk)
+                hasher.update(chunk)
+                size += len(chunk)
+        return self._store(part, filename, hasher.hexdigest(), size)
+
+    def link_existing(self, filename, digest, size):
+        """
+        Names an already stored content without receiving it again.
+        :return: See commit(), or None if no blob has that hash and size.
+        """
+        self.check_name(filename)
+        if not DIGEST.match(digest or ''):
+            return None
+        try:
+            if os.path.getsize(self.blob_path(digest)) != size:
+                return None
+        except OSError:
+            return None
+        self._link(filename, digest)
+        self._count('deduplicated')
+        return self._result(filename, digest, size, deduplicated=True)
+
+    # Resumable uploads
+
+    def start(self, filename, size, digest=None):
+        """
+        :param digest: The sha256 the client expects, checked by commit().
+        :return: The new upload, as status() describes it.
+        """
+        self.check_name(filename)
+        if not isinstance(size, int) or size < 0:
+            raise ValueError("size must be a non negative integer")
+        if digest is not None and not DIGEST.match(digest):
+            raise ValueError("sha256 must be 64 lowercase hex digits")
+        self.purge_expired()
+
+        upload_id = uuid.uuid4().hex
+        meta = self._session_path(upload_id, 'json')
+        os.makedirs(os.path.dirname(meta), exist_ok=True)
+        open(self._session_path(upload_id, 'part'), 'wb').close()
+        with open(meta, 'w') as file:
+            json.dump({'filename': filename, 'size': size, 'sha256': digest, 'created': time.time()}, file)
+
+        with self._lock:
+            self._hashers[upload_id] = (0, hashlib.sha256())
+            self._counters['sessions'] += 1
+        return self.status(upload_id)
+
+    def status(self, upload_id):
+        """
+        :return: {"id", "filename", "size", "offset", "chunk_max_size"}, offset being where to resume.
+        :raises KeyError: For an unknown (or committed) upload.
+        """
+        try:
+            with open(self._session_path(upload_id, 'json')) as file:
+                session = json.load(file)
+            offset = os.path.getsize(self._session_path(upload_id, 'part'))
+        except FileNotFoundError:
+            raise KeyError(upload_id)
+        return {
+            'id': upload_id, 'filename': session['filename'], 'size': session['size'], 'offset': offset,
+            'chunk_max_size': self.chunk_max_size,
+        }
+
+    def write(self, upload_id, offset, stream, length):
+        """
+        Appends length bytes read from stream at offset, which must be the upload's current offset.
+        A stream ending early leaves the upload at the bytes it got.
+        :return: The new offset.
+        :raises OffsetMismatch: If the upload is at another offset.
+        """
+        upload = self.status(upload_id)
+        if length > self.chunk_max_size:
+            raise ValueError(f"Chunks are limited to {self.chunk_max_size} bytes")
+        if offset + length > upload['size']:
+            raise ValueError("The chunk goes past the announced size")
+
+        written = 0
+        with self._locked(upload_id, 'r+b') as destination:
+            current = os.fstat(destination.fileno()).st_size
+            if offset != current:
+                raise OffsetMismatch(current)
+
+            with self._lock:
+                hashed_offset, hasher = self._hashers.pop(upload_id, (None, None))
+            if hashed_offset != offset:
+                hasher = None
+
+            destination.seek(offset)
+            while written < length:
+                data = stream.read(min(BUFFER_SIZE, length - written))
+                if not data:
+                    break
+                destination.write(data)
+                if hasher is not None:
+                    hasher.update(data)
+                written += len(data)
+
+            if hasher is not None:
+                with self._lock:
+                    self._hashers[upload_id] = (offset + written, hasher)
+        with self._lock:
+            self._counters['chunks'] += 1
+            self._counters['bytes'] += written
+        return offset + written
+
+    def commit(self, upload_id):
+        """
+        Stores a complete upload under its name.
+        :return: {"filename", "path", "sha256", "size", "deduplicated"}.
+        :raises ValueError: If the upload is incomplete or its content is not the expected one.
+        """
+        with self._locked(upload_id, 'rb') as part_file:
+            upload = self.status(upload_id)
+            if upload['offset'] != upload['size']:
+                raise OffsetMismatch(upload['offset'])
+            with open(self._session_path(upload_id, 'json')) as file:
+                expected = json.load(file)['sha256']
+
+            with self._lock:
+                hashed_offset, hasher = self._hashers.pop(upload_id, (None, None))
+            if hashed_offset != upload['size']:
+                # Some chunks were written by another process
+                hasher = hashlib.sha256()
+                for data in iter(lambda: part_file.read(BUFFER_SIZE), b''):
+                    hasher.update(data)
+                self._count('rehashed')
+
+            digest = hasher.hexdigest()
+            if expected is not None and digest != expected:
+                self.abort(upload_id)
+                raise ValueError("The uploaded content does not match its sha256, the upload was discarded")
+
+            result = self._store(self._session_path(upload_id, 'part'), upload['filename'], digest, upload['size'])
+            os.remove(self._session_path(upload_id, 'json'))
+        return result
+
+    @contextlib.contextmanager
+    def _locked(self, upload_id, mode):
+        """
+        Opens an upload's partial file, locked until it is closed.
+        :raises KeyError: For an unknown upload, or one committed or aborted before the lock was held.
+        """
+        try:
+            part_file = open(self._session_path(upload_id, 'part'), mode)
+        except FileNotFoundError:
+            raise KeyError(upload_id)
+        with part_file:
+            if fcntl is not None:
+                fcntl.flock(part_file, fcntl.LOCK_EX)
+            # The file may have become a blob meanwhile
+            if not os.path.exists(self._session_path(upload_id, 'json')):
+                raise KeyError(upload_id)
+            yield part_file
+
+    def abort(self, upload_id):
+        with self._lock:
+            self._hashers.pop(upload_id, None)
+        for extension in ('part', 'json'):
+            try:
+                os.remove(self._session_path(upload_id, extension))
+            except FileNotFoundError:
+                pass
+
+    def purge_expired(self):
+        """
+        Removes the uploads without a chunk for session_expiry seconds, at most once per PURGE_INTERVAL.
+        """
+        now = time.time()
+        with self._lock:
+            if now < self._next_purge:
+                return
+            self._next_purge = now + PURGE_INTERVAL
+
+        incoming = os.path.join(self.root, '.incoming')
+        if not os.path.isdir(incoming):
+            return
+        last_activity = {}
+        for entry in os.scandir(incoming):
+            upload_id = entry.name.split('.')[0]
+            last_activity[upload_id] = max(last_activity.get(upload_id, 0), entry.stat().st_mtime)
+        for upload_id, modified in last_activity.items():
+            if modified < now - self.session_expiry and UPLOAD_ID.match(upload_id):
+                self.abort(upload_id)
+                self._count('purged')
+
+    # Storing
+
+    def _store(self, part, filename, digest, size):
+        blob = self.blob_path(digest)
+        deduplicated = os.path.exists(blob)
+        if deduplicated:
+            os.remove(part)
+        else:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            os.replace(part, blob)
+        self._link(filename, digest)
+
+        with self._lock:
+            self._counters['committed'] += 1
+            self._counters['deduplicated'] += deduplicated
+        return self._result(filename, digest, size, deduplicated)
+
+    def _link(self, filename, digest):
+        # Swapped in with a rename, readers see the old or the new content
+        os.makedirs(self.uploads_dir, exist_ok=True)
+        temporary = os.path.join(self.uploads_dir, f'.{uuid.uuid4().hex}.tmp')
+        os.symlink(os.path.relpath(self.blob_path(digest), self.uploads_dir), temporary)
+        os.replace(temporary, os.path.join(self.uploads_dir, filename))
+
+    @staticmethod
+    def _result(filename, digest, size, deduplicated):
+        return {
+            'filename': filename, 'path': f'/uploads/{filename}', 'sha256': digest, 'size': size,
+            'deduplicated': deduplicated,
+        }
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+
+upload_store = UploadStore.from_settings()
+metrics.register('uploads', upload_store.stats)
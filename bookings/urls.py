@@ -18,22 +18,41 @@ urlpatterns = [
     # Admin related URL Paths
     path('monitored-users/', views.monitored_users_list, name='monitored_users'),
     path('operation-logs/', views.operation_logs_list, name='operation_logs'),
+    path('metrics/', views.metrics_view, name='metrics'),
 
     # Bookings related URL Paths
     path('bookings/', views.booking_list, name='booking_list'),
+    path('bookings/bulk/', views.booking_bulk, name='booking_bulk'),
+    path('bookings/export/', views.booking_export, name='booking_export'),
     path('bookings/<uuid:pk>/', views.booking_detail, name='booking_detail'),
 
     # Hotels related URL Paths
     path('hotels/', views.hotel_list, name='hotel_list'),
+    path('hotels/bulk/', views.hotel_bulk, name='hotel_bulk'),
+    path('hotels/export/', views.hotel_export, name='hotel_export'),
     path('hotels/<uuid:pk>/', views.hotel_detail, name='hotel_detail'),
 
     # Rooms related URL Paths
     path('rooms/', views.room_list, name='room_list'),
+    path('rooms/bulk/', views.room_bulk, name='room_bulk'),
+    path('rooms/export/', views.room_export, name='room_export'),
     path('rooms/<uuid:pk>/', views.room_detail, name='room_detail'),
+    path('availability/', views.room_availability, name='room_availability'),
+
+    # Async variants of the list and detail reads, for the ASGI application
+    path('async/bookings/', views.booking_list_async, name='booking_list_async'),
+    path('async/bookings/<uuid:pk>/', views.booking_detail_async, name='booking_detail_async'),
+    path('async/hotels/', views.hotel_list_async, name='hotel_list_async'),
+    path('async/hotels/<uuid:pk>/', views.hotel_detail_async, name='hotel_detail_async'),
+    path('async/rooms/', views.room_list_async, name='room_list_async'),
+    path('async/rooms/<uuid:pk>/', views.room_detail_async, name='room_detail_async'),
 
     # Files related URL Paths
     path('files/', views.list_files, name='list_files'),
     path('upload/<str:filename>/', views.upload_file, name='file_upload'),
+    path('uploads/', views.upload_start, name='upload_start'),
+    path('uploads/<str:upload_id>/', views.upload_chunk, name='upload_chunk'),
+    path('uploads/<str:upload_id>/commit/', views.upload_commit, name='upload_commit'),
     path('download/<str:filename>/', views.download_file, name='file_download'),
 
     # Tests related URL Paths
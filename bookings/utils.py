@@ -4,10 +4,12 @@
 # Python Libraries
 from functools import wraps
 
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.contrib.auth import get_user_model
 
 # Project Libraries
-from bookings.models import OperationLog
+from bookings.log_writer import operation_log_writer
+from bookings.monitoring import activity_detector
 
 
 ###########################
@@ -28,51 +30,77 @@ _METHOD_TO_ACTION = {
 ###########################
 ##  DECORATORS  SECTION  ##
 ###########################
+def _log_response(request, response, model_name, kwargs):
+    if 200 <= getattr(response, 'status_code', 0) < 300:
+        method = request.method.upper()
+        if method == 'GET':
+            if 'pk' in kwargs:
+                action = 'RETRIEVE'
+                obj_id = kwargs['pk']
+            else:
+                action = 'LIST'
+                obj_id = 'ALL'
+        elif method in ('PUT', 'PATCH'):
+            action = 'UPDATE'
+            obj_id = kwargs.get('pk') or response.data.get('id')
+        elif method == 'DELETE':
+            action = 'DELETE'
+            obj_id = kwargs.get('pk')
+        elif method == 'POST':
+            action = 'CREATE'
+            obj_id = response.data.get('id')
+        elif method == 'HEAD':
+            action = 'LIST'
+            obj_id = 'ALL'
+        else:
+            action = 'RETRIEVE'
+            obj_id = kwargs.get('pk')
+
+        if request.user.is_authenticated and isinstance(request.user, BookingUser):
+            operation_log_writer.submit(
+                user_id=request.user.pk,
+                model=model_name,
+                object_id=str(obj_id) if obj_id else '',
+                action=action
+            )
+            if activity_detector.enabled:
+                activity_detector.record(request.user.pk)
+
+
 def log_crud(model_name):
     def decorator(func):
+        # Async views hand the logging to a thread, the writer may have to block or write synchronously
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapped(request, *args, **kwargs):
+                response = await func(request, *args, **kwargs)
+                await sync_to_async(_log_response)(request, response, model_name, kwargs)
+                return response
+            return wrapped
+
         @wraps(func)
         def wrapped(request, *args, **kwargs):
             response = func(request, *args, **kwargs)
-
-            if 200 <= getattr(response, 'status_code', 0) < 300:
-                method = request.method.upper()
-                if method == 'GET':
-                    if 'pk' in kwargs:
-                        action = 'RETRIEVE'
-                        obj_id = kwargs['pk']
-                    else:
-                        action = 'LIST'
-                        obj_id = 'ALL'
-                elif method in ('PUT', 'PATCH'):
-                    action = 'UPDATE'
-                    obj_id = kwargs.get('pk') or response.data.get('id')
-                elif method == 'DELETE':
-                    action = 'DELETE'
-                    obj_id = kwargs.get('pk')
-                elif method == 'POST':
-                    action = 'CREATE'
-                    obj_id = response.data.get('id')
-                elif method == 'HEAD':
-                    action = 'LIST'
-                    obj_id = 'ALL'
-                else:
-                    action = 'RETRIEVE'
-                    obj_id = kwargs.get('pk')
-
-                if request.user.is_authenticated and isinstance(request.user, BookingUser):
-                    OperationLog.objects.create(
-                        user=request.user,
-                        model=model_name,
-                        object_id=str(obj_id) if obj_id else '',
-                        action=action
-                    )
-
+            _log_response(request, response, model_name, kwargs)
             return response
         return wrapped
     return decorator
 
 
-
 ###########################
 ##   FUNCTIONS SECTION   ##
 ###########################
+def log_bulk(request, model_name, action, object_ids):
+    """
+    Logs one operation per object touched by a bulk request, handed to the log writer in one go.
+    The activity detector counts the request once.
+    """
+    if request.user.is_authenticated and isinstance(request.user, BookingUser):
+        operation_log_writer.submit_many(
+            user_id=request.user.pk,
+            model=model_name,
+            object_ids=[str(object_id) for object_id in object_ids],
+            action=action
+        )
+        if activity_detector.enabled:
+            activity_detector.record(request.user.pk)
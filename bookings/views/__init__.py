@@ -1,6 +1,8 @@
-from .bookings import booking_detail, booking_list
-from .file_uploads import upload_file, download_file, list_files
-from .hotels import hotel_list, hotel_detail
-from .rooms import room_list, room_detail
+from .availability import room_availability
+from .bookings import booking_bulk, booking_detail, booking_export, booking_list, booking_detail_async, booking_list_async
+from .file_uploads import upload_file, download_file, list_files, upload_start, upload_chunk, upload_commit
+from .hotels import hotel_list, hotel_detail, hotel_bulk, hotel_export, hotel_list_async, hotel_detail_async
+from .metrics import metrics_view
+from .rooms import room_list, room_detail, room_bulk, room_export, room_list_async, room_detail_async
 from .statistics import high_end_hotels_stats_view
 from .users import RegisterView, LoginView, monitored_users_list, operation_logs_list, verify_email
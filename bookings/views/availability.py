@@ -0,0 +1,40 @@
+###################
+# IMPORTS SECTION #
+###################
+# Django Rest Framework Libraries
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+# Project Libraries
+from bookings.availability import available_rooms, parse_range
+from bookings.filters import filter_rooms
+from bookings.models import Room
+from bookings.pagination import paginate, sort_columns
+from bookings.utils import log_crud
+from bookings.views.rooms import ROOM_ORDERINGS, ROOM_PROJECTION
+
+
+#################
+# VIEWS SECTION #
+#################
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@log_crud('Room')
+def room_availability(request):
+    """
+    List the rooms free for the whole stay between "start_date" (check-in)
+    and "end_date" (check-out).
+    Accepts the room list filters (hotel, min_capacity, max_price, number),
+    "fields", ordering and pagination (see bookings.pagination.paginate).
+    """
+    try:
+        start, end = parse_range(request.GET)
+        rooms = filter_rooms(Room.objects.all(), request.GET)
+        projection = ROOM_PROJECTION.select(request.GET.get('fields'))
+        rooms = projection.queryset(available_rooms(start, end, rooms), *sort_columns(ROOM_ORDERINGS))
+        page = paginate(request, rooms, ROOM_ORDERINGS)
+    except ValueError as error:
+        return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(page.data(projection.render(page.rows)))
@@ -1,95 +1,74 @@
 ###################
 # IMPORTS SECTION #
 ###################
+# Django Libraries
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
 # Django Rest Framework Libraries
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
 # Project Libraries
+from bookings.async_api import async_api_view, json_response
+from bookings.bulk import bulk_write
+from bookings.conditional import etag_for, not_modified, precondition_failed
 from bookings.models import Booking
+from bookings.export import export_response
+from bookings.filters import filter_bookings
+from bookings.pagination import apaginate, order_fields, paginate, sort_columns
+from bookings.projection import Projection
+from bookings.replica import reads_from_replica
 from bookings.permissions import IsAuthenticatedExceptHead, IsAuthenticated
 from bookings.serializers import BookingSerializer
 from bookings.utils import log_crud
 
 
+#####################
+# CONSTANTS SECTION #
+#####################
+# Supported "ordering" keys and their keysets, each matching a composite index (the first is the default)
+BOOKING_ORDERINGS = {
+    'startDate': ('startDate', 'endDate', 'id'),
+    'endDate': ('endDate', 'id'),
+    'createdAt': ('createdAt', 'id'),
+    'customerName': ('customerName', 'id'),
+}
+# Serializer-free rendering of the list rows
+BOOKING_PROJECTION = Projection(BookingSerializer)
+
+
 #################
 # VIEWS SECTION #
 #################
 @api_view(['GET', 'POST', 'HEAD'])
 @permission_classes([IsAuthenticatedExceptHead])
 @log_crud('Booking')
+@reads_from_replica
 def booking_list(request):
     """
     List all bookings or create a new booking.
+    GET reads from the replica when it is fresh enough (see bookings.replica).
     Supports filtering via query parameters for every field...
-    Supports sorting via the "ordering" query parameter.
-    Also supports pagination via "limit" and "offset" query parameters.
+    (see bookings.filters.filter_bookings).
+    Supports sorting via the "ordering" query parameter, by one of BOOKING_ORDERINGS.
+    Also supports pagination via "limit" and "offset" query parameters,
+    or keyset pagination via "cursor" (see bookings.pagination.paginate).
+    The "fields" query parameter selects the returned fields.
     """
     if request.method == 'HEAD':
         return Response(status=status.HTTP_200_OK)
 
     if request.method == 'GET':
-        bookings = Booking.objects.all()
-
-        # Filtering by all fields:
-        id_query = request.GET.get("id", "")
-        if id_query:
-            bookings = bookings.filter(id=id_query)
-
-        name_query = request.GET.get("name", "")
-        if name_query:
-            bookings = bookings.filter(customerName__icontains=name_query)
-
-        email_query = request.GET.get("email", "")
-        if email_query:
-            bookings = bookings.filter(customerEmail__icontains=email_query)
-
-        phone_query = request.GET.get("phone", "")
-        if phone_query:
-            bookings = bookings.filter(customerPhone__icontains=phone_query)
-
-        start_date_query = request.GET.get("start_date", "")
-        if start_date_query:
-            bookings = bookings.filter(startDate__gte=start_date_query)
-
-        end_date_query = request.GET.get("end_date", "")
-        if end_date_query:
-            bookings = bookings.filter(endDate__lte=end_date_query)
-
-        state_query = request.GET.get("state", "")
-        if state_query:
-            bookings = bookings.filter(state=state_query)
-
-        created_at_query = request.GET.get("created_at", "")
-        if created_at_query:
-            bookings = bookings.filter(createdAt=created_at_query)
-
-        completed_at_query = request.GET.get("completed_at", "")
-        if completed_at_query:
-            bookings = bookings.filter(completedAt=completed_at_query)
-
-        # Sorting:
-        ordering = request.GET.get("ordering", "")
-        if ordering:
-            bookings = bookings.order_by(ordering)
+        bookings = filter_bookings(Booking.objects.all(), request.GET)
 
-        # Pagination: read limit and offset, with sensible defaults
+        # Sorting and pagination
         try:
-            limit = int(request.GET.get("limit", 10))
-            offset = int(request.GET.get("offset", 0))
-        except ValueError:
-            return Response({"error": "limit and offset must be integers"},
-                            status=status.HTTP_400_BAD_REQUEST)
-
-        total = bookings.count()
-        bookings = bookings[offset:offset + limit]
-
-        serializer = BookingSerializer(bookings, many=True)
-        return Response({
-            "count": total,
-            "results": serializer.data,
-            "next_offset": offset + limit if offset + limit < total else None,
-        })
+            projection = BOOKING_PROJECTION.select(request.GET.get("fields"))
+            page = paginate(request, projection.queryset(bookings, *sort_columns(BOOKING_ORDERINGS)), BOOKING_ORDERINGS)
+        except ValueError as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(page.data(projection.render(page.rows)))
 
     elif request.method == 'POST':
         serializer = BookingSerializer(data=request.data)
@@ -99,36 +78,130 @@ def booking_list(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST', 'PATCH', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def booking_bulk(request):
+    """
+    Creates (POST), updates (PATCH) or deletes (DELETE) many bookings in one
+    transaction (see bookings.bulk.bulk_write).
+    """
+    return bulk_write(request, Booking, BookingSerializer)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@log_crud('Booking')
+def booking_export(request):
+    """
+    Streams every booking matching the booking list filters.
+    The "output" query parameter selects ndjson (default) or csv, "fields" the exported fields
+    and "ordering" the sort key, as for the list.
+    """
+    bookings = filter_bookings(Booking.objects.all(), request.GET)
+    try:
+        projection = BOOKING_PROJECTION.select(request.GET.get("fields"))
+        ordering = order_fields(request.GET, BOOKING_ORDERINGS)
+        return export_response(bookings, projection, request.GET.get("output", "ndjson"), "bookings", ordering)
+    except ValueError as error:
+        return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+
 @permission_classes([IsAuthenticated])
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
 @log_crud('Booking')
 def booking_detail(request, pk):
     """
     Retrieve, update (PUT or PATCH) or delete a booking by its primary key.
+    Responses carry an ETag: GET honors If-None-Match (304), writes honor If-Match (412).
+    GET accepts the "fields" query parameter, only those columns are loaded.
     """
+    bookings = Booking.objects.all()
+    if request.method == 'GET':
+        try:
+            projection = BOOKING_PROJECTION.select(request.GET.get("fields"))
+        except ValueError as error:
+            return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        bookings = projection.only(bookings)
+
     try:
-        booking = Booking.objects.get(pk=pk)
+        booking = bookings.get(pk=pk)
     except Booking.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
+    etag = etag_for(booking)
     if request.method == 'GET':
-        serializer = BookingSerializer(booking)
-        return Response(serializer.data)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        serializer = projection.trim(BookingSerializer(booking))
+        return Response(serializer.data, headers={'ETag': etag})
+
+    conflict = precondition_failed(request, etag)
+    if conflict:
+        return conflict
 
-    elif request.method == 'PUT':
+    if request.method == 'PUT':
         serializer = BookingSerializer(booking, data=request.data)
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data)
+            return Response(serializer.data, headers={'ETag': etag_for(booking)})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     elif request.method == 'PATCH':
         serializer = BookingSerializer(booking, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data)
+            return Response(serializer.data, headers={'ETag': etag_for(booking)})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     elif request.method == 'DELETE':
         booking.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+#######################
+# ASYNC VIEWS SECTION #
+#######################
+@async_api_view(['GET', 'HEAD'], allow_anonymous=('HEAD',))
+@log_crud('Booking')
+@reads_from_replica
+async def booking_list_async(request):
+    """
+    booking_list's GET and HEAD on the async ORM, for the ASGI application: same filters,
+    search, ordering, "fields" and pagination. Creating bookings stays on booking_list.
+    """
+    if request.method == 'HEAD':
+        return HttpResponse(status=status.HTTP_200_OK)
+
+    # The first search of the process looks the index up
+    bookings = await sync_to_async(filter_bookings)(Booking.objects.all(), request.GET)
+    try:
+        projection = BOOKING_PROJECTION.select(request.GET.get("fields"))
+        page = await apaginate(request, projection.queryset(bookings, *sort_columns(BOOKING_ORDERINGS)), BOOKING_ORDERINGS)
+    except ValueError as error:
+        return json_response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return json_response(page.data(projection.render(page.rows)))
+
+
+@async_api_view(['GET'])
+@log_crud('Booking')
+async def booking_detail_async(request, pk):
+    """
+    booking_detail's GET on the async ORM, with the same "fields" and ETag handling.
+    Updates and deletes stay on booking_detail.
+    """
+    try:
+        projection = BOOKING_PROJECTION.select(request.GET.get("fields"))
+    except ValueError as error:
+        return json_response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        booking = await projection.only(Booking.objects.all()).aget(pk=pk)
+    except Booking.DoesNotExist:
+        return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+
+    etag = etag_for(booking)
+    if not_modified(request, etag):
+        return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return json_response(projection.render_instance(booking), headers={'ETag': etag})
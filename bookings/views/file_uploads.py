@@ -4,14 +4,59 @@
 # Python Libraries
 import os
 # Django Libraries
-from django.conf import settings
-from django.http import FileResponse, Http404, JsonResponse
+from django.http import Http404
 # Django Rest Framework Libraries
 from rest_framework.decorators import api_view, parser_classes, permission_classes
 from rest_framework.parsers import FileUploadParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+# Project Libraries
+from bookings.catalog import file_catalog
+from bookings.derivatives import VARIANTS, image_derivatives
+from bookings.downloads import downloader
+from bookings.filters import filter_files
+from bookings.models import StoredFile
+from bookings.pagination import paginate
+from bookings.uploads import OffsetMismatch, upload_store
+
+
+#####################
+# CONSTANTS SECTION #
+#####################
+# Supported "ordering" keys and their keysets, each matching a catalog index (the first is the default)
+FILE_ORDERINGS = {
+    'name': ('name', 'id'),
+    'modified': ('modified', 'id'),
+    'size': ('size', 'id'),
+}
+FILE_FIELDS = ('id', 'name', 'size', 'modified', 'sha256', 'content_type')
+
+
+###################
+# HELPERS SECTION #
+###################
+def _stored(stored):
+    # Catalogs a file the upload store just stored, and queues its image variants
+    entry = file_catalog.record(stored)
+    image_derivatives.submit(entry.name, entry.sha256, entry.content_type)
+
+
+def _download_variant(request, filename, variant):
+    entry = StoredFile.objects.filter(name=filename).values('sha256', 'content_type').first()
+    if entry is None:
+        raise FileNotFoundError(filename)
+    path = image_derivatives.variant_of(filename, entry['sha256'], entry['content_type'], variant)
+    if path is None:
+        raise FileNotFoundError(filename)
+
+    # The original until the derivative is generated, each with its own validator
+    if path.startswith(image_derivatives.root):
+        stem = os.path.splitext(filename)[0]
+        name, digest = f"{stem}-{variant}.{VARIANTS[variant][2]}", f"{entry['sha256']}-{variant}"
+    else:
+        name, digest = filename, entry['sha256']
+    return downloader.serve(request, path, name, digest=digest, as_attachment=False)
 
 
 #################
@@ -21,14 +66,19 @@ from rest_framework import status
 @permission_classes([IsAuthenticated])
 def list_files(request):
     """
-    :return: Returns the list of filenames from the server
+    :return: Returns a page of the uploaded files, from the file catalog (see bookings.catalog).
+    Supports filtering (see bookings.filters.filter_files), the "ordering" query parameter
+    (one of FILE_ORDERINGS) and limit/offset or cursor pagination (see bookings.pagination.paginate).
+    "files" lists the names of the page's files.
     """
-    upload_dir = os.path.join(settings.MEDIA_ROOT, "uploads")
-    if not os.path.exists(upload_dir):
-        files = []
-    else:
-        files = os.listdir(upload_dir)
-    return JsonResponse({"files": files})
+    try:
+        files = filter_files(StoredFile.objects.values(*FILE_FIELDS), request.GET)
+        page = paginate(request, files, FILE_ORDERINGS)
+    except ValueError as error:
+        return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+    results = list(page.rows)
+    return Response({**page.data(results), "files": [row['name'] for row in results]})
 
 
 @api_view(['POST'])
@@ -38,6 +88,7 @@ def upload_file(request, filename, format=None):
     """
     :input: Request must contain a FILE Object FILES['file']
     :return: Uploads a new file object to the server at MEDIA_ROOT/uploads/
+    Stored by content, see bookings.uploads; large files should use the resumable upload_start.
     """
 
     # Get the uploaded file from request
@@ -46,21 +97,95 @@ def upload_file(request, filename, format=None):
 
     file_obj = request.FILES['file']
 
-    # Upload to settings set file directory
-    upload_dir = os.path.join(settings.MEDIA_ROOT, "uploads")
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, filename)
-
-    # Use Django's file handling to save the file
-    with open(file_path, 'wb') as destination:
-        for chunk in file_obj.chunks():
-            destination.write(chunk)
+    # Hashed while copied into the content store
+    try:
+        stored = upload_store.save(filename, file_obj.chunks())
+    except ValueError as error:
+        return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+    _stored(stored)
 
     # Return successful status
-    return Response({
-        "message": "File uploaded successfully",
-        "path": f"/uploads/{filename}"
-    }, status=status.HTTP_201_CREATED)
+    return Response({"message": "File uploaded successfully", **stored}, status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def upload_start(request):
+    """
+    Starts a resumable upload of {"filename", "size", "sha256" (optional)}.
+    :return: The upload (id, offset, chunk_max_size) to PUT the chunks to, or the stored file
+    right away when a file with that sha256 and size is stored already.
+    """
+    filename, size, digest = request.data.get("filename"), request.data.get("size"), request.data.get("sha256")
+    try:
+        if digest:
+            stored = upload_store.link_existing(filename, digest, size)
+            if stored is not None:
+                _stored(stored)
+                return Response({"message": "File uploaded successfully", **stored}, status=status.HTTP_201_CREATED)
+        upload = upload_store.start(filename, size, digest)
+    except ValueError as error:
+        return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(upload, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def upload_chunk(request, upload_id):
+    """
+    GET returns the upload's offset, where to resume after a failure.
+    PUT appends the raw request body at the "offset" query parameter, streamed to disk.
+    DELETE abandons the upload.
+    """
+    try:
+        if request.method == 'GET':
+            return Response(upload_store.status(upload_id))
+
+        if request.method == 'DELETE':
+            upload_store.status(upload_id)
+            upload_store.abort(upload_id)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        # A chunked body has no length to check against the upload before reading it
+        if not request.META.get("CONTENT_LENGTH"):
+            return Response({"error": "Content-Length is required"}, status=status.HTTP_411_LENGTH_REQUIRED)
+        try:
+            offset = int(request.GET.get("offset", ""))
+        except ValueError:
+            return Response({"error": "offset must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            length = int(request.META["CONTENT_LENGTH"])
+        except ValueError:
+            return Response({"error": "Content-Length must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        # The body is never parsed, only read through
+        offset = upload_store.write(upload_id, offset, request._request, length)
+        return Response({"offset": offset})
+
+    except KeyError:
+        return Response({"error": "Unknown upload"}, status=status.HTTP_404_NOT_FOUND)
+    except OffsetMismatch as error:
+        return Response({"error": str(error), "offset": error.offset}, status=status.HTTP_409_CONFLICT)
+    except ValueError as error:
+        return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def upload_commit(request, upload_id):
+    """
+    Stores a complete upload under its file name, once per distinct content.
+    :return: The stored file (filename, path, sha256, size, deduplicated).
+    """
+    try:
+        stored = upload_store.commit(upload_id)
+    except KeyError:
+        return Response({"error": "Unknown upload"}, status=status.HTTP_404_NOT_FOUND)
+    except OffsetMismatch as error:
+        return Response({"error": "The upload is incomplete", "offset": error.offset}, status=status.HTTP_409_CONFLICT)
+    except ValueError as error:
+        return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+    _stored(stored)
+    return Response({"message": "File uploaded successfully", **stored}, status=status.HTTP_201_CREATED)
 
 
 @api_view(['GET'])
@@ -68,15 +193,24 @@ def upload_file(request, filename, format=None):
 def download_file(request, filename):
     """
     :return: Returns the file with the given filename from the server
+    Honors Range, If-Range, If-None-Match and If-Modified-Since, and may hand the transfer
+    to the front proxy (see bookings.downloads).
+    The "variant" query parameter selects a smaller rendition of an image (see bookings.derivatives),
+    served inline.
     """
+    variant = request.GET.get('variant')
+    if variant and variant not in VARIANTS:
+        return Response({"error": f"variant must be one of: {', '.join(VARIANTS)}"}, status=status.HTTP_400_BAD_REQUEST)
 
     # Get file from settings designated path
-    file_path = os.path.join(settings.MEDIA_ROOT, "uploads", filename)
-
-    # File was Found
-    if os.path.exists(file_path):
-        return FileResponse(open(file_path, 'rb'), as_attachment=True)
+    try:
+        upload_store.check_name(filename)
+        if variant:
+            return _download_variant(request, filename, variant)
+        file_path = os.path.join(upload_store.uploads_dir, filename)
+        return downloader.serve(request, file_path, filename, digest=upload_store.digest_of(filename))
 
     # File not Found
-    else:
+    except (ValueError, FileNotFoundError, IsADirectoryError):
         raise Http404("File not found")
+
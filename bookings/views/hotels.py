@@ -1,59 +1,70 @@
 ###################
 # IMPORTS SECTION #
 ###################
+# Django Libraries
+from django.http import HttpResponse
 # Django Rest Framework Libraries
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 # Project Libraries
+from bookings.async_api import async_api_view, json_response
+from bookings.bulk import bulk_write
+from bookings.conditional import etag_for, not_modified, precondition_failed
 from bookings.models import Hotel
+from bookings.export import export_response
+from bookings.filters import filter_hotels
+from bookings.pagination import apaginate, order_fields, paginate, sort_columns
+from bookings.projection import Projection
+from bookings.replica import reads_from_replica
+from bookings.response_cache import response_cache
 from bookings.serializers import HotelSerializer
 from bookings.utils import log_crud
 
 
+#####################
+# CONSTANTS SECTION #
+#####################
+# Supported "ordering" keys and their keysets, each matching an index (the first is the default)
+HOTEL_ORDERINGS = {
+    'name': ('name', 'id'),
+    'rating': ('rating', 'id'),
+}
+# Serializer-free rendering of the list rows
+HOTEL_PROJECTION = Projection(HotelSerializer)
+
+
 #################
 # VIEWS SECTION #
 #################
 @api_view(['GET', 'POST', 'HEAD'])
 @permission_classes([IsAuthenticated])
 @log_crud('Hotel')
+@reads_from_replica
+@response_cache.cached('hotel_list', ('hotel',))
 def hotel_list(request):
     """
     List all hotels or create a new hotel.
+    GET reads from the replica when it is fresh enough (see bookings.replica).
+    Supports sorting via the "ordering" query parameter, by one of HOTEL_ORDERINGS.
+    The "fields" query parameter selects the returned fields.
+    GET responses are cached until the next Hotel write (see bookings.response_cache).
     """
     if request.method == 'HEAD':
         return Response(status=status.HTTP_200_OK)
 
     if request.method == 'GET':
-        hotels = Hotel.objects.all()
-
-        # Optional filtering by name or rating
-        name = request.GET.get('name')
-        if name:
-            hotels = hotels.filter(name__icontains=name)
-
-        min_rating = request.GET.get('min_rating')
-        if min_rating:
-            hotels = hotels.filter(rating__gte=min_rating)
-
-        # Sorting
-        ordering = request.GET.get('ordering')
-        if ordering:
-            hotels = hotels.order_by(ordering)
+        hotels = filter_hotels(Hotel.objects.all(), request.GET)
 
-        # Pagination
+        # Sorting and pagination
         try:
-            limit = int(request.GET.get('limit', 10))
-            offset = int(request.GET.get('offset', 0))
-        except ValueError:
-            return Response({'error': 'limit and offset must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+            projection = HOTEL_PROJECTION.select(request.GET.get('fields'))
+            page = paginate(request, projection.queryset(hotels, *sort_columns(HOTEL_ORDERINGS)), HOTEL_ORDERINGS)
+        except ValueError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
 
-        total = hotels.count()
-        hotels = hotels[offset:offset + limit]
-        serializer = HotelSerializer(hotels, many=True)
-        return Response({'count': total, 'results': serializer.data,
-                         'next_offset': offset + limit if offset + limit < total else None})
+        return Response(page.data(projection.render(page.rows)))
 
     # POST
     serializer = HotelSerializer(data=request.data)
@@ -63,30 +74,121 @@ def hotel_list(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST', 'PATCH', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def hotel_bulk(request):
+    """
+    Creates (POST), updates (PATCH) or deletes (DELETE) many hotels in one
+    transaction (see bookings.bulk.bulk_write).
+    """
+    return bulk_write(request, Hotel, HotelSerializer)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@log_crud('Hotel')
+def hotel_export(request):
+    """
+    Streams every hotel matching the hotel list filters.
+    The "output" query parameter selects ndjson (default) or csv, "fields" the exported fields
+    and "ordering" the sort key, as for the list.
+    """
+    hotels = filter_hotels(Hotel.objects.all(), request.GET)
+    try:
+        projection = HOTEL_PROJECTION.select(request.GET.get('fields'))
+        ordering = order_fields(request.GET, HOTEL_ORDERINGS)
+        return export_response(hotels, projection, request.GET.get('output', 'ndjson'), 'hotels', ordering)
+    except ValueError as error:
+        return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
 @permission_classes([IsAuthenticated])
 @log_crud('Hotel')
 def hotel_detail(request, pk):
     """
     Retrieve, update, or delete a hotel by its primary key.
+    Responses carry an ETag: GET honors If-None-Match (304), writes honor If-Match (412).
+    GET accepts the "fields" query parameter, only those columns are loaded.
     """
+    hotels = Hotel.objects.all()
+    if request.method == 'GET':
+        try:
+            projection = HOTEL_PROJECTION.select(request.GET.get('fields'))
+        except ValueError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        hotels = projection.only(hotels)
+
     try:
-        hotel = Hotel.objects.get(pk=pk)
+        hotel = hotels.get(pk=pk)
     except Hotel.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
+    etag = etag_for(hotel)
     if request.method == 'GET':
-        serializer = HotelSerializer(hotel)
-        return Response(serializer.data)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        serializer = projection.trim(HotelSerializer(hotel))
+        return Response(serializer.data, headers={'ETag': etag})
+
+    conflict = precondition_failed(request, etag)
+    if conflict:
+        return conflict
 
     if request.method in ['PUT', 'PATCH']:
         partial = (request.method == 'PATCH')
         serializer = HotelSerializer(hotel, data=request.data, partial=partial)
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data)
+            return Response(serializer.data, headers={'ETag': etag_for(hotel)})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     if request.method == 'DELETE':
         hotel.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+#######################
+# ASYNC VIEWS SECTION #
+#######################
+@async_api_view(['GET'])
+@log_crud('Hotel')
+@reads_from_replica
+@response_cache.cached('hotel_list', ('hotel',))
+async def hotel_list_async(request):
+    """
+    hotel_list's GET on the async ORM, for the ASGI application: same filters, ordering,
+    "fields", pagination and cache entries. Creating hotels stays on hotel_list.
+    """
+    try:
+        hotels = filter_hotels(Hotel.objects.all(), request.GET)
+        projection = HOTEL_PROJECTION.select(request.GET.get('fields'))
+        page = await apaginate(request, projection.queryset(hotels, *sort_columns(HOTEL_ORDERINGS)), HOTEL_ORDERINGS)
+    except ValueError as error:
+        return json_response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return json_response(page.data(projection.render(page.rows)))
+
+
+@async_api_view(['GET'])
+@log_crud('Hotel')
+async def hotel_detail_async(request, pk):
+    """
+    hotel_detail's GET on the async ORM, with the same "fields" and ETag handling.
+    Updates and deletes stay on hotel_detail.
+    """
+    try:
+        projection = HOTEL_PROJECTION.select(request.GET.get('fields'))
+    except ValueError as error:
+        return json_response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        hotel = await projection.only(Hotel.objects.all()).aget(pk=pk)
+    except Hotel.DoesNotExist:
+        return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+
+    etag = etag_for(hotel)
+    if not_modified(request, etag):
+        return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return json_response(projection.render_instance(hotel), headers={'ETag': etag})
@@ -0,0 +1,21 @@
+###################
+# IMPORTS SECTION #
+###################
+# Django Rest Framework Libraries
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+# Project Libraries
+from bookings import metrics
+from bookings.permissions import IsAdminUserRole
+
+
+#################
+# VIEWS SECTION #
+#################
+@api_view(['GET'])
+@permission_classes([IsAdminUserRole])
+def metrics_view(request):
+    """
+    Returns the in-process counters of this worker (queues, caches...). Only for admins.
+    """
+    return Response(metrics.collect())
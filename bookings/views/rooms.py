@@ -1,97 +1,86 @@
 ###################
 # IMPORTS SECTION #
 ###################
+# Django Libraries
+from django.http import HttpResponse
 # Django Rest Framework Libraries
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 # Project Libraries
+from bookings.async_api import async_api_view, json_response
+from bookings.bulk import bulk_write
+from bookings.conditional import etag_for, not_modified, precondition_failed
 from bookings.models import Room
+from bookings.export import export_response
+from bookings.filters import filter_rooms
+from bookings.pagination import apaginate, order_fields, paginate, sort_columns
+from bookings.projection import Projection
+from bookings.replica import reads_from_replica
+from bookings.response_cache import response_cache
 from bookings.serializers import RoomSerializer
 from bookings.utils import log_crud
 
 
+#####################
+# CONSTANTS SECTION #
+#####################
+# Supported "ordering" keys and their keysets, each matching a composite index (the first is the default)
+ROOM_ORDERINGS = {
+    'number': ('number', 'id'),
+    'hotel': ('hotel_id', 'price_per_night', 'id'),
+    'price_per_night': ('price_per_night', 'id'),
+    'capacity': ('capacity', 'id'),
+}
+# Serializer-free rendering of the list rows
+ROOM_PROJECTION = Projection(RoomSerializer)
+
+
 #################
 # VIEWS SECTION #
 #################
 @api_view(['GET', 'POST', 'HEAD'])
 @permission_classes([IsAuthenticated])
 @log_crud('Room')
+@reads_from_replica
+@response_cache.cached('room_list', ('room',))
 def room_list(request):
     """
     List all rooms or create a new room.
+    GET reads from the replica when it is fresh enough (see bookings.replica).
+    Supports sorting via the "ordering" query parameter, by one of ROOM_ORDERINGS.
+    The "fields" query parameter selects the returned fields.
+    GET responses are cached until the next Room write (see bookings.response_cache).
     """
     if request.method == 'HEAD':
         return Response(status=status.HTTP_200_OK)
 
     if request.method == 'GET':
 
-        # Select Related Optimization
-        qs = Room.objects.select_related('hotel').all()
-
-        # Exact room number filter
-        number = request.GET.get('number')
-        if number is not None:
-            try:
-                qs = qs.filter(number=int(number))
-            except ValueError:
-                return Response(
-                    {'error': 'number must be an integer'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-        # Hotel filter (as before)
-        hotel_id = request.GET.get('hotel')
-        if hotel_id:
-            qs = qs.filter(hotel__id=hotel_id)
-
-        # Min capacity
-        min_cap = request.GET.get('min_capacity')
-        if min_cap is not None:
-            try:
-                qs = qs.filter(capacity__gte=int(min_cap))
-            except ValueError:
-                return Response(
-                    {'error': 'min_capacity must be an integer'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-        # Max price per night
-        max_price = request.GET.get('max_price')
-        if max_price is not None:
-            try:
-                qs = qs.filter(price_per_night__lte=float(max_price))
-            except ValueError:
-                return Response(
-                    {'error': 'max_price must be a number'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-        # Ordering
-        ordering = request.GET.get('ordering')
-        if ordering:
-            qs = qs.order_by(ordering)
-
-        # Pagination
+        # Only the hotel id is rendered, no join needed
+        qs = Room.objects.all()
+
+        # Number, hotel, min capacity and max price filters
         try:
-            limit = int(request.GET.get('limit', 10))
-            offset = int(request.GET.get('offset', 0))
-        except ValueError:
+            qs = filter_rooms(qs, request.GET)
+        except ValueError as error:
             return Response(
-                {'error': 'limit and offset must be integers'},
+                {'error': str(error)},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        total = qs.count()
-        slice_qs = qs[offset:offset + limit]
-        serializer = RoomSerializer(slice_qs, many=True)
+        # Ordering and pagination
+        try:
+            projection = ROOM_PROJECTION.select(request.GET.get('fields'))
+            page = paginate(request, projection.queryset(qs, *sort_columns(ROOM_ORDERINGS)), ROOM_ORDERINGS)
+        except ValueError as error:
+            return Response(
+                {'error': str(error)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        return Response({
-            'count': total,
-            'results': serializer.data,
-            'next_offset': offset + limit if offset + limit < total else None
-        })
+        return Response(page.data(projection.render(page.rows)))
 
     # POST
     serializer = RoomSerializer(data=request.data)
@@ -101,32 +90,125 @@ def room_list(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST', 'PATCH', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def room_bulk(request):
+    """
+    Creates (POST), updates (PATCH) or deletes (DELETE) many rooms in one
+    transaction (see bookings.bulk.bulk_write).
+    """
+    return bulk_write(request, Room, RoomSerializer)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@log_crud('Room')
+def room_export(request):
+    """
+    Streams every room matching the room list filters.
+    The "output" query parameter selects ndjson (default) or csv, "fields" the exported fields
+    and "ordering" the sort key, as for the list.
+    """
+    try:
+        rooms = filter_rooms(Room.objects.all(), request.GET)
+        projection = ROOM_PROJECTION.select(request.GET.get('fields'))
+        ordering = order_fields(request.GET, ROOM_ORDERINGS)
+        return export_response(rooms, projection, request.GET.get('output', 'ndjson'), 'rooms', ordering)
+    except ValueError as error:
+        return Response(
+            {'error': str(error)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
 @permission_classes([IsAuthenticated])
 @log_crud('Room')
 def room_detail(request, pk):
     """
     Retrieve, update, or delete a room by its primary key.
+    Responses carry an ETag: GET honors If-None-Match (304), writes honor If-Match (412).
+    GET accepts the "fields" query parameter, only those columns are loaded.
     """
-    try:
+    # Only the hotel id is rendered, no need to join the hotel
+    rooms = Room.objects.all()
+    if request.method == 'GET':
+        try:
+            projection = ROOM_PROJECTION.select(request.GET.get('fields'))
+        except ValueError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        rooms = projection.only(rooms)
 
-        # Query optimization - prefetching the hotel too
-        room = Room.objects.select_related('hotel').get(pk=pk)
+    try:
+        room = rooms.get(pk=pk)
     except Room.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
+    etag = etag_for(room)
     if request.method == 'GET':
-        serializer = RoomSerializer(room)
-        return Response(serializer.data)
+        unchanged = not_modified(request, etag)
+        if unchanged:
+            return unchanged
+        serializer = projection.trim(RoomSerializer(room))
+        return Response(serializer.data, headers={'ETag': etag})
+
+    conflict = precondition_failed(request, etag)
+    if conflict:
+        return conflict
 
     if request.method in ['PUT', 'PATCH']:
         partial = (request.method == 'PATCH')
         serializer = RoomSerializer(room, data=request.data, partial=partial)
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data)
+            return Response(serializer.data, headers={'ETag': etag_for(room)})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     if request.method == 'DELETE':
         room.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+#######################
+# ASYNC VIEWS SECTION #
+#######################
+@async_api_view(['GET'])
+@log_crud('Room')
+@reads_from_replica
+@response_cache.cached('room_list', ('room',))
+async def room_list_async(request):
+    """
+    room_list's GET on the async ORM, for the ASGI application: same filters, ordering,
+    "fields", pagination and cache entries. Creating rooms stays on room_list.
+    """
+    try:
+        rooms = filter_rooms(Room.objects.all(), request.GET)
+        projection = ROOM_PROJECTION.select(request.GET.get('fields'))
+        page = await apaginate(request, projection.queryset(rooms, *sort_columns(ROOM_ORDERINGS)), ROOM_ORDERINGS)
+    except ValueError as error:
+        return json_response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return json_response(page.data(projection.render(page.rows)))
+
+
+@async_api_view(['GET'])
+@log_crud('Room')
+async def room_detail_async(request, pk):
+    """
+    room_detail's GET on the async ORM, with the same "fields" and ETag handling.
+    Updates and deletes stay on room_detail.
+    """
+    try:
+        projection = ROOM_PROJECTION.select(request.GET.get('fields'))
+    except ValueError as error:
+        return json_response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        room = await projection.only(Room.objects.all()).aget(pk=pk)
+    except Room.DoesNotExist:
+        return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+
+    etag = etag_for(room)
+    if not_modified(request, etag):
+        return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return json_response(projection.render_instance(room), headers={'ETag': etag})
@@ -1,14 +1,14 @@
 ###################
 # IMPORTS SECTION #
 ###################
-# Django Libraries
-from django.db.models import Sum, Avg, Count, Min, Max
 # Django Rest Framework Libraries
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 # Project Libraries
-from bookings.models import Hotel, Room
+from bookings.aggregates import TWO_PLACES
+from bookings.models import HotelPriceAggregate, RoomPriceTotals
+from bookings.replica import reads_from_replica
 
 
 #################
@@ -16,21 +16,25 @@ from bookings.models import Hotel, Room
 #################
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@reads_from_replica
 def high_end_hotels_stats_view(request):
     """
     Returns hotels whose average room price is above the global average.
 
     This statistical query:
-    - Calculates a global average room price using aggregation.
-    - Annotates each hotel with its average room price, room count, and total capacity.
-    - Filters hotels whose average price exceeds the global average.
+    - Reads the global average room price from the running totals (RoomPriceTotals).
+    - Reads each hotel's average room price, room count, and total capacity from
+      HotelPriceAggregate, maintained incrementally by Room writes.
+    - Filters hotels whose average price exceeds the global average. The stored averages are rounded
+      to cents, so the global one is too; hotels rounding to the same cent are compared exactly.
     - Sorts results by average price and rating for better comparison.
 
     Complexity:
-    - Involves cross-entity aggregation (Room → Hotel).
-    - Performs a global vs. per-group aggregate comparison.
-    - Optimized by using indexed fields: hotel_id, price_per_night, rating.
-    - Uses prefetch_related to avoid N+1 queries on hotel-room relationships.
+    - No aggregation at request time: both averages are precomputed.
+    - The filter and the ordering are served by the (avg_price, rating) index.
+    - Only the returned rows are joined to Hotel for their name.
+    - `manage.py rebuild_hotel_aggregates` recomputes the aggregates and checks them for drift.
+    - Served by the read replica when it is fresh enough (see bookings.replica).
 
     Use case:
     Which hotels have an average room price above the overall average across all hotels
@@ -41,21 +45,26 @@ def high_end_hotels_stats_view(request):
     - Inform marketing or pricing strategies
     """
 
-    global_avg_price = Room.objects.aggregate(global_avg=Avg('price_per_night'))['global_avg']
+    # A plain read, unlike RoomPriceTotals.load() which may create the row on the primary
+    totals = RoomPriceTotals.objects.filter(pk=1).first()
+    global_avg_price = totals.avg_price if totals else None
+    if global_avg_price is None:
+        return Response([])
 
+    # Rounding keeps the order: a hotel above the global average never rounds below it
+    rounded_avg_price = global_avg_price.quantize(TWO_PLACES)
     stats = (
-        Hotel.objects
-        .prefetch_related('rooms')
-        .annotate(
-            avg_price=Avg('rooms__price_per_night'),
-            room_count=Count('rooms'),
-            total_capacity=Sum('rooms__capacity')
-        )
-        .filter(avg_price__gt=global_avg_price)
-        .values(
-            'id', 'name', 'rating', 'avg_price', 'room_count', 'total_capacity'
-        )
+        HotelPriceAggregate.objects
+        .filter(avg_price__gte=rounded_avg_price)
         .order_by('-avg_price', '-rating')
+        .values_list('hotel_id', 'hotel__name', 'rating', 'avg_price', 'room_count', 'total_capacity', 'price_sum')
     )
 
-    return Response(list(stats))
+    return Response([
+        {
+            'id': hotel_id, 'name': name, 'rating': rating,
+            'avg_price': avg_price, 'room_count': room_count, 'total_capacity': total_capacity,
+        }
+        for hotel_id, name, rating, avg_price, room_count, total_capacity, price_sum in stats
+        if avg_price > rounded_avg_price or price_sum / room_count > global_avg_price
+    ])
@@ -9,12 +9,14 @@ import {authFetch} from "@/utils/api/config-api";
 // CONSTANTS SECTION //
 ///////////////////////
 const API_URL = process.env.NEXT_PUBLIC_API_URL ?? "http://localhost:8000";
+// Attempts of a chunk before the upload fails
+const UPLOAD_RETRIES = 3;
 
 
 ///////////////////////
 // API CALLS SECTION //
 ///////////////////////
-// File upload function
+// File upload function, resumable: the file is sent in chunks, a failed chunk resumes from the server's offset
 export async function uploadFile(filename: string, fileData: File): Promise<string> {
   if (!isOnline()) {
     updateNetworkStatus();
@@ -22,14 +24,40 @@ export async function uploadFile(filename: string, fileData: File): Promise<stri
   }
 
   try {
-    const formData = new FormData();
-    formData.append('file', fileData);
-
-    const response = await authFetch(`${API_URL}/upload/${filename}/`, {
+    const started = await authFetch(`${API_URL}/uploads/`, {
       method: 'POST',
-      body: formData
+      body: JSON.stringify({ filename, size: fileData.size })
     });
+    if (!started.ok) {
+      updateServerStatus(true);
+      throw new Error(`Error uploading file: ${started.statusText}`);
+    }
+    const upload = await started.json();
+
+    let offset = upload.offset;
+    let failures = 0;
+    while (offset < fileData.size) {
+      const chunk = fileData.slice(offset, offset + upload.chunk_max_size);
+      try {
+        const response = await authFetch(`${API_URL}/uploads/${upload.id}/?offset=${offset}`, {
+          method: 'PUT',
+          headers: { 'Content-Type': 'application/octet-stream' },
+          body: chunk
+        });
+        const body = await response.json();
+        if (!response.ok && response.status !== 409) {
+          throw new Error(`Error uploading file: ${response.statusText}`);
+        }
+        offset = body.offset;
+        failures = 0;
+      } catch (error) {
+        if (++failures > UPLOAD_RETRIES) throw error;
+        const status = await authFetch(`${API_URL}/uploads/${upload.id}/`);
+        if (status.ok) offset = (await status.json()).offset;
+      }
+    }
 
+    const response = await authFetch(`${API_URL}/uploads/${upload.id}/commit/`, { method: 'POST' });
     if (!response.ok) {
       updateServerStatus(true);
       throw new Error(`Error uploading file: ${response.statusText}`);
@@ -76,7 +104,7 @@ export async function fetchFileList() {
   }
 
   try {
-    const response = await authFetch(`${API_URL}/files/`);
+    const response = await authFetch(`${API_URL}/files/?limit=100&ordering=-modified`);
 
     if (!response.ok) {
       updateServerStatus(true);
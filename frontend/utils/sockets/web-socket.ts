@@ -32,7 +32,8 @@ function useBookingUpdates(onBookingUpdate: (booking: Booking) => void) {
 
     const protocol = window.location.protocol === "https:" ? "wss" : "ws";
     const host = window.location.hostname;
-    const wsUrl = `${protocol}://localhost:8001/ws/bookings/`;
+    // Bursts of bookings arrive coalesced into { batch: [...] } frames
+    const wsUrl = `${protocol}://localhost:8001/ws/bookings/?batch=1`;
     const socket = new WebSocket(wsUrl);
 
     socketRef.current = socket;
@@ -46,9 +47,12 @@ function useBookingUpdates(onBookingUpdate: (booking: Booking) => void) {
     socket.onmessage = (event) => {
       try {
         const data = JSON.parse(event.data);
-        if (data.new_booking) {
-          console.log("New booking received:", data.new_booking);
-          onBookingUpdate(data.new_booking);
+        const updates = Array.isArray(data.batch) ? data.batch : [data];
+        for (const update of updates) {
+          if (update.new_booking) {
+            console.log("New booking received:", update.new_booking);
+            onBookingUpdate(update.new_booking);
+          }
         }
       } catch (error) {
         console.error("Error parsing WebSocket message:", error);
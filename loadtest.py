@@ -19,6 +19,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'MPP.loadtest_settings')
 django.setup()
 
 # Import our models
+from django.core.management import call_command
 from bookings.models import Hotel, Room, Booking
 
 # Test Configuration
@@ -118,7 +119,8 @@ for rid in room_ids:
             customerPhone=fake.phone_number()[:20],
             startDate=start,
             endDate=end,
-            state=random.choice(states)
+            state=random.choice(states),
+            room_id=rid
         ))
         booking_counter += 1
 
@@ -132,4 +134,7 @@ if bookings:
     print(f"  Inserted final batch of bookings.")
 
 print("Bookings seeded.")
+
+# Refresh the query planner statistics after the bulk load
+call_command('optimize_database')
 print("Seeding complete!")